@@ -19,6 +19,11 @@ class Settings(BaseSettings):
     SERVER_URL: str = "mcrs.duckdns.org/game"
     COER_SERVER_URL: str = "mcrs.duckdns.org/core"
 
+    # worker processes of the tenpai assistance, 0 to compute it in the event loop
+    TENPAI_ASSIST_WORKERS: int = 2
+    # seconds to wait for the tenpai assistance before sending an action without it
+    TENPAI_ASSIST_TIMEOUT: float = 1.0
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -1,4 +1,6 @@
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,6 +10,9 @@ from app.api.v1.endpoints import api_router
 from app.core.config import settings
 from app.core.error import DomainErrorCode, MCRDomainError
 from app.schemas.base_response import BaseResponse
+from app.services.game_manager.helpers.tenpai_assist_service import (
+    tenpai_assist_service,
+)
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -15,10 +20,21 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    tenpai_assist_service.start()
+    try:
+        yield
+    finally:
+        tenpai_assist_service.shutdown()
+
+
 app = FastAPI(
     title="MCRMasters-Game-Server",
     description="A FastAPI backend application for MCRMasters Game Logic",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정
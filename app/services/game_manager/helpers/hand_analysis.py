@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from app.services.game_manager.models.enums import GameTile
+from app.services.game_manager.models.hand import GameHand
+from app.services.game_manager.models.types import CallBlockType
+from app.services.score_calculator.enums.enums import Tile
+from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.shanten_calculator import get_shanten
+from app.services.score_calculator.tenpai_calculator import (
+    TENPAI_HAND_SIZE,
+    get_tenpai_tiles,
+)
+
+# concealed tiles and call blocks of a hand, as a hashable value
+HandKey = tuple[
+    tuple[tuple[GameTile, int], ...],
+    tuple[tuple[CallBlockType, GameTile], ...],
+]
+
+
+class HandAnalysis:
+    """Waits and shanten of a `GameHand`, kept across its tsumo, discard and call.
+
+    The waits belong to the hand without its tsumo tile, so drawing a tile and
+    discarding it again keeps them. Both values are computed on first use and
+    dropped only when the tiles they depend on change. The hand must be changed
+    through its `apply_*` methods, which call `update`.
+    """
+
+    def __init__(self, game_hand: GameHand):
+        self.game_hand: GameHand = game_hand
+        self._key: HandKey | None = None
+        self._shanten: int | None = None
+        self._is_shanten_computed: bool = False
+        self._tenpai_key: HandKey | None = None
+        self._tenpai_tiles: Counter[GameTile] | None = None
+        self._waiting_tiles: list[Tile] | None = None
+        self._is_waiting_tiles_computed: bool = False
+        self.update()
+
+    def update(self) -> None:
+        key: HandKey = _get_hand_key(self.game_hand.tiles, self.game_hand)
+        if key != self._key:
+            self._key = key
+            self._shanten = None
+            self._is_shanten_computed = False
+
+        tenpai_tiles: Counter[GameTile] | None = _get_tenpai_tiles_count(
+            self.game_hand,
+        )
+        tenpai_key: HandKey | None = (
+            _get_hand_key(tenpai_tiles, self.game_hand)
+            if tenpai_tiles is not None
+            else None
+        )
+        if tenpai_key != self._tenpai_key:
+            self._tenpai_key = tenpai_key
+            self._tenpai_tiles = tenpai_tiles
+            self._waiting_tiles = None
+            self._is_waiting_tiles_computed = False
+
+    @property
+    def shanten(self) -> int | None:
+        """Shanten number of the current hand, None if its size is invalid."""
+        if not self._is_shanten_computed:
+            try:
+                self._shanten = get_shanten(self.game_hand)
+            except ValueError:
+                self._shanten = None
+            self._is_shanten_computed = True
+        return self._shanten
+
+    @property
+    def waiting_tiles(self) -> list[Tile] | None:
+        """Winning tiles of the hand without its tsumo tile.
+
+        None if that hand is not a valid tenpai-sized hand.
+        """
+        if not self._is_waiting_tiles_computed:
+            self._waiting_tiles = None
+            if self._tenpai_tiles is not None:
+                try:
+                    self._waiting_tiles = get_tenpai_tiles(
+                        tenpai_hand=Hand.create_from_game_hand(
+                            GameHand(
+                                tiles=self._tenpai_tiles,
+                                call_blocks=self.game_hand.call_blocks,
+                            ),
+                        ),
+                    )
+                except ValueError:
+                    self._waiting_tiles = None
+            self._is_waiting_tiles_computed = True
+        return self._waiting_tiles
+
+
+def _get_hand_key(tiles: Counter[GameTile], game_hand: GameHand) -> HandKey:
+    return (
+        tuple(sorted((tile, count) for tile, count in tiles.items() if count)),
+        tuple((block.type, block.first_tile) for block in game_hand.call_blocks),
+    )
+
+
+def _get_tenpai_tiles_count(game_hand: GameHand) -> Counter[GameTile] | None:
+    hand_size: int = game_hand.hand_size
+    if hand_size == TENPAI_HAND_SIZE:
+        return Counter(game_hand.tiles)
+    if (
+        hand_size == GameHand.FULL_HAND_SIZE
+        and game_hand.tsumo_tile is not None
+        and game_hand.tiles[game_hand.tsumo_tile] > 0
+    ):
+        tiles: Counter[GameTile] = Counter(game_hand.tiles)
+        tiles[game_hand.tsumo_tile] -= 1
+        return +tiles
+    return None
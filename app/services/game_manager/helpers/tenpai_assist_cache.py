@@ -0,0 +1,88 @@
+"""Per-round cache of the tenpai assistance of each tenpai hand.
+
+The assistance of one discard only depends on the hand left by the discard,
+the winds, and whether each of its waits is the last tile of its kind. A
+player usually keeps most of a hand from one turn to the next, and a call
+leaves many of the same tenpai hands, so `TenpaiAssistant` looks up every
+discard here before scoring it. The round manager clears the cache when the
+round ends, since the winds change with the next round.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Final
+
+from app.services.game_manager.models.enums import GameTile
+from app.services.score_calculator.enums.enums import Tile
+from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.hand.packed_hand import PackedHand
+from app.services.score_calculator.result.result import ScoreResult
+from app.services.score_calculator.winning_conditions.winning_conditions import (
+    WinningConditions,
+)
+
+# a tile is the last of its kind once the other three copies are visible
+LAST_TILE_VISIBLE_COUNT: Final[int] = 3
+
+TenpaiAssistSubInfo = dict[GameTile, tuple[ScoreResult, ScoreResult]]
+# (tenpai hand, seat wind, round wind, waits that are the last tile of their kind)
+TenpaiAssistKey = tuple[PackedHand, int, int, tuple[int, ...]]
+
+
+def create_tenpai_assist_key(
+    tenpai_hand: Hand,
+    tenpai_tiles: list[Tile],
+    visible_tiles: Counter[GameTile],
+    winning_conditions: WinningConditions,
+) -> TenpaiAssistKey:
+    """Key of the assistance of a tenpai hand.
+
+    Of the visible tiles, only whether each wait is the last of its kind
+    changes the scores, so other visible tiles do not split the entries.
+    """
+    return (
+        PackedHand.create_from_hand(tenpai_hand),
+        int(winning_conditions.seat_wind),
+        int(winning_conditions.round_wind),
+        tuple(
+            int(tile)
+            for tile in tenpai_tiles
+            if visible_tiles[GameTile(tile)] >= LAST_TILE_VISIBLE_COUNT
+        ),
+    )
+
+
+class TenpaiAssistCache:
+    """Assistance of the tenpai hands of one round, by `TenpaiAssistKey`.
+
+    Entries are shared with the callers, which must not mutate them. A hand
+    that is not tenpai is stored with an empty assistance.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[TenpaiAssistKey, TenpaiAssistSubInfo] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: TenpaiAssistKey) -> bool:
+        return key in self._entries
+
+    def get(self, key: TenpaiAssistKey) -> TenpaiAssistSubInfo | None:
+        sub_info: TenpaiAssistSubInfo | None = self._entries.get(key)
+        if sub_info is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return sub_info
+
+    def set(self, key: TenpaiAssistKey, sub_info: TenpaiAssistSubInfo) -> None:
+        self._entries[key] = sub_info
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,416 @@
+"""Tenpai assistance computed off the event loop by a pool of worker processes.
+
+`TenpaiAssistant.get_tenpai_assistance_info_in_full_hand` can take long enough
+on a complex hand to stall every game of the process, so the round manager
+awaits it from `tenpai_assist_service` instead. The inputs and the result cross
+the process boundary as compact tuples of ints and bools. A caller gets `None`
+when the result is not ready before the deadline and then sends its message
+without the assistance.
+
+The pool is started with the application. When it is not running, the
+assistance is computed inline as before.
+
+Speculative requests fill an assist cache ahead of time, such as the next
+drawer's assistance while the calls of a discard are awaited. They only take
+an idle worker, so they never delay the assistance of a current turn by more
+than the one speculative request a worker may be running. They have no
+deadline of their own: the caller stops waiting for them once they are no
+longer useful.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from collections import Counter
+from collections.abc import Callable, Collection
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from multiprocessing.synchronize import Barrier
+from threading import BrokenBarrierError
+from typing import Final
+
+from app.core.config import settings
+from app.services.game_manager.helpers.tenpai_assistant import TenpaiAssistant
+from app.services.game_manager.models.call_block import CallBlock
+from app.services.game_manager.models.enums import AbsoluteSeat, GameTile, RelativeSeat
+from app.services.game_manager.models.hand import GameHand
+from app.services.game_manager.models.types import CallBlockType
+from app.services.game_manager.models.winning_conditions import GameWinningConditions
+from app.services.score_calculator.enums.enums import Wind, Yaku
+from app.services.score_calculator.result.result import ScoreResult
+from app.services.score_calculator.winning_conditions.winning_conditions import (
+    WinningConditions,
+)
+
+logger = logging.getLogger(__name__)
+
+TenpaiAssistanceInfo = dict[GameTile, dict[GameTile, tuple[ScoreResult, ScoreResult]]]
+# (type, first tile, source seat, source tile index)
+EncodedCallBlock = tuple[int, int, int, int]
+# (winning tile, is discarded, is last tile in the game, is last tile of its
+# kind, is replacement tile, is robbing the kong, seat wind, round wind)
+EncodedWinningConditions = tuple[int, bool, bool, bool, bool, bool, int, int]
+# (tiles, call blocks, tsumo tile, winning conditions, visible tiles, discards
+# to evaluate or None for all of them), where the tiles are (tile, count) pairs
+# in hand order
+AssistRequest = tuple[
+    tuple[tuple[int, int], ...],
+    tuple[EncodedCallBlock, ...],
+    int | None,
+    EncodedWinningConditions,
+    tuple[tuple[int, int], ...],
+    tuple[int, ...] | None,
+]
+# (total score, (yaku value, score) pairs)
+EncodedScore = tuple[int, tuple[tuple[int, int], ...]]
+# (discard tile, (tenpai tile, tsumo score, discard score) triples) pairs
+AssistResponse = tuple[
+    tuple[int, tuple[tuple[int, EncodedScore, EncodedScore], ...]],
+    ...,
+]
+
+# a full honors and knitted hand, scored by each worker before serving
+WARM_UP_REQUEST: Final[AssistRequest] = (
+    tuple(
+        (tile, 1)
+        for tile in (
+            *(GameTile.M1, GameTile.M4, GameTile.M7),
+            *(GameTile.P2, GameTile.P5, GameTile.P8),
+            *(GameTile.S3, GameTile.S6, GameTile.S9),
+            *(GameTile.Z1, GameTile.Z2, GameTile.Z3, GameTile.Z4, GameTile.Z5),
+        )
+    ),
+    (),
+    GameTile.Z5,
+    (GameTile.Z5, False, False, False, False, False, Wind.EAST, Wind.EAST),
+    (),
+    None,
+)
+# seconds `start` waits for the workers to warm up
+WARM_UP_TIMEOUT: Final[float] = 60.0
+
+
+def encode_request(
+    tenpai_assistant: TenpaiAssistant,
+    discard_tiles: Collection[GameTile] | None = None,
+) -> AssistRequest:
+    game_hand: GameHand = tenpai_assistant.game_hand
+    winning_conditions: WinningConditions = tenpai_assistant.winning_conditions
+    return (
+        tuple((int(tile), count) for tile, count in game_hand.tiles.items()),
+        tuple(
+            (
+                int(block.type),
+                int(block.first_tile),
+                int(block.source_seat),
+                block.source_tile_index,
+            )
+            for block in game_hand.call_blocks
+        ),
+        None if game_hand.tsumo_tile is None else int(game_hand.tsumo_tile),
+        (
+            int(winning_conditions.winning_tile),
+            winning_conditions.is_discarded,
+            winning_conditions.is_last_tile_in_the_game,
+            winning_conditions.is_last_tile_of_its_kind,
+            winning_conditions.is_replacement_tile,
+            winning_conditions.is_robbing_the_kong,
+            int(winning_conditions.seat_wind),
+            int(winning_conditions.round_wind),
+        ),
+        tuple(
+            (int(tile), count)
+            for tile, count in tenpai_assistant.visible_tiles_count.items()
+        ),
+        None if discard_tiles is None else tuple(map(int, discard_tiles)),
+    )
+
+
+def decode_request(
+    request: AssistRequest,
+) -> tuple[TenpaiAssistant, tuple[GameTile, ...] | None]:
+    """Return the assistant of the request and the discards to evaluate."""
+    (
+        tiles,
+        call_blocks,
+        tsumo_tile,
+        (winning_tile, *flags, seat_wind, round_wind),
+        visible_tiles_count,
+        discard_tiles,
+    ) = request
+    tenpai_assistant = TenpaiAssistant(
+        game_hand=GameHand(
+            tiles=Counter({GameTile(tile): count for tile, count in tiles}),
+            call_blocks=[
+                CallBlock(
+                    type=CallBlockType(block_type),
+                    first_tile=GameTile(first_tile),
+                    source_seat=RelativeSeat(source_seat),
+                    source_tile_index=source_tile_index,
+                )
+                for block_type, first_tile, source_seat, source_tile_index in (
+                    call_blocks
+                )
+            ],
+            tsumo_tile=None if tsumo_tile is None else GameTile(tsumo_tile),
+        ),
+        game_winning_conditions=GameWinningConditions(GameTile(winning_tile), *flags),
+        visible_tiles_count=Counter(
+            {GameTile(tile): count for tile, count in visible_tiles_count},
+        ),
+        seat_wind=AbsoluteSeat(seat_wind - Wind.EAST),
+        round_wind=AbsoluteSeat(round_wind - Wind.EAST),
+    )
+    return tenpai_assistant, (
+        None if discard_tiles is None else tuple(map(GameTile, discard_tiles))
+    )
+
+
+def _encode_score(score_result: ScoreResult) -> EncodedScore:
+    return (
+        score_result.total_score,
+        tuple((yaku.value, score) for yaku, score in score_result.yaku_score_list),
+    )
+
+
+def _decode_score(encoded_score: EncodedScore) -> ScoreResult:
+    total_score, yaku_score_list = encoded_score
+    return ScoreResult(
+        total_score=total_score,
+        yaku_score_list=[(Yaku(yaku), score) for yaku, score in yaku_score_list],
+    )
+
+
+def encode_response(info: TenpaiAssistanceInfo) -> AssistResponse:
+    return tuple(
+        (
+            int(discard_tile),
+            tuple(
+                (int(tenpai_tile), _encode_score(tsumo), _encode_score(discard))
+                for tenpai_tile, (tsumo, discard) in sub_info.items()
+            ),
+        )
+        for discard_tile, sub_info in info.items()
+    )
+
+
+def decode_response(response: AssistResponse) -> TenpaiAssistanceInfo:
+    return {
+        GameTile(discard_tile): {
+            GameTile(tenpai_tile): (_decode_score(tsumo), _decode_score(discard))
+            for tenpai_tile, tsumo, discard in sub_info
+        }
+        for discard_tile, sub_info in response
+    }
+
+
+def compute_tenpai_assistance(request: AssistRequest) -> AssistResponse:
+    """Worker entry point: the full-hand assistance info of an encoded request."""
+    tenpai_assistant, discard_tiles = decode_request(request)
+    return encode_response(
+        tenpai_assistant.get_tenpai_assistance_info_in_full_hand(discard_tiles),
+    )
+
+
+def _initialize_worker(ready_barrier: Barrier | None) -> None:
+    # Importing this module built the waits and decomposition tables; scoring
+    # one hand also fills the memoized yaku tables before the first request.
+    compute_tenpai_assistance(WARM_UP_REQUEST)
+    if ready_barrier is not None:
+        # no worker takes a request before every worker has started
+        ready_barrier.wait()
+
+
+def _is_worker_ready() -> bool:
+    return True
+
+
+def _call_on_response(
+    on_response: Callable[[AssistResponse], None],
+    response_future: asyncio.Future[AssistResponse],
+) -> None:
+    if not response_future.cancelled() and response_future.exception() is None:
+        on_response(response_future.result())
+
+
+class TenpaiAssistService:
+    """Awaitable tenpai assistance backed by a `ProcessPoolExecutor`.
+
+    Attributes:
+        max_workers (int): Number of worker processes, `0` to compute inline.
+        timeout (float): Seconds a caller waits for a result before giving up.
+    """
+
+    def __init__(self, max_workers: int, timeout: float) -> None:
+        self.max_workers: int = max_workers
+        self.timeout: float = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        # submitted requests that have not finished yet, decremented by the
+        # executor's thread
+        self._pending_count: int = 0
+        self._pending_lock: threading.Lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> None:
+        """Start the workers and block until every one of them is warm.
+
+        Every worker waits on a barrier with this method at the end of its
+        initializer. The workers are spawned by the requests submitted to the
+        pool, and no worker is idle before the barrier is passed, so each
+        request spawns one of them.
+        """
+        if self._executor is not None or self.max_workers <= 0:
+            return
+        ready_barrier: Barrier = multiprocessing.get_context("spawn").Barrier(
+            self.max_workers + 1,
+        )
+        self._executor = self._create_executor(ready_barrier)
+        for _ in range(self.max_workers):
+            self._executor.submit(_is_worker_ready)
+        try:
+            ready_barrier.wait(timeout=WARM_UP_TIMEOUT)
+        except BrokenBarrierError:
+            # the broken pool is restarted by the first request
+            logger.exception("[TenpaiAssistService] workers did not warm up")
+
+    def _create_executor(
+        self,
+        ready_barrier: Barrier | None = None,
+    ) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(ready_barrier,),
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    async def get_tenpai_assistance_info_in_full_hand(
+        self,
+        tenpai_assistant: TenpaiAssistant,
+    ) -> TenpaiAssistanceInfo | None:
+        """Return the assistance info, or `None` if it misses the deadline.
+
+        With an `assist_cache` on the assistant, only the discards missing from
+        it are sent to a worker, and their results are added to it.
+        """
+        if self._executor is None:
+            return tenpai_assistant.get_tenpai_assistance_info_in_full_hand()
+        if tenpai_assistant.assist_cache is None:
+            response = await self._compute(
+                encode_request(tenpai_assistant),
+                timeout=self.timeout,
+            )
+            return None if response is None else decode_response(response)
+        if not await self.fill_assist_cache(tenpai_assistant):
+            return None
+        return tenpai_assistant.get_tenpai_assistance_info_in_full_hand()
+
+    async def fill_assist_cache(
+        self,
+        tenpai_assistant: TenpaiAssistant,
+        is_speculative: bool = False,
+    ) -> bool:
+        """Add the discards missing from the assistant's `assist_cache` to it.
+
+        Returns whether every discard is cached afterwards. The results are
+        added when the worker finishes, even past the deadline, so the later
+        requests of the same hands find them. A speculative request is dropped
+        when the pool is not running or has no idle worker, and otherwise waits
+        for its worker without a deadline.
+        """
+        discard_tiles: list[GameTile] = tenpai_assistant.get_uncached_discard_tiles()
+        if not discard_tiles:
+            return True
+        if is_speculative and (
+            self._executor is None or self._pending_count >= self.max_workers
+        ):
+            return False
+
+        def add_to_cache(response: AssistResponse) -> None:
+            tenpai_assistant.add_to_cache(decode_response(response), discard_tiles)
+
+        response = await self._compute(
+            encode_request(tenpai_assistant, discard_tiles),
+            timeout=None if is_speculative else self.timeout,
+            on_response=add_to_cache,
+        )
+        return response is not None
+
+    async def _compute(
+        self,
+        request: AssistRequest,
+        timeout: float | None,
+        on_response: Callable[[AssistResponse], None] | None = None,
+    ) -> AssistResponse | None:
+        """Return the response, or `None` if it misses the `timeout` deadline.
+
+        `on_response` is called with the response as soon as it is computed,
+        whether or not the deadline has passed.
+        """
+        response: AssistResponse
+        if self._executor is None:
+            response = compute_tenpai_assistance(request)
+            if on_response is not None:
+                on_response(response)
+            return response
+        executor: ProcessPoolExecutor = self._executor
+        try:
+            future: Future[AssistResponse] = executor.submit(
+                compute_tenpai_assistance,
+                request,
+            )
+            with self._pending_lock:
+                self._pending_count += 1
+            future.add_done_callback(self._on_request_done)
+            response_future: asyncio.Future[AssistResponse] = asyncio.wrap_future(
+                future,
+            )
+            if on_response is not None:
+                # added before the shield's callback, so it runs before the
+                # caller resumes with the response
+                response_future.add_done_callback(
+                    partial(_call_on_response, on_response),
+                )
+            # the deadline only stops the wait, not the request
+            response = await asyncio.wait_for(
+                asyncio.shield(response_future),
+                timeout=timeout,
+            )
+        except TimeoutError:
+            logger.warning("[TenpaiAssistService] deadline passed, sending no assist")
+            return None
+        except BrokenProcessPool:
+            # every request in flight on the broken pool gets here, and only
+            # the first one replaces it
+            if self._executor is executor:
+                logger.exception(
+                    "[TenpaiAssistService] worker died, restarting the pool",
+                )
+                executor.shutdown(wait=False, cancel_futures=True)
+                # the new workers warm up in the background of the next requests
+                self._executor = self._create_executor()
+            return None
+        return response
+
+    def _on_request_done(self, _: Future[AssistResponse]) -> None:
+        with self._pending_lock:
+            self._pending_count -= 1
+
+
+tenpai_assist_service: Final[TenpaiAssistService] = TenpaiAssistService(
+    max_workers=settings.TENPAI_ASSIST_WORKERS,
+    timeout=settings.TENPAI_ASSIST_TIMEOUT,
+)
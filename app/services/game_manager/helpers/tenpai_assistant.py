@@ -1,20 +1,54 @@
+from __future__ import annotations
+
 from collections import Counter
+from collections.abc import Collection
 from copy import deepcopy
+from dataclasses import dataclass, replace
 
+from app.services.game_manager.helpers.tenpai_assist_cache import (
+    LAST_TILE_VISIBLE_COUNT,
+    TenpaiAssistCache,
+    TenpaiAssistKey,
+    create_tenpai_assist_key,
+)
 from app.services.game_manager.models.enums import AbsoluteSeat, GameTile
 from app.services.game_manager.models.hand import GameHand
 from app.services.game_manager.models.winning_conditions import GameWinningConditions
+from app.services.score_calculator.enums.enums import Tile
 from app.services.score_calculator.hand.hand import Hand
 from app.services.score_calculator.result.result import (
     ScoreResult,
 )
-from app.services.score_calculator.score_calculator import ScoreCalculator
-from app.services.score_calculator.tenpai_calculator import get_tenpai_tiles
+from app.services.score_calculator.score_cache import score_cache
+from app.services.score_calculator.scoring_session import ScoringSession
+from app.services.score_calculator.tenpai_calculator import (
+    get_discard_tenpai_tiles,
+    get_tenpai_tiles,
+)
 from app.services.score_calculator.winning_conditions.winning_conditions import (
     WinningConditions,
 )
 
 
+@dataclass
+class DiscardCandidate:
+    """The tenpai hand left by one discard of a full hand.
+
+    Attributes:
+        discard_tile (GameTile): The discarded tile.
+        tenpai_hand (Hand): The hand without the discarded tile.
+        visible_tiles (Counter[GameTile]): The visible tiles with the discard.
+        tenpai_tiles (list[Tile]): The waits of `tenpai_hand`.
+        cache_key (TenpaiAssistKey): The key of its assistance in the cache.
+    """
+
+    discard_tile: GameTile
+    tenpai_hand: Hand
+    visible_tiles: Counter[GameTile]
+    tenpai_tiles: list[Tile]
+    cache_key: TenpaiAssistKey
+
+
 class TenpaiAssistant:
     def __init__(
         self,
@@ -31,51 +65,56 @@ class TenpaiAssistant:
             round_wind=round_wind,
         )
         self.visible_tiles_count = deepcopy(visible_tiles_count)
+        # set by the round manager to reuse the assistance of earlier turns
+        self.assist_cache: TenpaiAssistCache | None = None
+        self._discard_candidates: list[DiscardCandidate] | None = None
 
     def get_score_result_from_game_infos(
         self,
         hand: Hand,
         winning_conditions: WinningConditions,
     ) -> ScoreResult:
-        return ScoreCalculator(
+        return score_cache.get_score_result(
             hand=hand,
             winning_conditions=winning_conditions,
-        ).result
+        )
 
     def _evaluate_tenpai_tiles(
         self,
         tenpai_hand: Hand,
         working_winning_conditions: WinningConditions,
         visible_tiles: Counter[GameTile],
+        tenpai_tiles: list[Tile] | None = None,
     ) -> dict[GameTile, tuple[ScoreResult, ScoreResult]]:
         result: dict[GameTile, tuple[ScoreResult, ScoreResult]] = {}
-        tenpai_tiles = get_tenpai_tiles(tenpai_hand=tenpai_hand)
-        if not tenpai_tiles:
+        scoring_session = ScoringSession(
+            tenpai_hand=tenpai_hand,
+            tenpai_tiles=tenpai_tiles,
+            score_cache=score_cache,
+        )
+        if not scoring_session.tenpai_tiles:
             return result
-        working_winning_conditions.count_tenpai_tiles = len(tenpai_tiles)
+        working_winning_conditions.count_tenpai_tiles = len(
+            scoring_session.tenpai_tiles,
+        )
         working_winning_conditions.is_replacement_tile = False
         working_winning_conditions.is_robbing_the_kong = False
         working_winning_conditions.is_last_tile_in_the_game = False
-        for tenpai_tile in tenpai_tiles:
+        for tenpai_tile in scoring_session.tenpai_tiles:
             if tenpai_hand.tiles[tenpai_tile] >= 4:
                 continue
-            tenpai_hand.tiles[tenpai_tile] += 1
             working_winning_conditions.winning_tile = tenpai_tile
 
             working_winning_conditions.is_last_tile_of_its_kind = (
-                visible_tiles[GameTile(tenpai_tile)] >= 3
-            )
-            working_winning_conditions.is_discarded = False
-            tsumo_score = self.get_score_result_from_game_infos(
-                hand=tenpai_hand,
-                winning_conditions=working_winning_conditions,
+                visible_tiles[GameTile(tenpai_tile)] >= LAST_TILE_VISIBLE_COUNT
             )
-            working_winning_conditions.is_discarded = True
-            discard_score = self.get_score_result_from_game_infos(
-                hand=tenpai_hand,
-                winning_conditions=working_winning_conditions,
+            # both ways of winning share the divisions and the hand yakus
+            tsumo_score, discard_score = scoring_session.get_score_results(
+                [
+                    replace(working_winning_conditions, is_discarded=False),
+                    replace(working_winning_conditions, is_discarded=True),
+                ],
             )
-            tenpai_hand.tiles[tenpai_tile] -= 1
             result[GameTile(tenpai_tile)] = (tsumo_score, discard_score)
         return result
 
@@ -88,24 +127,119 @@ class TenpaiAssistant:
             tenpai_hand=tenpai_hand,
             working_winning_conditions=deepcopy(self.winning_conditions),
             visible_tiles=deepcopy(self.visible_tiles_count),
+            tenpai_tiles=(
+                tenpai_game_hand.analysis.waiting_tiles
+                if tenpai_game_hand.analysis is not None
+                and tenpai_game_hand.tsumo_tile is None
+                else None
+            ),
         )
 
     def get_tenpai_assistance_info_in_full_hand(
         self,
+        discard_tiles: Collection[GameTile] | None = None,
     ) -> dict[GameTile, dict[GameTile, tuple[ScoreResult, ScoreResult]]]:
+        """Return the assistance info of the hand left by each discard.
+
+        The waits of every discard are computed in one pass over the full hand,
+        and each discard only copies the tile counts instead of the game hand.
+        With `discard_tiles`, only those discards are evaluated.
+        """
         result: dict[GameTile, dict[GameTile, tuple[ScoreResult, ScoreResult]]] = {}
+        for candidate in self._get_discard_candidates():
+            if (
+                discard_tiles is not None
+                and candidate.discard_tile not in discard_tiles
+            ):
+                continue
+            sub_info = self._evaluate_discard_candidate(candidate)
+            if sub_info:
+                result[candidate.discard_tile] = sub_info
+        return result
+
+    def get_uncached_discard_tiles(self) -> list[GameTile]:
+        """Return the discards whose assistance is not in `assist_cache` yet."""
+        if self.assist_cache is None:
+            return [
+                candidate.discard_tile for candidate in self._get_discard_candidates()
+            ]
+        return [
+            candidate.discard_tile
+            for candidate in self._get_discard_candidates()
+            if candidate.cache_key not in self.assist_cache
+        ]
+
+    def add_to_cache(
+        self,
+        info: dict[GameTile, dict[GameTile, tuple[ScoreResult, ScoreResult]]],
+        discard_tiles: Collection[GameTile],
+    ) -> None:
+        """Store the assistance of `discard_tiles` computed without the cache."""
+        if self.assist_cache is None:
+            return
+        for candidate in self._get_discard_candidates():
+            if candidate.discard_tile in discard_tiles:
+                self.assist_cache.set(
+                    candidate.cache_key,
+                    info.get(candidate.discard_tile, {}),
+                )
+
+    def _get_discard_candidates(self) -> list[DiscardCandidate]:
+        if self._discard_candidates is not None:
+            return self._discard_candidates
+        full_hand: Hand = Hand.create_from_game_hand(hand=self.game_hand)
+        flowers_count: int = full_hand.tiles[Tile.F0]
+        discard_tenpai_tiles: dict[Tile, list[Tile]] = (
+            {} if flowers_count else get_discard_tenpai_tiles(full_hand)
+        )
+        self._discard_candidates = []
         for discard_tile in self.game_hand.tiles:
-            tenpai_game_hand = deepcopy(self.game_hand)
-            tenpai_game_hand.apply_discard(discard_tile)
-            if tenpai_game_hand.has_flower:
+            tile: Tile = Tile.create_from_game_tile(discard_tile)
+            # Only the discard of the last flower leaves a hand without flowers.
+            if flowers_count - (tile == Tile.F0) > 0:
                 continue
-            visible_tiles = deepcopy(self.visible_tiles_count)
+            tenpai_hand = Hand(
+                tiles=full_hand.tiles[:],
+                call_blocks=full_hand.call_blocks[:],
+            )
+            tenpai_hand.tiles[tile] -= 1
+            visible_tiles: Counter[GameTile] = Counter(self.visible_tiles_count)
             visible_tiles[discard_tile] += 1
-            sub_info = self._evaluate_tenpai_tiles(
-                tenpai_hand=Hand.create_from_game_hand(hand=tenpai_game_hand),
-                working_winning_conditions=deepcopy(self.winning_conditions),
-                visible_tiles=visible_tiles,
+            tenpai_tiles: list[Tile] = (
+                discard_tenpai_tiles[tile]
+                if tile in discard_tenpai_tiles
+                else get_tenpai_tiles(tenpai_hand)
             )
-            if sub_info:
-                result[discard_tile] = sub_info
-        return result
+            self._discard_candidates.append(
+                DiscardCandidate(
+                    discard_tile=discard_tile,
+                    tenpai_hand=tenpai_hand,
+                    visible_tiles=visible_tiles,
+                    tenpai_tiles=tenpai_tiles,
+                    cache_key=create_tenpai_assist_key(
+                        tenpai_hand=tenpai_hand,
+                        tenpai_tiles=tenpai_tiles,
+                        visible_tiles=visible_tiles,
+                        winning_conditions=self.winning_conditions,
+                    ),
+                ),
+            )
+        return self._discard_candidates
+
+    def _evaluate_discard_candidate(
+        self,
+        candidate: DiscardCandidate,
+    ) -> dict[GameTile, tuple[ScoreResult, ScoreResult]]:
+        if self.assist_cache is not None:
+            cached_sub_info = self.assist_cache.get(candidate.cache_key)
+            if cached_sub_info is not None:
+                return cached_sub_info
+        sub_info = self._evaluate_tenpai_tiles(
+            tenpai_hand=candidate.tenpai_hand,
+            working_winning_conditions=replace(self.winning_conditions),
+            visible_tiles=candidate.visible_tiles,
+            tenpai_tiles=candidate.tenpai_tiles,
+        )
+        if self.assist_cache is not None:
+            self.assist_cache.set(candidate.cache_key, sub_info)
+        return sub_info
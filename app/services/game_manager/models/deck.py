@@ -30,6 +30,12 @@ class Deck:
     def tiles_remaining(self) -> int:
         return self.draw_index_right - self.draw_index_left
 
+    def peek_tile(self) -> GameTile:
+        """Return the tile the next `draw_tiles(1)` draws, without drawing it."""
+        if self.tiles_remaining < 1:
+            raise ValueError("No tile remaining to peek.")
+        return self.tiles[self.draw_index_left]
+
     def draw_tiles(self, count: int) -> list[GameTile]:
         remaining: int = self.tiles_remaining
         if remaining < count:
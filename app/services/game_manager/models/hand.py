@@ -2,8 +2,8 @@ from __future__ import annotations
 
 from collections import Counter
 from copy import deepcopy
-from dataclasses import dataclass
-from typing import ClassVar, Final
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, ClassVar, Final
 
 from app.services.game_manager.models.action import Action
 from app.services.game_manager.models.call_block import CallBlock
@@ -15,6 +15,9 @@ from app.services.game_manager.models.types import (
 )
 from app.services.game_manager.models.winning_conditions import GameWinningConditions
 
+if TYPE_CHECKING:
+    from app.services.game_manager.helpers.hand_analysis import HandAnalysis
+
 
 @dataclass
 class GameHand:
@@ -24,6 +27,7 @@ class GameHand:
     flower_point: int = 0
 
     FULL_HAND_SIZE: Final[int] = 14
+    analysis: HandAnalysis | None = field(default=None, compare=False, repr=False)
     FLOWER_TILES: ClassVar[Counter[GameTile]] = Counter(
         map(GameTile, GameTile.flower_tiles()),
     )
@@ -36,6 +40,18 @@ class GameHand:
             tsumo_tile=None,
         )
 
+    def enable_analysis(self) -> HandAnalysis:
+        """Keep waits and shanten of this hand up to date across its changes."""
+        from app.services.game_manager.helpers.hand_analysis import HandAnalysis
+
+        if self.analysis is None:
+            self.analysis = HandAnalysis(game_hand=self)
+        return self.analysis
+
+    def _update_analysis(self) -> None:
+        if self.analysis is not None:
+            self.analysis.update()
+
     @property
     def has_flower(self) -> bool:
         return bool(self.FLOWER_TILES & self.tiles)
@@ -67,6 +83,7 @@ class GameHand:
         self.tiles[tile] += 1
         if self.hand_size == GameHand.FULL_HAND_SIZE:
             self.tsumo_tile = tile
+        self._update_analysis()
         return tile
 
     def apply_tsumo(self, tile: GameTile) -> GameTile:
@@ -74,6 +91,7 @@ class GameHand:
             raise ValueError("Cannot apply tsumo: hand is already full.")
         self.tiles[tile] += 1
         self.tsumo_tile = tile
+        self._update_analysis()
         return tile
 
     def get_rightmost_tile(self) -> GameTile | None:
@@ -88,6 +106,7 @@ class GameHand:
             raise ValueError(f"Cannot apply discard: hand doesn't have tile {tile}")
         self._remove_tiles(tile, 1)
         self.tsumo_tile = None
+        self._update_analysis()
 
     def apply_call(self, block: CallBlock) -> None:
         match block.type:
@@ -101,6 +120,7 @@ class GameHand:
                 self._apply_daimin_kong(block=block)
             case CallBlockType.SHOMIN_KONG:
                 self._apply_shomin_kong(block=block)
+        self._update_analysis()
 
     def _remove_tiles(self, tile: GameTile, count: int) -> None:
         self.tiles[tile] -= count
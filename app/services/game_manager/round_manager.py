@@ -22,6 +22,11 @@ from app.services.game_manager.fsm.round_fsm import (
     RoundState,
     TsumoState,
 )
+from app.services.game_manager.helpers.tenpai_assist_cache import TenpaiAssistCache
+from app.services.game_manager.helpers.tenpai_assist_service import (
+    TenpaiAssistanceInfo,
+    tenpai_assist_service,
+)
 from app.services.game_manager.helpers.tenpai_assistant import TenpaiAssistant
 from app.services.game_manager.models.action import Action
 from app.services.game_manager.models.call_block import CallBlock
@@ -47,7 +52,8 @@ from app.services.game_manager.models.winning_conditions import (
 from app.services.score_calculator.enums.enums import Tile
 from app.services.score_calculator.hand.hand import Hand
 from app.services.score_calculator.result.result import ScoreResult
-from app.services.score_calculator.score_calculator import ScoreCalculator
+from app.services.score_calculator.score_cache import score_cache
+from app.services.score_calculator.score_calculator import can_reach_score
 from app.services.score_calculator.winning_conditions.winning_conditions import (
     WinningConditions,
 )
@@ -74,6 +80,10 @@ class RoundManager:
         self.action_choices_list: list[list[Action]]
         self.current_state: RoundState | None = None
         self.remaining_time: float = 0.0
+        # tenpai assistance of this round, reused across the turns
+        self.tenpai_assist_cache: TenpaiAssistCache = TenpaiAssistCache()
+        # fills the cache with the next drawer's assistance during a call wait
+        self.speculative_assist_task: asyncio.Task[bool] | None = None
 
     async def send_watch_reload_data(self) -> None:
         player_list = self.game_manager.player_list
@@ -225,6 +235,8 @@ class RoundManager:
             GameHand.create_from_tiles(tiles=self.tile_deck.draw_haipai())
             for _ in range(self.game_manager.MAX_PLAYERS)
         ]
+        for hand in self.hands:
+            hand.enable_analysis()
         self.hands[AbsoluteSeat.EAST].apply_tsumo(
             tile=self.tile_deck.draw_tiles(count=1)[0],
         )
@@ -555,10 +567,15 @@ class RoundManager:
         )
 
         actions_lists: list[list[Action]] = self.check_actions_after_discard()
-        return await self.send_actions_and_wait(
+        self.start_speculative_tenpai_assist()
+        response_event: GameEvent | None = await self.send_actions_and_wait(
             message_event_type=MessageEventType.DISCARD_ACTIONS,
             actions_lists=actions_lists,
         )
+        if response_event is not None:
+            # a call or a hu takes the turn from the next drawer
+            self.cancel_speculative_tenpai_assist()
+        return response_event
 
     def check_actions_after_discard(self) -> list[list[Action]]:
         result: list[list[Action]] = [[] for _ in range(self.game_manager.MAX_PLAYERS)]
@@ -635,15 +652,9 @@ class RoundManager:
             },
         )
         if message_event_type == MessageEventType.TSUMO_ACTIONS:
-            tenpai_assistant: TenpaiAssistant = TenpaiAssistant(
-                game_hand=self.hands[seat],
-                game_winning_conditions=self.winning_conditions,
-                visible_tiles_count=self.visible_tiles_count,
-                round_wind=AbsoluteSeat(self.game_manager.current_round // 4),
-                seat_wind=seat,
-            )
-            msg.data["tenpai_assist"] = (
-                tenpai_assistant.get_tenpai_assistance_info_in_full_hand()
+            self.add_tenpai_assist_data(
+                msg,
+                await self.get_tenpai_assist_data(seat=seat),
             )
         player: Player = self.get_player_from_seat(seat=seat)
         await self.game_manager.network_service.send_personal_message(
@@ -652,6 +663,103 @@ class RoundManager:
             user_id=player.uid,
         )
 
+    async def get_tenpai_assist_data(
+        self,
+        seat: AbsoluteSeat,
+    ) -> TenpaiAssistanceInfo | None:
+        """Return the tenpai assistance of the seat, or `None` past its deadline."""
+        if not await self.finish_speculative_tenpai_assist():
+            return None
+        if not self.can_discard_to_tenpai(self.hands[seat]):
+            return {}
+        return await tenpai_assist_service.get_tenpai_assistance_info_in_full_hand(
+            tenpai_assistant=self.create_tenpai_assistant(seat=seat),
+        )
+
+    def create_tenpai_assistant(self, seat: AbsoluteSeat) -> TenpaiAssistant:
+        tenpai_assistant = TenpaiAssistant(
+            game_hand=self.hands[seat],
+            game_winning_conditions=self.winning_conditions,
+            visible_tiles_count=self.visible_tiles_count,
+            seat_wind=seat,
+            round_wind=AbsoluteSeat(self.game_manager.current_round // 4),
+        )
+        tenpai_assistant.assist_cache = self.tenpai_assist_cache
+        return tenpai_assistant
+
+    @staticmethod
+    def can_discard_to_tenpai(game_hand: GameHand) -> bool:
+        # a full hand over one tile away from tenpai has no assistance to send
+        if game_hand.analysis is None:
+            return True
+        shanten: int | None = game_hand.analysis.shanten
+        return shanten is None or shanten <= 0
+
+    def start_speculative_tenpai_assist(self) -> None:
+        """Precompute the next drawer's assistance while the calls are awaited.
+
+        Without a call, the next seat draws the next tile of the deck, so the
+        assistance of that hand is added to `tenpai_assist_cache` in the
+        background, on an idle worker only, and the drawer finds it there. The
+        request has no deadline of its own, so it can use the whole wait for
+        the calls.
+        """
+        self.cancel_speculative_tenpai_assist()
+        if not tenpai_assist_service.is_running or self.tile_deck.tiles_remaining < 1:
+            return
+        tenpai_assistant: TenpaiAssistant = self.create_tenpai_assistant(
+            seat=self.current_player_seat.next_seat,
+        )
+        tenpai_assistant.game_hand.apply_tsumo(tile=self.tile_deck.peek_tile())
+        if not self.can_discard_to_tenpai(tenpai_assistant.game_hand):
+            return
+        self.speculative_assist_task = asyncio.create_task(
+            tenpai_assist_service.fill_assist_cache(
+                tenpai_assistant=tenpai_assistant,
+                is_speculative=True,
+            ),
+        )
+
+    def cancel_speculative_tenpai_assist(self) -> None:
+        if self.speculative_assist_task is not None:
+            self.speculative_assist_task.cancel()
+            self.speculative_assist_task = None
+
+    async def finish_speculative_tenpai_assist(self) -> bool:
+        """Wait for the speculation within the drawer's own deadline.
+
+        Returns whether the drawer may request its assistance. Past the
+        deadline, the worker is still computing the same discards, so a new
+        request would only wait behind it; its result reaches the cache later.
+        """
+        task: asyncio.Task[bool] | None = self.speculative_assist_task
+        self.speculative_assist_task = None
+        if task is None:
+            return True
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(task),
+                timeout=tenpai_assist_service.timeout,
+            )
+        except TimeoutError:
+            task.cancel()
+            return False
+        except Exception:
+            # a failed speculation only leaves the cache to the drawer's request
+            logger.exception(
+                "[finish_speculative_tenpai_assist] speculative assistance failed",
+            )
+        return True
+
+    @staticmethod
+    def add_tenpai_assist_data(
+        msg: WSMessage,
+        tenpai_assist_data: TenpaiAssistanceInfo | None,
+    ) -> None:
+        # an assistance past its deadline is left out of the message
+        if tenpai_assist_data is not None:
+            msg.data["tenpai_assist"] = tenpai_assist_data
+
     async def _initialize_pending_players(
         self,
         actions_lists: list[list[Action]],
@@ -781,6 +889,8 @@ class RoundManager:
         return None
 
     async def end_round_as_hu(self, current_event: GameEvent) -> None:
+        self.cancel_speculative_tenpai_assist()
+        self.tenpai_assist_cache.clear()
         score_result: ScoreResult = self.get_score_result(hu_event=current_event)
         self.apply_score_result(
             hu_player_seat=current_event.player_seat,
@@ -829,14 +939,14 @@ class RoundManager:
                     GameTile(self.winning_conditions.winning_tile),
                 )
             ] += 1
-        return ScoreCalculator(
+        return score_cache.get_score_result(
             hand=hand,
             winning_conditions=WinningConditions.create_from_game_winning_conditions(
                 game_winning_conditions=self.winning_conditions,
                 seat_wind=hu_event.player_seat,
                 round_wind=AbsoluteSeat(self.game_manager.current_round // 4),
             ),
-        ).result
+        )
 
     async def send_hu_hand_info(
         self,
@@ -877,6 +987,8 @@ class RoundManager:
         )
 
     async def end_round_as_draw(self) -> None:
+        self.cancel_speculative_tenpai_assist()
+        self.tenpai_assist_cache.clear()
         await self.send_draw_info()
 
     async def send_draw_info(self) -> None:
@@ -934,6 +1046,14 @@ class RoundManager:
             raise ValueError("[RoundManager.get_possible_hu_choices]tile is none")
         if GameTile(self.winning_conditions.winning_tile).is_flower:
             return []
+        waiting_tiles: list[Tile] | None = self._get_waiting_tiles(
+            player_seat=player_seat,
+        )
+        if (
+            waiting_tiles is not None
+            and Tile(self.winning_conditions.winning_tile) not in waiting_tiles
+        ):
+            return []
         if (
             self.winning_conditions.is_discarded
             or self.winning_conditions.is_robbing_the_kong
@@ -950,18 +1070,36 @@ class RoundManager:
                     tile=self.winning_conditions.winning_tile,
                 ),
             ]
-            if ScoreCalculator(
+            if can_reach_score(
                 hand=_hand,
                 winning_conditions=WinningConditions.create_from_game_winning_conditions(
                     game_winning_conditions=self.winning_conditions,
                     seat_wind=player_seat,
                     round_wind=AbsoluteSeat(self.game_manager.current_round // 4),
                 ),
-            ).result.total_score
-            >= self.game_manager.MINIMUM_HU_SCORE
+                target_score=self.game_manager.MINIMUM_HU_SCORE,
+                waiting_tiles=waiting_tiles,
+            )
             else []
         )
 
+    def _get_waiting_tiles(self, player_seat: AbsoluteSeat) -> list[Tile] | None:
+        # tracked waits of the hand without the winning tile, None when the
+        # hand is not tracked or the winning tile is not its tsumo tile
+        hand: GameHand = self.hands[player_seat]
+        winning_tile: GameTile | None = self.winning_conditions.winning_tile
+        if hand.analysis is None or winning_tile is None:
+            return None
+        if (
+            self.winning_conditions.is_discarded
+            or self.winning_conditions.is_robbing_the_kong
+        ):
+            if hand.tsumo_tile is not None:
+                return None
+        elif hand.tsumo_tile != winning_tile:
+            return None
+        return hand.analysis.waiting_tiles
+
     def get_possible_flower_choices(self, player_seat: AbsoluteSeat) -> list[Action]:
         result: list[Action] = []
         if (
@@ -1391,16 +1529,10 @@ class RoundManager:
         applied_result: Any,
     ) -> None:
         self.game_manager.increase_action_id()
+        tenpai_assist_data: TenpaiAssistanceInfo | None = None
         if response_event.event_type in {GameEventType.CHII, GameEventType.PON}:
-            tenpai_assistant: TenpaiAssistant = TenpaiAssistant(
-                game_hand=self.hands[response_event.player_seat],
-                game_winning_conditions=self.winning_conditions,
-                visible_tiles_count=self.visible_tiles_count,
-                round_wind=AbsoluteSeat(self.game_manager.current_round // 4),
-                seat_wind=response_event.player_seat,
-            )
-            tenpai_assist_data = (
-                tenpai_assistant.get_tenpai_assistance_info_in_full_hand()
+            tenpai_assist_data = await self.get_tenpai_assist_data(
+                seat=response_event.player_seat,
             )
         match response_event.event_type:
             case GameEventType.FLOWER:
@@ -1460,9 +1592,9 @@ class RoundManager:
                         "seat": response_event.player_seat,
                         "call_block_data": applied_result,
                         "action_id": self.game_manager.action_id,
-                        "tenpai_assist": tenpai_assist_data,
                     },
                 )
+                self.add_tenpai_assist_data(msg_personal, tenpai_assist_data)
                 await self.game_manager.network_service.send_personal_message(
                     message=msg_personal.model_dump(),
                     game_id=self.game_manager.game_id,
@@ -1491,9 +1623,9 @@ class RoundManager:
                         "seat": response_event.player_seat,
                         "call_block_data": applied_result,
                         "action_id": self.game_manager.action_id,
-                        "tenpai_assist": tenpai_assist_data,
                     },
                 )
+                self.add_tenpai_assist_data(msg_personal, tenpai_assist_data)
                 await self.game_manager.network_service.send_personal_message(
                     message=msg_personal.model_dump(),
                     game_id=self.game_manager.game_id,
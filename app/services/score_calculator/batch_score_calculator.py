@@ -0,0 +1,367 @@
+"""Scores of many hands at once, from an (N, 35) array of tile counts.
+
+Shape detection and the tile-class yaku checks are run as NumPy operations
+over the whole batch. Hands whose only shape is seven pairs, thirteen orphans
+or honors and knitted tiles, and hands with flowers, are scored from those
+results directly; every other hand needs block division and is scored by
+`ScoreCalculator` one at a time. The results are the same as
+`ScoreCalculator`'s.
+
+NumPy is an optional dependency (`poetry install --with analysis`) and only
+this module imports it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Final
+
+import numpy as np
+import numpy.typing as npt
+
+from app.services.score_calculator.block.block import Block
+from app.services.score_calculator.divide.honors_and_knitted_shape import (
+    KNITTED_CASES,
+)
+from app.services.score_calculator.divide.suit_decomposition import (
+    HONOR_SIZE,
+    HONOR_TABLE,
+    MAX_TILE_COUNT,
+    NUMBER_SUIT_TABLE,
+    PAIR_SIZE,
+    SUIT_SIZE,
+    TILE_COUNT_BITS,
+)
+from app.services.score_calculator.enums.enums import Tile, Yaku
+from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.result.result import ScoreResult
+from app.services.score_calculator.score_calculator import ScoreCalculator
+from app.services.score_calculator.utility.yaku_exclusion import (
+    process_yaku_exclusions,
+)
+from app.services.score_calculator.winning_conditions.winning_conditions import (
+    WinningConditions,
+)
+from app.services.score_calculator.yaku_check.hand_yaku_checker import (
+    GREEN_TILES,
+    REVERSIBLE_TILES,
+)
+from app.services.score_calculator.yaku_check.winning_conditions_yaku_checker import (
+    WinningConditionsYakuChecker,
+)
+
+BoolArray = npt.NDArray[np.bool_]
+IntArray = npt.NDArray[np.int64]
+
+TILES_COUNT: Final[int] = Tile.F0.value + 1
+FULLY_HAND_SIZE: Final[int] = 14
+MELD_SIZE: Final[int] = 3
+NUMBER_SUITS_COUNT: Final[int] = 3
+GREATER_HONORS_COUNT: Final[int] = 7
+KNITTED_STRAIGHT_HONORS_COUNT: Final[int] = 5
+SEVEN_SHIFTED_PAIRS_BITS: Final[list[int]] = [0b1111111 << shift for shift in range(3)]
+
+
+def _tiles_mask(condition: Callable[[Tile], bool]) -> BoolArray:
+    return np.array([condition(Tile(tile)) for tile in Tile.all_tiles()])
+
+
+# first-match groups of `HandYakuChecker` that depend only on the tile kinds
+TILE_CLASS_YAKU_GROUPS: Final[list[list[tuple[Yaku, BoolArray]]]] = [
+    [
+        (Yaku.UpperTiles, _tiles_mask(lambda t: t.is_number and t.number >= 7)),
+        (Yaku.MiddleTiles, _tiles_mask(lambda t: t.is_number and 4 <= t.number <= 6)),
+        (Yaku.LowerTiles, _tiles_mask(lambda t: t.is_number and t.number <= 3)),
+        (Yaku.UpperFour, _tiles_mask(lambda t: t.is_number and t.number >= 6)),
+        (Yaku.LowerFour, _tiles_mask(lambda t: t.is_number and t.number <= 4)),
+    ],
+    [
+        (Yaku.AllHonors, _tiles_mask(lambda t: t.is_honor)),
+        (Yaku.AllTerminals, _tiles_mask(lambda t: t.is_terminal)),
+        (Yaku.AllTerminalsAndHonors, _tiles_mask(lambda t: t.is_outside)),
+        (Yaku.AllSimples, _tiles_mask(lambda t: t.is_number and 2 <= t.number <= 8)),
+        (Yaku.NoHonorTiles, _tiles_mask(lambda t: not t.is_honor)),
+    ],
+]
+ALL_GREEN_MASK: Final[BoolArray] = _tiles_mask(lambda t: t in GREEN_TILES)
+REVERSIBLE_TILES_MASK: Final[BoolArray] = _tiles_mask(
+    lambda t: t in REVERSIBLE_TILES,
+)
+OUTSIDE_MASK: Final[BoolArray] = _tiles_mask(lambda t: t.is_outside)
+WIND_MASK: Final[BoolArray] = _tiles_mask(lambda t: t.is_wind)
+DRAGON_MASK: Final[BoolArray] = _tiles_mask(lambda t: t.is_dragon)
+KNITTED_CASE_MASKS: Final[BoolArray] = np.array(
+    [[tile in case for tile in Tile.all_tiles()] for case in KNITTED_CASES],
+)
+# tiles an honors and knitted hand of each knitted case may hold, once each
+HONORS_AND_KNITTED_MASKS: Final[BoolArray] = KNITTED_CASE_MASKS | _tiles_mask(
+    lambda t: t.is_honor,
+)
+# (first tile, size, sorted packed suits that divide into blocks) of each suit
+SUIT_TABLE_KEYS: Final[list[tuple[int, int, IntArray]]] = [
+    (Tile.M1.value, SUIT_SIZE, np.array(sorted(NUMBER_SUIT_TABLE), dtype=np.int64)),
+    (Tile.P1.value, SUIT_SIZE, np.array(sorted(NUMBER_SUIT_TABLE), dtype=np.int64)),
+    (Tile.S1.value, SUIT_SIZE, np.array(sorted(NUMBER_SUIT_TABLE), dtype=np.int64)),
+    (Tile.Z1.value, HONOR_SIZE, np.array(sorted(HONOR_TABLE), dtype=np.int64)),
+]
+
+# (is_discarded, is_last_tile_in_the_game, is_last_tile_of_its_kind,
+# is_replacement_tile, is_robbing_the_kong)
+_ConditionsKey = tuple[bool, bool, bool, bool, bool]
+
+
+@dataclass(frozen=True)
+class BatchScoreResult:
+    total_scores: IntArray
+    yaku_score_lists: list[list[tuple[Yaku, int]]]
+    # rows that needed block division and were scored by `ScoreCalculator`
+    fallback_rows: BoolArray
+
+
+@dataclass(frozen=True)
+class _BatchShapes:
+    has_flower: BoolArray
+    is_honors_and_knitted: BoolArray
+    is_thirteen_orphans: BoolArray
+    # seven pairs that cannot be divided into any other shape
+    is_seven_pairs: BoolArray
+
+    @property
+    def fallback_rows(self) -> BoolArray:
+        return ~(
+            self.has_flower
+            | self.is_honors_and_knitted
+            | self.is_thirteen_orphans
+            | self.is_seven_pairs
+        )
+
+
+def calculate_batch_scores(
+    tiles: npt.ArrayLike,
+    call_blocks: Sequence[list[Block]],
+    winning_conditions: Sequence[WinningConditions],
+) -> BatchScoreResult:
+    """Score every row of `tiles` with its call blocks and winning conditions.
+
+    Like `ScoreCalculator`, rows scored by it set `count_tenpai_tiles` of their
+    winning conditions; the other rows leave them untouched.
+    """
+    tiles_count: IntArray = np.asarray(tiles, dtype=np.int64)
+    if (
+        tiles_count.ndim != 2
+        or tiles_count.shape[1] != TILES_COUNT
+        or not len(call_blocks) == len(winning_conditions) == len(tiles_count)
+    ):
+        raise ValueError("Wrong batch shape.")
+
+    shapes: _BatchShapes = _detect_shapes(
+        tiles_count,
+        has_calls=np.array([bool(blocks) for blocks in call_blocks], dtype=np.bool_),
+    )
+    shape_yakus: list[list[Yaku]] = _get_shape_yakus(tiles_count, shapes)
+    tile_hogs_count: IntArray = (tiles_count[:, : Tile.F0] == MAX_TILE_COUNT).sum(
+        axis=1,
+    )
+    fallback_rows: BoolArray = shapes.fallback_rows
+    conditions_yakus: dict[_ConditionsKey, list[Yaku]] = {}
+
+    total_scores: IntArray = np.zeros(len(tiles_count), dtype=np.int64)
+    yaku_score_lists: list[list[tuple[Yaku, int]]] = []
+    for row, row_winning_conditions in enumerate(winning_conditions):
+        score_result: ScoreResult
+        if fallback_rows[row]:
+            score_result = ScoreCalculator(
+                hand=Hand(
+                    tiles=tiles_count[row].tolist(),
+                    call_blocks=deepcopy(call_blocks[row]),
+                ),
+                winning_conditions=row_winning_conditions,
+            ).result
+        elif shapes.has_flower[row]:
+            score_result = ScoreResult(yaku_score_list=[])
+        else:
+            score_result = _score_yakus(
+                shape_yakus[row]
+                + _get_conditions_yakus(row_winning_conditions, conditions_yakus),
+                int(tile_hogs_count[row]),
+            )
+        total_scores[row] = score_result.total_score
+        yaku_score_lists.append(score_result.yaku_score_list)
+    return BatchScoreResult(
+        total_scores=total_scores,
+        yaku_score_lists=yaku_score_lists,
+        fallback_rows=fallback_rows,
+    )
+
+
+def _detect_shapes(tiles_count: IntArray, has_calls: BoolArray) -> _BatchShapes:
+    counts: IntArray = tiles_count[:, : Tile.F0]
+    present: BoolArray = counts > 0
+    is_concealed_full_hand: BoolArray = (
+        ~has_calls
+        & (tiles_count.sum(axis=1) == FULLY_HAND_SIZE)
+        & ((counts >= 0) & (counts <= MAX_TILE_COUNT)).all(axis=1)
+    )
+    is_seven_pairs: BoolArray = (
+        is_concealed_full_hand
+        & (counts % PAIR_SIZE == 0).all(axis=1)
+        & ~_can_be_general_shape(counts)
+        & ~(present[:, None, :] >= KNITTED_CASE_MASKS).all(axis=2).any(axis=1)
+    )
+    return _BatchShapes(
+        has_flower=tiles_count[:, Tile.F0] > 0,
+        is_honors_and_knitted=is_concealed_full_hand
+        & (counts[:, None, :] <= HONORS_AND_KNITTED_MASKS).all(axis=2).any(axis=1),
+        is_thirteen_orphans=is_concealed_full_hand
+        & (present == OUTSIDE_MASK).all(axis=1),
+        is_seven_pairs=is_seven_pairs,
+    )
+
+
+def _can_be_general_shape(counts: IntArray) -> BoolArray:
+    # every suit is in its decomposition table and exactly one holds the pair
+    can_divide: BoolArray = np.ones(len(counts), dtype=np.bool_)
+    pairs_count: IntArray = np.zeros(len(counts), dtype=np.int64)
+    for start_tile, size, keys in SUIT_TABLE_KEYS:
+        suit: IntArray = counts[:, start_tile : start_tile + size]
+        packed: IntArray = suit @ (1 << (TILE_COUNT_BITS * np.arange(size)))
+        can_divide &= np.isin(packed, keys)
+        pairs_count += suit.sum(axis=1) % MELD_SIZE == PAIR_SIZE
+    has_one_pair: BoolArray = pairs_count == 1
+    return can_divide & has_one_pair
+
+
+def _get_shape_yakus(tiles_count: IntArray, shapes: _BatchShapes) -> list[list[Yaku]]:
+    counts: IntArray = tiles_count[:, : Tile.F0]
+    present: BoolArray = counts > 0
+    suits_count: IntArray = (
+        present[:, : Tile.Z1]
+        .reshape(-1, NUMBER_SUITS_COUNT, SUIT_SIZE)
+        .any(axis=2)
+        .sum(axis=1)
+    )
+    has_honor: BoolArray = present[:, Tile.Z1 :].any(axis=1)
+    honors_count: IntArray = present[:, Tile.Z1 :].sum(axis=1)
+    number_bits: IntArray = (
+        present[:, : Tile.Z1]
+        .reshape(-1, NUMBER_SUITS_COUNT, SUIT_SIZE)
+        .astype(np.int64)
+        @ (1 << np.arange(SUIT_SIZE))
+    ).sum(axis=1)
+
+    # yakus of each first-match group, in the order `ScoreCalculator` adds them
+    seven_pairs_groups: list[tuple[list[list[Yaku]], IntArray]] = [
+        (
+            [[yaku] for yaku, _ in group],
+            _first_matches([_has_only(present, mask) for _, mask in group]),
+        )
+        for group in TILE_CLASS_YAKU_GROUPS
+    ]
+    seven_pairs_groups += [
+        (
+            [[Yaku.FullFlush], [Yaku.HalfFlush], [Yaku.OneVoidedSuit]],
+            _first_matches(
+                [(suits_count == 1) & ~has_honor, suits_count == 1, suits_count == 2],
+            ),
+        ),
+        (
+            [[Yaku.SevenShiftedPairs], [Yaku.SevenPairs]],
+            _first_matches(
+                [
+                    (suits_count == 1)
+                    & ~has_honor
+                    & np.isin(number_bits, SEVEN_SHIFTED_PAIRS_BITS),
+                    np.ones(len(counts), dtype=np.bool_),
+                ],
+            ),
+        ),
+        ([[Yaku.AllGreen]], _first_matches([_has_only(present, ALL_GREEN_MASK)])),
+        (
+            [[Yaku.ReversibleTiles]],
+            _first_matches([_has_only(present, REVERSIBLE_TILES_MASK)]),
+        ),
+        (
+            [[Yaku.AllTypes]],
+            _first_matches(
+                [
+                    (suits_count == NUMBER_SUITS_COUNT)
+                    & (present & WIND_MASK).any(axis=1)
+                    & (present & DRAGON_MASK).any(axis=1),
+                ],
+            ),
+        ),
+    ]
+    honors_and_knitted_matches: IntArray = _first_matches(
+        [
+            honors_count == GREATER_HONORS_COUNT,
+            honors_count == KNITTED_STRAIGHT_HONORS_COUNT,
+            np.ones(len(counts), dtype=np.bool_),
+        ],
+    )
+    honors_and_knitted_yakus: list[list[Yaku]] = [
+        [Yaku.GreaterHonorsAndKnittedTiles],
+        [Yaku.LesserHonorsAndKnittedTiles, Yaku.KnittedStraight],
+        [Yaku.LesserHonorsAndKnittedTiles],
+    ]
+
+    shape_yakus: list[list[Yaku]] = []
+    for row in range(len(counts)):
+        yakus: list[Yaku] = []
+        if shapes.is_honors_and_knitted[row]:
+            yakus += honors_and_knitted_yakus[honors_and_knitted_matches[row]]
+        elif shapes.is_thirteen_orphans[row]:
+            yakus.append(Yaku.ThirteenOrphans)
+        elif shapes.is_seven_pairs[row]:
+            for group_yakus, matches in seven_pairs_groups:
+                if matches[row] >= 0:
+                    yakus += group_yakus[matches[row]]
+        shape_yakus.append(yakus)
+    return shape_yakus
+
+
+def _has_only(present: BoolArray, mask: BoolArray) -> BoolArray:
+    return ~(present & ~mask).any(axis=1)
+
+
+def _first_matches(matches: list[BoolArray]) -> IntArray:
+    # index of the first true condition of each row, -1 if there is none
+    stacked: BoolArray = np.stack(matches, axis=1)
+    return np.where(stacked.any(axis=1), stacked.argmax(axis=1), -1)
+
+
+def _get_conditions_yakus(
+    winning_conditions: WinningConditions,
+    cache: dict[_ConditionsKey, list[Yaku]],
+) -> list[Yaku]:
+    # the rows scored here are concealed and have no melds, so the yakus only
+    # depend on these flags
+    key: _ConditionsKey = (
+        winning_conditions.is_discarded,
+        winning_conditions.is_last_tile_in_the_game,
+        winning_conditions.is_last_tile_of_its_kind,
+        winning_conditions.is_replacement_tile,
+        winning_conditions.is_robbing_the_kong,
+    )
+    if key not in cache:
+        cache[key] = WinningConditionsYakuChecker(
+            blocks=[],
+            winning_conditions=winning_conditions,
+        ).yakus
+    return cache[key]
+
+
+def _score_yakus(yaku_list: list[Yaku], tile_hogs_count: int) -> ScoreResult:
+    # same as `ScoreCalculator._calculate_score_result` for hands without melds,
+    # which never count a pung of terminals or honors
+    yaku_dict = process_yaku_exclusions(yaku_list)
+    score_result: ScoreResult = ScoreResult(yaku_score_list=[])
+    for yaku, count in yaku_dict.items():
+        score_result.add_yaku(yaku, count)
+    if tile_hogs_count > 0 and not (
+        Yaku.SevenPairs in yaku_dict
+        and (Yaku.AllTerminals in yaku_dict or Yaku.AllGreen in yaku_dict)
+    ):
+        score_result.add_yaku(Yaku.TileHog, tile_hogs_count)
+    return score_result
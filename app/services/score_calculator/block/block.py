@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Final
+from collections.abc import Callable
+from typing import Any, Final
 
 from app.services.game_manager.models.call_block import CallBlock
 from app.services.game_manager.models.types import CallBlockType
@@ -12,8 +12,27 @@ KNITTED_SIZE: Final[int] = 3
 KNITTED_GAP: Final[int] = 3
 FIVE: Final[int] = 5
 
+# bits of `Block.flags`
+SEQUENCE_FLAG: Final[int] = 1 << 0
+PUNG_FLAG: Final[int] = 1 << 1
+QUAD_FLAG: Final[int] = 1 << 2
+PAIR_FLAG: Final[int] = 1 << 3
+KNITTED_FLAG: Final[int] = 1 << 4
+NUMBER_FLAG: Final[int] = 1 << 5
+HONOR_FLAG: Final[int] = 1 << 6
+MANZU_FLAG: Final[int] = 1 << 7
+PINZU_FLAG: Final[int] = 1 << 8
+SOUZU_FLAG: Final[int] = 1 << 9
+WIND_FLAG: Final[int] = 1 << 10
+DRAGON_FLAG: Final[int] = 1 << 11
+TERMINAL_FLAG: Final[int] = 1 << 12
+OUTSIDE_FLAG: Final[int] = 1 << 13
+HAS_OUTSIDE_FLAG: Final[int] = 1 << 14
+HAS_FIVE_FLAG: Final[int] = 1 << 15
+
+TILES_COUNT: Final[int] = Tile.F0.value + 1
+
 
-@dataclass
 class Block:
     """Represents a block of tiles.
 
@@ -23,15 +42,28 @@ class Block:
         999p -> 9p,
         147s -> 1s.
 
+    Blocks are immutable and interned: there is one instance for each
+    (type, tile, is_opened), created at import together with its property
+    flags, so creating a block is a table lookup and equal blocks are the
+    same object.
+
     Attributes:
         type (BlockType): The type of block (e.g., sequence, triplet, etc.).
         tile (int): The first tile of the block.
         is_opened (bool): open state of the block (default is False(Closed block)).
+        flags (int): The `*_FLAG` bits of the properties that hold for the block.
     """
 
+    __slots__ = ("_tiles", "flags", "is_opened", "tile", "type")
+
     type: BlockType
     tile: Tile
-    is_opened: bool = False
+    is_opened: bool
+    flags: int
+    _tiles: tuple[Tile, ...]
+
+    def __new__(cls, type: BlockType, tile: Tile, is_opened: bool = False) -> Block:
+        return _BLOCKS[_get_block_index(type, tile, is_opened)]
 
     @staticmethod
     def create_from_call_block(block: CallBlock) -> Block:
@@ -55,77 +87,159 @@ class Block:
             is_opened=(block.type != CallBlockType.AN_KONG),
         )
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"cannot delete field '{name}'")
+
+    def __copy__(self) -> Block:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> Block:
+        return self
+
+    def __reduce__(self) -> tuple[Callable[..., Block], tuple[BlockType, Tile, bool]]:
+        return Block, (self.type, self.tile, self.is_opened)
+
+    def __repr__(self) -> str:
+        return (
+            f"Block(type={self.type!r}, tile={self.tile!r}, "
+            f"is_opened={self.is_opened!r})"
+        )
+
     @property
     def is_sequence(self) -> bool:
-        return self.type == BlockType.SEQUENCE
+        return bool(self.flags & SEQUENCE_FLAG)
 
     @property
     def is_pung(self) -> bool:
-        return self.type in {BlockType.TRIPLET, BlockType.QUAD}
+        return bool(self.flags & PUNG_FLAG)
 
     @property
     def is_quad(self) -> bool:
-        return self.type == BlockType.QUAD
+        return bool(self.flags & QUAD_FLAG)
 
     @property
     def is_pair(self) -> bool:
-        return self.type == BlockType.PAIR
+        return bool(self.flags & PAIR_FLAG)
 
     @property
     def is_knitted(self) -> bool:
-        return self.type == BlockType.KNITTED
+        return bool(self.flags & KNITTED_FLAG)
 
     @property
     def is_number(self) -> bool:
-        return self.tile.is_number
+        return bool(self.flags & NUMBER_FLAG)
 
     @property
     def is_honor(self) -> bool:
-        return self.tile.is_honor
+        return bool(self.flags & HONOR_FLAG)
 
     @property
     def is_manzu(self) -> bool:
-        return self.tile.is_manzu
+        return bool(self.flags & MANZU_FLAG)
 
     @property
     def is_pinzu(self) -> bool:
-        return self.tile.is_pinzu
+        return bool(self.flags & PINZU_FLAG)
 
     @property
     def is_souzu(self) -> bool:
-        return self.tile.is_souzu
+        return bool(self.flags & SOUZU_FLAG)
 
     @property
     def is_wind(self) -> bool:
-        return self.tile.is_wind
+        return bool(self.flags & WIND_FLAG)
 
     @property
     def is_dragon(self) -> bool:
-        return self.tile.is_dragon
+        return bool(self.flags & DRAGON_FLAG)
 
     @property
     def is_terminal(self) -> bool:
-        return all(tile.is_terminal for tile in self.tiles)
+        return bool(self.flags & TERMINAL_FLAG)
 
     @property
     def is_outside(self) -> bool:
-        return self.is_honor or self.is_terminal
+        return bool(self.flags & OUTSIDE_FLAG)
 
     @property
     def has_outside(self) -> bool:
-        return any(tile.is_outside for tile in self.tiles)
+        return bool(self.flags & HAS_OUTSIDE_FLAG)
 
     @property
     def has_five(self) -> bool:
-        return any(tile.number == FIVE for tile in self.tiles)
-
-    @property
-    def tiles(self) -> list[Tile]:
-        tiles: list[Tile] = []
-        if self.type == BlockType.SEQUENCE:
-            tiles = [self.tile + i for i in range(SEQUENCE_SIZE)]
-        elif self.type == BlockType.KNITTED:
-            tiles = [self.tile + i for i in range(0, KNITTED_SIZE, KNITTED_GAP)]
-        else:
-            tiles = [self.tile]
-        return tiles
+        return bool(self.flags & HAS_FIVE_FLAG)
+
+    @property
+    def tiles(self) -> tuple[Tile, ...]:
+        return self._tiles
+
+
+def _get_block_index(block_type: BlockType, tile: int, is_opened: bool) -> int:
+    if not 0 <= tile < TILES_COUNT:
+        raise ValueError(f"{tile} is not a valid Tile")
+    return (block_type.value * TILES_COUNT + tile) * 2 + bool(is_opened)
+
+
+def _get_block_tiles(block_type: BlockType, tile: Tile) -> tuple[Tile, ...]:
+    offsets: range
+    if block_type == BlockType.SEQUENCE:
+        offsets = range(SEQUENCE_SIZE)
+    elif block_type == BlockType.KNITTED:
+        offsets = range(0, KNITTED_SIZE, KNITTED_GAP)
+    else:
+        offsets = range(1)
+    # sequences that would run past the last tile only exist in this table
+    return tuple(
+        Tile(tile.value + offset)
+        for offset in offsets
+        if tile.value + offset < TILES_COUNT
+    )
+
+
+def _get_block_flags(block_type: BlockType, tile: Tile, tiles: tuple[Tile, ...]) -> int:
+    is_terminal: bool = all(block_tile.is_terminal for block_tile in tiles)
+    conditions: list[tuple[int, bool]] = [
+        (SEQUENCE_FLAG, block_type == BlockType.SEQUENCE),
+        (PUNG_FLAG, block_type in {BlockType.TRIPLET, BlockType.QUAD}),
+        (QUAD_FLAG, block_type == BlockType.QUAD),
+        (PAIR_FLAG, block_type == BlockType.PAIR),
+        (KNITTED_FLAG, block_type == BlockType.KNITTED),
+        (NUMBER_FLAG, tile.is_number),
+        (HONOR_FLAG, tile.is_honor),
+        (MANZU_FLAG, tile.is_manzu),
+        (PINZU_FLAG, tile.is_pinzu),
+        (SOUZU_FLAG, tile.is_souzu),
+        (WIND_FLAG, tile.is_wind),
+        (DRAGON_FLAG, tile.is_dragon),
+        (TERMINAL_FLAG, is_terminal),
+        (OUTSIDE_FLAG, tile.is_honor or is_terminal),
+        (HAS_OUTSIDE_FLAG, any(block_tile.is_outside for block_tile in tiles)),
+        (HAS_FIVE_FLAG, any(block_tile.number == FIVE for block_tile in tiles)),
+    ]
+    return sum(flag for flag, condition in conditions if condition)
+
+
+def _create_block(block_type: BlockType, tile: Tile, is_opened: bool) -> Block:
+    block: Block = object.__new__(Block)
+    tiles: tuple[Tile, ...] = _get_block_tiles(block_type, tile)
+    for name, value in (
+        ("type", block_type),
+        ("tile", tile),
+        ("is_opened", is_opened),
+        ("flags", _get_block_flags(block_type, tile, tiles)),
+        ("_tiles", tiles),
+    ):
+        object.__setattr__(block, name, value)
+    return block
+
+
+# every block, at `_get_block_index` of its (type, tile, is_opened)
+_BLOCKS: Final[list[Block]] = [
+    _create_block(block_type, Tile(tile), is_opened)
+    for block_type in sorted(BlockType, key=lambda block_type: block_type.value)
+    for tile in range(TILES_COUNT)
+    for is_opened in (False, True)
+]
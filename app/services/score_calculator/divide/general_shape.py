@@ -2,9 +2,18 @@ from __future__ import annotations
 
 from copy import deepcopy
 from dataclasses import dataclass
+from itertools import product
 from typing import Final
 
 from app.services.score_calculator.block.block import Block
+from app.services.score_calculator.divide.suit_decomposition import (
+    HONOR_TABLE,
+    MAX_TILE_COUNT,
+    NUMBER_SUIT_TABLE,
+    SUIT_SIZE,
+    SuitDecomposition,
+    pack_tiles_count,
+)
 from app.services.score_calculator.enums.enums import BlockType, Tile
 from app.services.score_calculator.hand.hand import Hand
 
@@ -25,20 +34,32 @@ KNITTED_CASES: Final[list[list[Tile]]] = [
     [Tile.P1, Tile.P4, Tile.P7, Tile.M2, Tile.M5, Tile.M8, Tile.S3, Tile.S6, Tile.S9],
     [Tile.P1, Tile.P4, Tile.P7, Tile.S2, Tile.S5, Tile.S8, Tile.M3, Tile.M6, Tile.M9],
 ]
+# (first tile of the suit, decomposition table of the suit)
+SUIT_TABLES: Final[list[tuple[int, dict[int, tuple[SuitDecomposition, ...]]]]] = [
+    (Tile.M1.value, NUMBER_SUIT_TABLE),
+    (Tile.P1.value, NUMBER_SUIT_TABLE),
+    (Tile.S1.value, NUMBER_SUIT_TABLE),
+    (Tile.Z1.value, HONOR_TABLE),
+]
 
 
 @dataclass
 class BlockDivisionState:
+    """Mutable search state shared by every branch of a block division.
+
+    The tile counts and the parsed block stack are modified in place while
+    searching and restored on backtrack, so no state is copied per branch.
+    `Block` objects are only created for completed divisions.
+    """
+
     remaining_tiles_count: list[int]
-    parsed_blocks: list[Block]
-    current_tile: Tile
-    previous_tile: Tile
-    has_pair: bool
-    previous_was_sequence: bool
+    parsed_blocks: list[tuple[BlockType, int]]
+    call_blocks: list[Block]
+    has_pair: bool = False
 
     @staticmethod
     def create_from_hand(hand: Hand) -> BlockDivisionState:
-        _remaining_tiles_count: list[int] = deepcopy(hand.tiles)
+        _remaining_tiles_count: list[int] = hand.tiles[:]
         for block in hand.call_blocks:
             if block.type == BlockType.PAIR:
                 _remaining_tiles_count[block.tile] -= PAIR_SIZE
@@ -54,13 +75,25 @@ class BlockDivisionState:
                     _remaining_tiles_count[block.tile + i * KNITTED_GAP] -= 1
         return BlockDivisionState(
             remaining_tiles_count=_remaining_tiles_count,
-            parsed_blocks=deepcopy(hand.call_blocks),
-            current_tile=Tile.M1,
-            previous_tile=Tile.F0,
-            has_pair=False,
-            previous_was_sequence=False,
+            parsed_blocks=[],
+            call_blocks=hand.call_blocks,
         )
 
+    @property
+    def is_complete(self) -> bool:
+        return len(self.call_blocks) + len(self.parsed_blocks) == GENERAL_SHAPE_SIZE
+
+    def materialize(self) -> list[Block]:
+        blocks: list[Block] = [
+            Block(type=block.type, tile=block.tile, is_opened=block.is_opened)
+            for block in self.call_blocks
+        ]
+        blocks.extend(
+            Block(type=block_type, tile=Tile(tile), is_opened=False)
+            for block_type, tile in self.parsed_blocks
+        )
+        return blocks
+
 
 def divide_general_shape_knitted_sub(hand: Hand) -> list[list[Block]]:
     has_knitted_blocks: bool
@@ -79,70 +112,145 @@ def divide_general_shape_knitted_sub(hand: Hand) -> list[list[Block]]:
 
 
 def divide_general_shape(hand: Hand) -> list[list[Block]]:
-    parsed_hands: list[list[Block]] = []
+    _validate_hand_size(hand)
+    state = BlockDivisionState.create_from_hand(hand)
+    if all(
+        0 <= count <= MAX_TILE_COUNT for count in state.remaining_tiles_count[: Tile.F0]
+    ):
+        return _divide_by_suit_tables(state)
+    # Counts the tables do not cover (e.g. a fifth copy of a tile while probing
+    # waits) are still searched.
+    return _divide_by_search(state)
+
 
-    stack: list[BlockDivisionState] = []
-    stack.append(BlockDivisionState.create_from_hand(hand))
+def search_general_shape(hand: Hand) -> list[list[Block]]:
+    """Divide the hand with the backtracking search only, without the tables."""
+    _validate_hand_size(hand)
+    return _divide_by_search(BlockDivisionState.create_from_hand(hand))
+
+
+def _validate_hand_size(hand: Hand) -> None:
     total_tiles_count: int = sum(hand.tiles)
     for block in hand.call_blocks:
         total_tiles_count -= 1 if block.type == BlockType.QUAD else 0
     if total_tiles_count != FULLY_HAND_SIZE:
         raise ValueError("Wrong hand size.")
 
-    while stack:
-        state: BlockDivisionState = stack.pop()
-        next_state: BlockDivisionState
-
-        next_tile: Tile = state.current_tile
-        while next_tile < Tile.F0 and state.remaining_tiles_count[next_tile] == 0:
-            next_tile = next_tile + 1
-        # end point
-        if next_tile >= Tile.F0:
-            if len(state.parsed_blocks) == GENERAL_SHAPE_SIZE:
-                parsed_hands.append(state.parsed_blocks)
-            continue
-        # Triplet
-        if state.remaining_tiles_count[next_tile] >= TRIPLET_SIZE and (
-            state.previous_tile != next_tile or not state.previous_was_sequence
-        ):
-            next_state = deepcopy(state)
-            next_state.remaining_tiles_count[next_tile] -= TRIPLET_SIZE
-            next_state.parsed_blocks.append(
-                Block(type=BlockType.TRIPLET, tile=next_tile, is_opened=False),
-            )
-            next_state.previous_was_sequence = False
-            next_state.previous_tile = next_tile
-            stack.append(next_state)
-        # Pair
-        if (
-            state.remaining_tiles_count[next_tile] >= PAIR_SIZE
-            and not state.has_pair
-            and (state.previous_tile != next_tile or not state.previous_was_sequence)
-        ):
-            next_state = deepcopy(state)
-            next_state.remaining_tiles_count[next_tile] -= PAIR_SIZE
-            next_state.parsed_blocks.append(
-                Block(type=BlockType.PAIR, tile=next_tile, is_opened=False),
-            )
-            next_state.has_pair = True
-            next_state.previous_was_sequence = False
-            next_state.previous_tile = next_tile
-            stack.append(next_state)
-        # Sequence
+
+def _divide_by_suit_tables(state: BlockDivisionState) -> list[list[Block]]:
+    remaining: list[int] = state.remaining_tiles_count
+    suits_decompositions: list[tuple[SuitDecomposition, ...]] = []
+    for start_tile, table in SUIT_TABLES:
+        decompositions = table.get(
+            pack_tiles_count(remaining[start_tile : start_tile + SUIT_SIZE]),
+        )
+        if decompositions is None:
+            return []
+        suits_decompositions.append(decompositions)
+
+    parsed_hands: list[list[Block]] = []
+    blocks_count: int = GENERAL_SHAPE_SIZE - len(state.call_blocks)
+    for combination in product(*suits_decompositions):
         if (
-            next_tile.is_number
-            and next_tile.number <= SEQUENCE_MAX_START_POINT
-            and state.remaining_tiles_count[next_tile + 1] >= 1
-            and state.remaining_tiles_count[next_tile + 2] >= 1
+            sum(len(decomposition.blocks) for decomposition in combination)
+            != blocks_count
+            or sum(decomposition.pairs_count for decomposition in combination) > 1
         ):
-            next_state = deepcopy(state)
-            next_state.remaining_tiles_count[next_tile] -= 1
-            next_state.remaining_tiles_count[next_tile + 1] -= 1
-            next_state.remaining_tiles_count[next_tile + 2] -= 1
-            next_state.parsed_blocks.append(
-                Block(type=BlockType.SEQUENCE, tile=next_tile, is_opened=False),
+            continue
+        state.parsed_blocks = [
+            (block_type, start_tile + offset)
+            for (start_tile, _), decomposition in zip(
+                SUIT_TABLES,
+                combination,
+                strict=True,
             )
-            next_state.previous_was_sequence = True
-            next_state.previous_tile = next_tile
-            stack.append(next_state)
+            for block_type, offset in decomposition.blocks
+        ]
+        parsed_hands.append(state.materialize())
+    return parsed_hands
+
+
+def _divide_by_search(state: BlockDivisionState) -> list[list[Block]]:
+    parsed_hands: list[list[Block]] = []
+    _search_block_divisions(
+        state=state,
+        current_tile=Tile.M1,
+        previous_tile=Tile.F0,
+        previous_was_sequence=False,
+        parsed_hands=parsed_hands,
+    )
     return parsed_hands
+
+
+def _search_block_divisions(
+    state: BlockDivisionState,
+    current_tile: int,
+    previous_tile: int,
+    previous_was_sequence: bool,
+    parsed_hands: list[list[Block]],
+) -> None:
+    # Branches are visited as sequence -> pair -> triplet so that divisions come
+    # out in the same order as the previous stack based search.
+    remaining: list[int] = state.remaining_tiles_count
+    next_tile: int = current_tile
+    while next_tile < Tile.F0 and remaining[next_tile] == 0:
+        next_tile += 1
+    # end point
+    if next_tile >= Tile.F0:
+        if state.is_complete:
+            parsed_hands.append(state.materialize())
+        return
+    # Sequence
+    if (
+        next_tile < Tile.Z1
+        and next_tile % 9 < SEQUENCE_MAX_START_POINT
+        and remaining[next_tile + 1] >= 1
+        and remaining[next_tile + 2] >= 1
+    ):
+        remaining[next_tile] -= 1
+        remaining[next_tile + 1] -= 1
+        remaining[next_tile + 2] -= 1
+        state.parsed_blocks.append((BlockType.SEQUENCE, next_tile))
+        _search_block_divisions(
+            state=state,
+            current_tile=next_tile,
+            previous_tile=next_tile,
+            previous_was_sequence=True,
+            parsed_hands=parsed_hands,
+        )
+        state.parsed_blocks.pop()
+        remaining[next_tile] += 1
+        remaining[next_tile + 1] += 1
+        remaining[next_tile + 2] += 1
+    # A pair or triplet right after a sequence from the same tile would only
+    # repeat a division that is found from the other branch order.
+    if previous_tile == next_tile and previous_was_sequence:
+        return
+    # Pair
+    if remaining[next_tile] >= PAIR_SIZE and not state.has_pair:
+        remaining[next_tile] -= PAIR_SIZE
+        state.parsed_blocks.append((BlockType.PAIR, next_tile))
+        state.has_pair = True
+        _search_block_divisions(
+            state=state,
+            current_tile=next_tile,
+            previous_tile=next_tile,
+            previous_was_sequence=False,
+            parsed_hands=parsed_hands,
+        )
+        state.has_pair = False
+        state.parsed_blocks.pop()
+        remaining[next_tile] += PAIR_SIZE
+    # Triplet
+    if remaining[next_tile] >= TRIPLET_SIZE:
+        remaining[next_tile] -= TRIPLET_SIZE
+        state.parsed_blocks.append((BlockType.TRIPLET, next_tile))
+        _search_block_divisions(
+            state=state,
+            current_tile=next_tile,
+            previous_tile=next_tile,
+            previous_was_sequence=False,
+            parsed_hands=parsed_hands,
+        )
+        state.parsed_blocks.pop()
+        remaining[next_tile] += TRIPLET_SIZE
@@ -0,0 +1,155 @@
+"""Precomputed block decompositions of a single suit.
+
+Every suit of a hand is an independent 9-count vector (7-count for honors),
+and each count is at most 4, so the set of vectors that can be split into
+sequences, triplets and at most one pair is small and fixed. The tables below
+map the packed count vector of a suit to all of its decompositions and are
+built once when the module is imported, together with the "waits" tables that
+map a suit one tile short of a decomposition to the tiles completing it.
+
+Decompositions are stored in the order the backtracking divider would find
+them, and the blocks of a decomposition in the order it would take them, so
+combining the suits reproduces its output exactly.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from itertools import combinations_with_replacement
+from typing import Final
+
+from app.services.score_calculator.enums.enums import BlockType
+
+SUIT_SIZE: Final[int] = 9
+HONOR_SIZE: Final[int] = 7
+MAX_TILE_COUNT: Final[int] = 4
+MAX_MELDS_COUNT: Final[int] = 4
+TILE_COUNT_BITS: Final[int] = 3
+TILE_COUNT_MASK: Final[int] = (1 << TILE_COUNT_BITS) - 1
+SEQUENCE_SIZE: Final[int] = 3
+TRIPLET_SIZE: Final[int] = 3
+PAIR_SIZE: Final[int] = 2
+
+# (block type, offset of the first tile inside the suit)
+SuitBlock = tuple[BlockType, int]
+
+
+class SuitDecomposition:
+    """Blocks of one suit, with the number of pairs among them."""
+
+    __slots__ = ("blocks", "pairs_count")
+
+    def __init__(self, blocks: tuple[SuitBlock, ...]):
+        self.blocks: tuple[SuitBlock, ...] = blocks
+        self.pairs_count: int = sum(
+            1 for block_type, _ in blocks if block_type == BlockType.PAIR
+        )
+
+    def __repr__(self) -> str:
+        return f"SuitDecomposition({self.blocks})"
+
+
+def pack_tiles_count(tiles_count: Sequence[int]) -> int:
+    """Pack a vector of tile counts into an int, `TILE_COUNT_BITS` per tile."""
+    packed: int = 0
+    for index, count in enumerate(tiles_count):
+        packed |= count << (index * TILE_COUNT_BITS)
+    return packed
+
+
+# order in which the backtracking divider tries blocks starting at one tile
+_SEARCH_ORDER: Final[dict[BlockType, int]] = {
+    BlockType.SEQUENCE: 0,
+    BlockType.PAIR: 1,
+    BlockType.TRIPLET: 2,
+}
+
+
+def _take_order(block: SuitBlock) -> tuple[int, bool]:
+    # At one tile the divider never takes a pair or triplet after a sequence.
+    return block[1], block[0] == BlockType.SEQUENCE
+
+
+def _search_order(blocks: tuple[SuitBlock, ...]) -> tuple[tuple[int, int], ...]:
+    return tuple((offset, _SEARCH_ORDER[block_type]) for block_type, offset in blocks)
+
+
+def _count_tiles(blocks: list[SuitBlock], size: int) -> list[int]:
+    tiles_count: list[int] = [0] * size
+    for block_type, offset in blocks:
+        if block_type == BlockType.SEQUENCE:
+            for i in range(SEQUENCE_SIZE):
+                tiles_count[offset + i] += 1
+        elif block_type == BlockType.TRIPLET:
+            tiles_count[offset] += TRIPLET_SIZE
+        else:
+            tiles_count[offset] += PAIR_SIZE
+    return tiles_count
+
+
+def _build_table(
+    size: int,
+    has_sequence: bool,
+) -> dict[int, tuple[SuitDecomposition, ...]]:
+    melds: list[SuitBlock] = [(BlockType.TRIPLET, offset) for offset in range(size)]
+    if has_sequence:
+        melds.extend(
+            (BlockType.SEQUENCE, offset) for offset in range(size - SEQUENCE_SIZE + 1)
+        )
+    pairs: list[SuitBlock | None] = [None]
+    pairs.extend((BlockType.PAIR, offset) for offset in range(size))
+
+    found: dict[int, list[tuple[SuitBlock, ...]]] = {}
+    for melds_count in range(MAX_MELDS_COUNT + 1):
+        for meld_combination in combinations_with_replacement(melds, melds_count):
+            for pair in pairs:
+                blocks: list[SuitBlock] = list(meld_combination)
+                if pair is not None:
+                    blocks.append(pair)
+                tiles_count: list[int] = _count_tiles(blocks, size)
+                if max(tiles_count, default=0) > MAX_TILE_COUNT:
+                    continue
+                found.setdefault(pack_tiles_count(tiles_count), []).append(
+                    tuple(sorted(blocks, key=_take_order)),
+                )
+    return {
+        packed: tuple(
+            SuitDecomposition(blocks)
+            for blocks in sorted(decompositions, key=_search_order)
+        )
+        for packed, decompositions in found.items()
+    }
+
+
+NUMBER_SUIT_TABLE: Final[dict[int, tuple[SuitDecomposition, ...]]] = _build_table(
+    size=SUIT_SIZE,
+    has_sequence=True,
+)
+HONOR_TABLE: Final[dict[int, tuple[SuitDecomposition, ...]]] = _build_table(
+    size=HONOR_SIZE,
+    has_sequence=False,
+)
+
+
+def _build_waits_table(
+    table: dict[int, tuple[SuitDecomposition, ...]],
+    size: int,
+) -> dict[int, tuple[int, ...]]:
+    waits: dict[int, set[int]] = {}
+    for packed in table:
+        for offset in range(size):
+            shift: int = offset * TILE_COUNT_BITS
+            if (packed >> shift) & TILE_COUNT_MASK:
+                waits.setdefault(packed - (1 << shift), set()).add(offset)
+    return {packed: tuple(sorted(offsets)) for packed, offsets in waits.items()}
+
+
+# packed suit -> offsets of the tiles that make the suit decomposable
+NUMBER_SUIT_WAITS_TABLE: Final[dict[int, tuple[int, ...]]] = _build_waits_table(
+    table=NUMBER_SUIT_TABLE,
+    size=SUIT_SIZE,
+)
+HONOR_WAITS_TABLE: Final[dict[int, tuple[int, ...]]] = _build_waits_table(
+    table=HONOR_TABLE,
+    size=HONOR_SIZE,
+)
@@ -0,0 +1,161 @@
+from typing import Final
+
+from app.services.score_calculator.block.block import (
+    DRAGON_FLAG,
+    KNITTED_FLAG,
+    OUTSIDE_FLAG,
+    PUNG_FLAG,
+    SEQUENCE_FLAG,
+    WIND_FLAG,
+    Block,
+)
+from app.services.score_calculator.enums.enums import Yaku
+from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.result.result import BlockRelationScoringContext
+from app.services.score_calculator.utility.utility import YAKU_POINT
+from app.services.score_calculator.winning_conditions.winning_conditions import (
+    WinningConditions,
+)
+from app.services.score_calculator.yaku_check.blocks_yaku_checker import (
+    get_blocks_yakus,
+)
+from app.services.score_calculator.yaku_check.hand_features import HandFeatures
+from app.services.score_calculator.yaku_check.hand_yaku_checker import (
+    YAKU_RULES,
+    YakuType,
+    get_rule_yaku,
+)
+from app.services.score_calculator.yaku_check.winning_conditions_yaku_checker import (
+    WinningConditionsYakuChecker,
+)
+
+# hand yakus that only depend on the tiles and the call blocks, which every
+# division of a hand shares
+HAND_LEVEL_YAKU_TYPES: Final[tuple[YakuType, ...]] = (
+    YakuType.NUM_COMPARE,
+    YakuType.NUM_CONDITION,
+    YakuType.NUM_FLUSH,
+    YakuType.KONG_COUNT,
+    YakuType.CONCEALED_KONG,
+    YakuType.ALL_GREEN,
+    YakuType.REVERSIBLE_TILES,
+)
+# hand shape yakus that depend on the division, bounded from its block counts
+DIVISION_SHAPE_YAKUS: Final[frozenset[Yaku]] = frozenset(
+    {Yaku.SevenShiftedPairs, Yaku.AllPungs, Yaku.AllChows},
+)
+CONCEALED_PUNG_YAKUS: Final[dict[int, Yaku]] = {
+    2: Yaku.TwoConcealedPungs,
+    3: Yaku.ThreeConcealedPungs,
+    4: Yaku.FourConcealedPungs,
+}
+SEVEN_PAIRS_SIZE: Final[int] = 7
+GENERAL_SHAPE_SIZE: Final[int] = 5
+ALL_TYPES_COUNT: Final[int] = 5
+
+
+def get_points(yakus: list[Yaku] | tuple[Yaku, ...]) -> int:
+    return sum(YAKU_POINT[yaku] for yaku in yakus)
+
+
+class DivisionScoreBound:
+    """Optimistic total score of the divisions of one winning hand.
+
+    The yakus of the winning conditions and the hand yakus of
+    `HAND_LEVEL_YAKU_TYPES` are the same for all divisions with the same number
+    of blocks, so they are scored once per block count. Every other yaku a
+    division can get is bounded from its block counts, or looked up exactly in
+    the block-combination yaku table. Exclusions only remove yakus, so the
+    bound is never below the score of the division.
+    """
+
+    def __init__(self, hand: Hand, winning_conditions: WinningConditions):
+        self.winning_conditions: WinningConditions = winning_conditions
+        self.tile_hog_points: int = YAKU_POINT[Yaku.TileHog] * (
+            hand.tiles.count(4) - sum(1 for block in hand.call_blocks if block.is_quad)
+        )
+        self._hand_level_points: dict[int, int] = {}
+
+    def get_bound(self, blocks: list[Block]) -> int:
+        if len(blocks) not in self._hand_level_points:
+            self._set_hand_level_points(blocks)
+        return (
+            self._hand_level_points[len(blocks)]
+            + self.tile_hog_points
+            + self._get_division_points(blocks)
+        )
+
+    def _set_hand_level_points(self, blocks: list[Block]) -> None:
+        features: HandFeatures = HandFeatures.create_from_blocks(
+            blocks,
+            self.winning_conditions,
+        )
+        yakus: list[Yaku] = [
+            get_rule_yaku(YAKU_RULES[yaku_type], features)
+            for yaku_type in HAND_LEVEL_YAKU_TYPES
+        ]
+        hand_shape_yakus: list[Yaku] = [
+            yaku
+            for rule, yaku in YAKU_RULES[YakuType.HAND_SHAPE]
+            if yaku not in DIVISION_SHAPE_YAKUS and rule(features)
+        ]
+        if len(blocks) == SEVEN_PAIRS_SIZE and Yaku.FullFlush in yakus:
+            hand_shape_yakus.append(Yaku.SevenShiftedPairs)
+        self._hand_level_points[len(blocks)] = (
+            get_points([yaku for yaku in yakus if yaku != Yaku.ERROR])
+            + max(map(YAKU_POINT.__getitem__, hand_shape_yakus), default=0)
+            + get_points(
+                WinningConditionsYakuChecker(blocks, self.winning_conditions).yakus,
+            )
+            # any wait yaku needs a single waiting tile
+            + (YAKU_POINT[Yaku.EdgeWait] if features.count_tenpai_tiles == 1 else 0)
+        )
+
+    def _get_division_points(self, blocks: list[Block]) -> int:
+        if len(blocks) == SEVEN_PAIRS_SIZE:
+            return (
+                YAKU_POINT[Yaku.AllTypes]
+                if len({block.tile.type for block in blocks}) == ALL_TYPES_COUNT
+                else 0
+            )
+        if len(blocks) != GENERAL_SHAPE_SIZE:
+            return 0
+        pung_blocks: list[Block] = [
+            block for block in blocks if block.flags & PUNG_FLAG
+        ]
+        concealed_pungs_count: int = min(
+            sum(1 for block in pung_blocks if not block.is_opened),
+            max(CONCEALED_PUNG_YAKUS),
+        )
+        chows_count: int = sum(
+            1 for block in blocks if block.flags & (SEQUENCE_FLAG | KNITTED_FLAG)
+        )
+        return (
+            get_points(get_blocks_yakus(blocks))
+            + get_points(
+                BlockRelationScoringContext.create_from_blocks(
+                    [block for block in blocks if not block.is_pair],
+                ).get_yakus(),
+            )
+            + (
+                YAKU_POINT[CONCEALED_PUNG_YAKUS[concealed_pungs_count]]
+                if concealed_pungs_count in CONCEALED_PUNG_YAKUS
+                else 0
+            )
+            + max(
+                YAKU_POINT[Yaku.AllPungs] if len(pung_blocks) == 4 else 0,
+                YAKU_POINT[Yaku.AllChows] if chows_count == 4 else 0,
+            )
+            + (
+                YAKU_POINT[Yaku.DragonPung]
+                if any(block.flags & DRAGON_FLAG for block in pung_blocks)
+                else 0
+            )
+            + (
+                YAKU_POINT[Yaku.PrevalentWind] + YAKU_POINT[Yaku.SeatWind]
+                if any(block.flags & WIND_FLAG for block in pung_blocks)
+                else 0
+            )
+            # pungs of terminals or honors
+            + sum(1 for block in pung_blocks if block.flags & OUTSIDE_FLAG)
+        )
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final
+
+from app.services.game_manager.models.hand import GameHand
+from app.services.score_calculator.block.block import Block
+from app.services.score_calculator.divide.suit_decomposition import (
+    TILE_COUNT_BITS,
+    TILE_COUNT_MASK,
+    pack_tiles_count,
+)
+from app.services.score_calculator.enums.enums import BlockType, Tile
+from app.services.score_calculator.hand.hand import Hand
+
+TILES_COUNT: Final[int] = Tile.F0.value + 1
+
+# (block type value, first tile, is_opened)
+PackedBlock = tuple[int, int, bool]
+
+
+@dataclass(frozen=True, slots=True)
+class PackedHand:
+    """An immutable, hashable `Hand`.
+
+    The count of each of the 35 tiles is packed into one int,
+    `TILE_COUNT_BITS` per tile in tile order, so hashing and comparing a hand
+    costs about as much as for a single int and a changed copy is one addition.
+
+    Attributes:
+        tiles (int): The packed tile counts, each between 0 and `TILE_COUNT_MASK`.
+        call_blocks (tuple[PackedBlock, ...]): The call blocks, in call order.
+    """
+
+    tiles: int
+    call_blocks: tuple[PackedBlock, ...] = ()
+
+    @staticmethod
+    def create_from_hand(hand: Hand) -> PackedHand:
+        if len(hand.tiles) != TILES_COUNT or any(
+            not 0 <= count <= TILE_COUNT_MASK for count in hand.tiles
+        ):
+            raise ValueError("Wrong hand.")
+        return PackedHand(
+            tiles=pack_tiles_count(hand.tiles),
+            call_blocks=tuple(
+                (block.type.value, block.tile.value, block.is_opened)
+                for block in hand.call_blocks
+            ),
+        )
+
+    @staticmethod
+    def create_from_game_hand(hand: GameHand) -> PackedHand:
+        return PackedHand.create_from_hand(Hand.create_from_game_hand(hand))
+
+    def to_hand(self) -> Hand:
+        return Hand(
+            tiles=self.tiles_count,
+            call_blocks=[
+                Block(type=BlockType(block_type), tile=Tile(tile), is_opened=is_opened)
+                for block_type, tile, is_opened in self.call_blocks
+            ],
+        )
+
+    @property
+    def tiles_count(self) -> list[int]:
+        return [self[tile] for tile in range(TILES_COUNT)]
+
+    def __getitem__(self, tile: int) -> int:
+        return (self.tiles >> (tile * TILE_COUNT_BITS)) & TILE_COUNT_MASK
+
+    def get_packed_tiles(self, start_tile: int, size: int) -> int:
+        """Return the counts of `size` tiles from `start_tile`, packed the same way.
+
+        With a suit range this is the key of the per-suit decomposition tables.
+        """
+        return (self.tiles >> (start_tile * TILE_COUNT_BITS)) & (
+            (1 << (size * TILE_COUNT_BITS)) - 1
+        )
+
+    def increment(self, tile: int, count: int = 1) -> PackedHand:
+        return self._with_count(tile, self[tile] + count)
+
+    def decrement(self, tile: int, count: int = 1) -> PackedHand:
+        return self._with_count(tile, self[tile] - count)
+
+    def _with_count(self, tile: int, count: int) -> PackedHand:
+        if not 0 <= tile < TILES_COUNT or not 0 <= count <= TILE_COUNT_MASK:
+            raise ValueError("Wrong tile count.")
+        shift: int = tile * TILE_COUNT_BITS
+        return PackedHand(
+            tiles=self.tiles + ((count - self[tile]) << shift),
+            call_blocks=self.call_blocks,
+        )
@@ -7,7 +7,7 @@ from app.services.score_calculator.block.block import Block
 from app.services.score_calculator.enums.enums import Yaku
 from app.services.score_calculator.utility.utility import YAKU_POINT
 from app.services.score_calculator.yaku_check.blocks_yaku_checker import (
-    BlocksYakuChecker,
+    get_blocks_yakus,
 )
 
 
@@ -40,7 +40,7 @@ class BlockRelationScoringContext:
             if all(self.used_block_flag[i] for i in combination):
                 continue
             current_blocks: list[Block] = [self.blocks[i] for i in combination]
-            yakus: list[Yaku] = BlocksYakuChecker(current_blocks).yakus
+            yakus: tuple[Yaku, ...] = get_blocks_yakus(current_blocks)
             if yakus and not any(
                 yakus[0] in self.used_block_flag[i] for i in combination
             ):
@@ -58,7 +58,7 @@ class BlockRelationScoringContext:
             if all(self.used_block_flag[i] for i in combination):
                 continue
             current_blocks = [self.blocks[i] for i in combination]
-            yakus = BlocksYakuChecker(current_blocks).yakus
+            yakus = get_blocks_yakus(current_blocks)
             if yakus and not any(
                 yakus[0] in self.used_block_flag[i] for i in combination
             ):
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Final
+
+from app.services.score_calculator.enums.enums import Tile, Yaku
+from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.hand.packed_hand import PackedHand
+from app.services.score_calculator.result.result import ScoreResult
+from app.services.score_calculator.score_calculator import (
+    ScoreCalculator,
+    ScoreVariantsCalculator,
+)
+from app.services.score_calculator.winning_conditions.winning_conditions import (
+    WinningConditions,
+)
+
+DEFAULT_SCORE_CACHE_SIZE: Final[int] = 4096
+
+# hand and the winning conditions except `count_tenpai_tiles`, which the
+# calculator computes by itself
+ScoreKey = tuple[
+    PackedHand,
+    tuple[int, bool, bool, bool, bool, bool, int, int],
+]
+
+
+@dataclass(frozen=True)
+class ScoreCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        requests_count: int = self.hits + self.misses
+        return self.hits / requests_count if requests_count else 0.0
+
+
+@dataclass(frozen=True)
+class _CachedScore:
+    total_score: int
+    yaku_score_list: tuple[tuple[Yaku, int], ...]
+    # None when the calculator left the winning conditions untouched
+    count_tenpai_tiles: int | None
+
+    @staticmethod
+    def create(
+        hand: Hand,
+        winning_conditions: WinningConditions,
+        result: ScoreResult,
+    ) -> _CachedScore:
+        return _CachedScore(
+            total_score=result.total_score,
+            yaku_score_list=tuple(result.yaku_score_list),
+            count_tenpai_tiles=(
+                None
+                if hand.tiles[Tile.F0] > 0
+                else winning_conditions.count_tenpai_tiles
+            ),
+        )
+
+    def to_score_result(self) -> ScoreResult:
+        return ScoreResult(
+            total_score=self.total_score,
+            yaku_score_list=list(self.yaku_score_list),
+        )
+
+
+def create_score_key(hand: Hand, winning_conditions: WinningConditions) -> ScoreKey:
+    return (
+        PackedHand.create_from_hand(hand),
+        (
+            int(winning_conditions.winning_tile),
+            winning_conditions.is_discarded,
+            winning_conditions.is_last_tile_in_the_game,
+            winning_conditions.is_last_tile_of_its_kind,
+            winning_conditions.is_replacement_tile,
+            winning_conditions.is_robbing_the_kong,
+            int(winning_conditions.seat_wind),
+            int(winning_conditions.round_wind),
+        ),
+    )
+
+
+class ScoreCache:
+    """Bounded LRU cache of `ScoreCalculator` results.
+
+    Keys are immutable copies of the inputs and every call returns a new
+    `ScoreResult`, so callers may mutate hands and results freely. Like
+    `ScoreCalculator`, a call sets `count_tenpai_tiles` of the winning conditions.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_SCORE_CACHE_SIZE):
+        if max_size <= 0:
+            raise ValueError("Score cache size must be positive.")
+        self.max_size: int = max_size
+        self._entries: OrderedDict[ScoreKey, _CachedScore] = OrderedDict()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+
+    def get_score_result(
+        self,
+        hand: Hand,
+        winning_conditions: WinningConditions,
+        count_tenpai_tiles: int | None = None,
+    ) -> ScoreResult:
+        key: ScoreKey = create_score_key(hand, winning_conditions)
+        cached: _CachedScore | None = self._get_entry(key, winning_conditions)
+        if cached is None:
+            cached = self._calculate(hand, winning_conditions, count_tenpai_tiles)
+            self._add_entry(key, cached)
+        return cached.to_score_result()
+
+    def get_score_results(
+        self,
+        hand: Hand,
+        winning_conditions_list: list[WinningConditions],
+        count_tenpai_tiles: int | None = None,
+    ) -> list[ScoreResult]:
+        """Return `get_score_result` of each of the winning conditions.
+
+        The conditions missing from the cache are scored together with
+        `ScoreVariantsCalculator`, so they must share the winning tile and the
+        winds.
+        """
+        keys: list[ScoreKey] = [
+            create_score_key(hand, winning_conditions)
+            for winning_conditions in winning_conditions_list
+        ]
+        entries: list[_CachedScore | None] = [
+            self._get_entry(key, winning_conditions)
+            for key, winning_conditions in zip(
+                keys,
+                winning_conditions_list,
+                strict=True,
+            )
+        ]
+        missing_indexes: list[int] = [
+            index for index, cached in enumerate(entries) if cached is None
+        ]
+        if missing_indexes:
+            calculated: list[_CachedScore] = self._calculate_variants(
+                hand,
+                [winning_conditions_list[index] for index in missing_indexes],
+                count_tenpai_tiles,
+            )
+            for index, cached in zip(missing_indexes, calculated, strict=True):
+                entries[index] = cached
+                self._add_entry(keys[index], cached)
+        return [cached.to_score_result() for cached in entries if cached is not None]
+
+    def _get_entry(
+        self,
+        key: ScoreKey,
+        winning_conditions: WinningConditions,
+    ) -> _CachedScore | None:
+        cached: _CachedScore | None = self._entries.get(key)
+        if cached is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        if cached.count_tenpai_tiles is not None:
+            winning_conditions.count_tenpai_tiles = cached.count_tenpai_tiles
+        return cached
+
+    def _add_entry(self, key: ScoreKey, cached: _CachedScore) -> None:
+        self._entries[key] = cached
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    @property
+    def stats(self) -> ScoreCacheStats:
+        return ScoreCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._entries),
+            max_size=self.max_size,
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _calculate(
+        hand: Hand,
+        winning_conditions: WinningConditions,
+        count_tenpai_tiles: int | None,
+    ) -> _CachedScore:
+        result: ScoreResult = ScoreCalculator(
+            hand=hand,
+            winning_conditions=winning_conditions,
+            count_tenpai_tiles=count_tenpai_tiles,
+        ).result
+        return _CachedScore.create(hand, winning_conditions, result)
+
+    @staticmethod
+    def _calculate_variants(
+        hand: Hand,
+        winning_conditions_list: list[WinningConditions],
+        count_tenpai_tiles: int | None,
+    ) -> list[_CachedScore]:
+        results: list[ScoreResult] = ScoreVariantsCalculator(
+            hand=hand,
+            winning_conditions_list=winning_conditions_list,
+            count_tenpai_tiles=count_tenpai_tiles,
+        ).results
+        return [
+            _CachedScore.create(hand, winning_conditions, result)
+            for winning_conditions, result in zip(
+                winning_conditions_list,
+                results,
+                strict=True,
+            )
+        ]
+
+
+score_cache: Final[ScoreCache] = ScoreCache()
@@ -15,52 +15,132 @@ from app.services.score_calculator.divide.seven_pairs_shape import (
 from app.services.score_calculator.divide.thirteen_orphans_shape import (
     can_divide_thirteen_orphans_shape,
 )
+from app.services.score_calculator.division_bound import (
+    ALL_TYPES_COUNT,
+    DivisionScoreBound,
+)
 from app.services.score_calculator.enums.enums import BlockType, Tile, Yaku
 from app.services.score_calculator.hand.hand import Hand
 from app.services.score_calculator.result.result import (
     BlockRelationScoringContext,
     ScoreResult,
 )
+from app.services.score_calculator.scoring_profiler import (
+    BLOCK_RELATION_YAKU_STAGE,
+    BLOCKS_YAKU_STAGE,
+    DIVISION_STAGE,
+    EXCLUSIONS_STAGE,
+    FEATURES_STAGE,
+    HAND_YAKU_STAGE,
+    SCORE_STAGE,
+    TENPAI_STAGE,
+    WINNING_CONDITIONS_YAKU_STAGE,
+    timed,
+)
 from app.services.score_calculator.tenpai_calculator import get_tenpai_tiles
 from app.services.score_calculator.utility.utility import (
-    EXCLUDED_YAKUS,
-    YAKU_POINT,
     YAKUS_INCLUDING_PUNG_OF_TOH,
 )
+from app.services.score_calculator.utility.yaku_exclusion import (
+    process_yaku_exclusions,
+)
 from app.services.score_calculator.winning_conditions.winning_conditions import (
     WinningConditions,
 )
 from app.services.score_calculator.yaku_check.blocks_yaku_checker import (
     BlocksYakuChecker,
 )
+from app.services.score_calculator.yaku_check.hand_features import HandFeatures
 from app.services.score_calculator.yaku_check.hand_yaku_checker import HandYakuChecker
 from app.services.score_calculator.yaku_check.winning_conditions_yaku_checker import (
     WinningConditionsYakuChecker,
 )
 
 
+def can_reach_score(
+    hand: Hand,
+    winning_conditions: WinningConditions,
+    target_score: int,
+    waiting_tiles: list[Tile] | None = None,
+) -> bool:
+    """Whether the hand wins with at least `target_score` points.
+
+    `waiting_tiles` are the waits of the hand without the winning tile, when
+    the caller already knows them; a winning tile outside them is rejected
+    before any block division or yaku check.
+    """
+    if (
+        waiting_tiles is not None
+        and winning_conditions.winning_tile not in waiting_tiles
+    ):
+        return False
+    return ScoreCalculator(
+        hand=hand,
+        winning_conditions=winning_conditions,
+        count_tenpai_tiles=None if waiting_tiles is None else len(waiting_tiles),
+        target_score=target_score,
+    ).reaches_target_score
+
+
 class ScoreCalculator:
-    def __init__(self, hand: Hand, winning_conditions: WinningConditions):
+    def __init__(
+        self,
+        hand: Hand,
+        winning_conditions: WinningConditions,
+        count_tenpai_tiles: int | None = None,
+        prune_divisions: bool = False,
+        target_score: int | None = None,
+    ):
         self.hand: Hand = hand
         self.winning_conditions: WinningConditions = winning_conditions
         self._highest_result = ScoreResult(yaku_score_list=[])
         self.is_blocks_divided = False
+        # with `prune_divisions`, divisions whose `DivisionScoreBound` cannot
+        # beat the best score so far are skipped; the result is the same
+        self.prune_divisions: bool = prune_divisions
+        self.pruned_divisions_count: int = 0
+        # with `target_score`, scoring stops at the first division reaching it
+        # and an incomplete hand is rejected from its waits, so `result` is
+        # only meaningful through `reaches_target_score`
+        self.target_score: int | None = target_score
         if self.hand.tiles[Tile.F0] > 0:
             return
-        tenpai_hand = deepcopy(hand)
-        tenpai_hand.tiles[self.winning_conditions.winning_tile] -= 1
-        self.winning_conditions.count_tenpai_tiles = len(
-            get_tenpai_tiles(
-                tenpai_hand=tenpai_hand,
-            ),
-        )
+        # callers that already know the waits of the hand without the winning
+        # tile pass their count to skip computing it again
+        if count_tenpai_tiles is None:
+            tenpai_hand = deepcopy(hand)
+            tenpai_hand.tiles[self.winning_conditions.winning_tile] -= 1
+            tenpai_tiles: list[Tile] = timed(
+                TENPAI_STAGE,
+                get_tenpai_tiles,
+                tenpai_hand,
+            )
+            if (
+                target_score is not None
+                and self.winning_conditions.winning_tile not in tenpai_tiles
+            ):
+                return
+            count_tenpai_tiles = len(tenpai_tiles)
+        self.winning_conditions.count_tenpai_tiles = count_tenpai_tiles
 
-        self._calculate()
+        timed(SCORE_STAGE, self._calculate)
 
     @property
     def result(self) -> ScoreResult:
         return self._highest_result
 
+    @property
+    def reaches_target_score(self) -> bool:
+        if self.target_score is None:
+            raise ValueError("No target score.")
+        return self._highest_result.total_score >= self.target_score
+
+    def _is_target_score_reached(self) -> bool:
+        return (
+            self.target_score is not None
+            and self._highest_result.total_score >= self.target_score
+        )
+
     def _calculate(self) -> None:
         self._calculate_honors_and_knitted_shape_score()
         if not self.is_blocks_divided:
@@ -68,31 +148,80 @@ class ScoreCalculator:
         if not self.is_blocks_divided:
             self._calculate_general_and_seven_pairs_shape_score()
 
-        if self.is_blocks_divided and self._highest_result.total_score == 0:
+        if self.is_blocks_divided:
+            self._add_chicken_hand()
+
+    def _add_chicken_hand(self) -> None:
+        if self._highest_result.total_score == 0:
             self._highest_result.add_yaku(yaku=Yaku.ChickenHand, count=1)
 
-    def _calculate_general_and_seven_pairs_shape_score(self) -> None:
-        parsed_hands: list[list[Block]] = (
+    def _score_division(self, blocks: list[Block], yaku_list: list[Yaku]) -> None:
+        score_result = self._calculate_score_result(blocks=blocks, yaku_list=yaku_list)
+        self._highest_result = max(self._highest_result, score_result)
+
+    def _divide_general_and_seven_pairs_shape(self) -> list[list[Block]]:
+        return (
             divide_general_shape(self.hand)
             + divide_general_shape_knitted_sub(self.hand)
             + divide_seven_pairs_shape(self.hand)
         )
+
+    def _calculate_general_and_seven_pairs_shape_score(self) -> None:
+        parsed_hands: list[list[Block]] = timed(
+            DIVISION_STAGE,
+            self._divide_general_and_seven_pairs_shape,
+        )
         if parsed_hands:
             self.is_blocks_divided = True
+        if self.prune_divisions and len(parsed_hands) > 1:
+            self._calculate_pruned_divisions_score(parsed_hands)
+            return
         for blocks in parsed_hands:
-            score_result = self._calculate_score_result(blocks=blocks, yaku_list=[])
-            self._highest_result = max(self._highest_result, score_result)
+            self._score_division(blocks=blocks, yaku_list=[])
+            if self._is_target_score_reached():
+                break
+
+    def _calculate_pruned_divisions_score(
+        self,
+        parsed_hands: list[list[Block]],
+    ) -> None:
+        """Score the divisions by decreasing bound, skipping those that cannot win.
+
+        On equal scores the earlier division wins, as with `max` in division
+        order, so a division whose bound only ties the best score is still
+        scored when it comes before the best division.
+        """
+        score_bound = DivisionScoreBound(self.hand, self.winning_conditions)
+        bounds: list[int] = [score_bound.get_bound(blocks) for blocks in parsed_hands]
+        best_index: int = -1
+        for index in sorted(range(len(parsed_hands)), key=lambda i: -bounds[i]):
+            best_score: int = self._highest_result.total_score
+            if bounds[index] < best_score or (
+                bounds[index] == best_score and index > best_index
+            ):
+                self.pruned_divisions_count += 1
+                continue
+            score_result = self._calculate_score_result(
+                blocks=parsed_hands[index],
+                yaku_list=[],
+            )
+            if score_result.total_score > best_score or (
+                score_result.total_score == best_score and index < best_index
+            ):
+                self._highest_result = score_result
+                best_index = index
+                if self._is_target_score_reached():
+                    break
 
     def _calculate_thirteen_orphans_shape_score(self) -> None:
-        if can_divide_thirteen_orphans_shape(self.hand):
+        if timed(DIVISION_STAGE, can_divide_thirteen_orphans_shape, self.hand):
             self.is_blocks_divided = True
             yaku_list: list[Yaku] = [Yaku.ThirteenOrphans]
 
-            score_result = self._calculate_score_result(blocks=[], yaku_list=yaku_list)
-            self._highest_result = max(self._highest_result, score_result)
+            self._score_division(blocks=[], yaku_list=yaku_list)
 
     def _calculate_honors_and_knitted_shape_score(self) -> None:
-        if can_divide_honors_and_knitted_shape(self.hand):
+        if timed(DIVISION_STAGE, can_divide_honors_and_knitted_shape, self.hand):
             self.is_blocks_divided = True
             yaku_list: list[Yaku] = []
 
@@ -106,37 +235,112 @@ class ScoreCalculator:
             else:
                 yaku_list.append(Yaku.LesserHonorsAndKnittedTiles)
 
-            score_result = self._calculate_score_result(blocks=[], yaku_list=yaku_list)
-            self._highest_result = max(self._highest_result, score_result)
+            self._score_division(blocks=[], yaku_list=yaku_list)
 
     def _calculate_score_result(
         self,
         blocks: list[Block],
         yaku_list: list[Yaku],
     ) -> ScoreResult:
+        return self._calculate_score_results(
+            blocks=blocks,
+            yaku_list=yaku_list,
+            winning_conditions_list=[self.winning_conditions],
+        )[0]
+
+    def _calculate_score_results(
+        self,
+        blocks: list[Block],
+        yaku_list: list[Yaku],
+        winning_conditions_list: list[WinningConditions],
+    ) -> list[ScoreResult]:
+        """Score one division under each of the winning conditions.
+
+        The block yakus do not depend on the conditions, so they are checked
+        once for all of them.
+        """
         scoring_context: BlockRelationScoringContext = (
             BlockRelationScoringContext.create_from_blocks(
-                blocks=[
-                    deepcopy(block) for block in blocks if block.type != BlockType.PAIR
-                ],
+                blocks=[block for block in blocks if block.type != BlockType.PAIR],
             )
         )
-        if blocks:
-            yaku_list += HandYakuChecker(
-                blocks=deepcopy(blocks),
-                winning_conditions=deepcopy(self.winning_conditions),
-            ).yakus
+        # blocks are immutable and the checkers only read the winning
+        # conditions, so they share one set of features instead of copies
+        features_list: list[HandFeatures | None] = (
+            list(
+                timed(
+                    FEATURES_STAGE,
+                    HandFeatures.create_variants_from_blocks,
+                    blocks,
+                    winning_conditions_list,
+                ),
+            )
+            if blocks
+            else [None] * len(winning_conditions_list)
+        )
+        blocks_yaku_list: list[Yaku] = []
         if len(blocks) == 5:
-            yaku_list += BlocksYakuChecker(blocks=deepcopy(blocks)).yakus
-            yaku_list += scoring_context.get_yakus()
-        if len(blocks) == 7 and len({block.tile.type for block in blocks}) == 5:
-            yaku_list += [Yaku.AllTypes]
-        yaku_list += WinningConditionsYakuChecker(
-            blocks=deepcopy(blocks),
-            winning_conditions=deepcopy(self.winning_conditions),
+            blocks_yaku_list += timed(
+                BLOCKS_YAKU_STAGE,
+                BlocksYakuChecker,
+                blocks=blocks,
+                features=features_list[0],
+            ).yakus
+            blocks_yaku_list += timed(
+                BLOCK_RELATION_YAKU_STAGE,
+                scoring_context.get_yakus,
+            )
+        if (
+            len(blocks) == 7
+            and features_list[0] is not None
+            and features_list[0].tile_types_count == ALL_TYPES_COUNT
+        ):
+            blocks_yaku_list += [Yaku.AllTypes]
+        return [
+            self._calculate_conditions_score_result(
+                yaku_list=[
+                    *yaku_list,
+                    *self._get_hand_yakus(blocks, winning_conditions, features),
+                    *blocks_yaku_list,
+                    *timed(
+                        WINNING_CONDITIONS_YAKU_STAGE,
+                        WinningConditionsYakuChecker,
+                        blocks=blocks,
+                        winning_conditions=winning_conditions,
+                        features=features,
+                    ).yakus,
+                ],
+                scoring_context=scoring_context,
+            )
+            for winning_conditions, features in zip(
+                winning_conditions_list,
+                features_list,
+                strict=True,
+            )
+        ]
+
+    def _get_hand_yakus(
+        self,
+        blocks: list[Block],
+        winning_conditions: WinningConditions,
+        features: HandFeatures | None,
+    ) -> list[Yaku]:
+        if features is None:
+            return []
+        return timed(
+            HAND_YAKU_STAGE,
+            HandYakuChecker,
+            blocks=blocks,
+            winning_conditions=winning_conditions,
+            features=features,
         ).yakus
 
-        yaku_dict = self._process_yaku_exclusions(yaku_list)
+    def _calculate_conditions_score_result(
+        self,
+        yaku_list: list[Yaku],
+        scoring_context: BlockRelationScoringContext,
+    ) -> ScoreResult:
+        yaku_dict = timed(EXCLUSIONS_STAGE, self._process_yaku_exclusions, yaku_list)
 
         score_result: ScoreResult = ScoreResult(yaku_score_list=[])
         for yaku, count in yaku_dict.items():
@@ -168,12 +372,7 @@ class ScoreCalculator:
         return score_result
 
     def _process_yaku_exclusions(self, yaku_list: list[Yaku]) -> Counter[Yaku]:
-        yaku_counter = Counter(yaku_list)
-        sorted_yaku = sorted(yaku_counter, key=lambda y: -YAKU_POINT[y])
-        for yaku in sorted_yaku:
-            for excluded in EXCLUDED_YAKUS.get(yaku, []):
-                yaku_counter.pop(excluded, None)
-        return yaku_counter
+        return process_yaku_exclusions(yaku_list)
 
     def _check_skip_block(self, block: Block, yaku_counter: Counter[Yaku]) -> bool:
         return block.is_dragon or (
@@ -202,3 +401,76 @@ class ScoreCalculator:
             if (block.is_outside and block.is_pung)
             and not self._check_skip_block(block, yaku_counter)
         )
+
+
+class ScoreVariantsCalculator(ScoreCalculator):
+    """Scores one hand under several winning conditions in one pass.
+
+    The hand is divided and its block yakus are checked once, then every
+    division is scored under each of the conditions, so `results[i]` is the
+    `ScoreCalculator` result of `winning_conditions_list[i]`. The conditions
+    must share the winning tile and the winds, and may differ in the other
+    flags, such as tsumo and ron.
+    """
+
+    def __init__(
+        self,
+        hand: Hand,
+        winning_conditions_list: list[WinningConditions],
+        count_tenpai_tiles: int | None = None,
+    ):
+        if not winning_conditions_list or any(
+            (
+                winning_conditions.winning_tile,
+                winning_conditions.seat_wind,
+                winning_conditions.round_wind,
+            )
+            != (
+                winning_conditions_list[0].winning_tile,
+                winning_conditions_list[0].seat_wind,
+                winning_conditions_list[0].round_wind,
+            )
+            for winning_conditions in winning_conditions_list
+        ):
+            raise ValueError("Wrong winning conditions variants.")
+        self.winning_conditions_list: list[WinningConditions] = winning_conditions_list
+        self._highest_results: list[ScoreResult] = [
+            ScoreResult(yaku_score_list=[]) for _ in winning_conditions_list
+        ]
+        super().__init__(
+            hand=hand,
+            winning_conditions=winning_conditions_list[0],
+            count_tenpai_tiles=count_tenpai_tiles,
+        )
+
+    @property
+    def results(self) -> list[ScoreResult]:
+        return self._highest_results
+
+    def _calculate(self) -> None:
+        for winning_conditions in self.winning_conditions_list[1:]:
+            winning_conditions.count_tenpai_tiles = (
+                self.winning_conditions.count_tenpai_tiles
+            )
+        super()._calculate()
+        self._highest_result = self._highest_results[0]
+
+    def _add_chicken_hand(self) -> None:
+        for highest_result in self._highest_results:
+            if highest_result.total_score == 0:
+                highest_result.add_yaku(yaku=Yaku.ChickenHand, count=1)
+
+    def _score_division(self, blocks: list[Block], yaku_list: list[Yaku]) -> None:
+        score_results: list[ScoreResult] = self._calculate_score_results(
+            blocks=blocks,
+            yaku_list=yaku_list,
+            winning_conditions_list=self.winning_conditions_list,
+        )
+        self._highest_results = [
+            max(highest_result, score_result)
+            for highest_result, score_result in zip(
+                self._highest_results,
+                score_results,
+                strict=True,
+            )
+        ]
@@ -0,0 +1,192 @@
+"""Optional timing of the stages and yaku predicates of `ScoreCalculator`.
+
+Profiling is off by default. It is turned on for the whole process with
+`enable_profiling`, or around some calls with the `profile_scoring` context
+manager:
+
+    with profile_scoring() as profiler:
+        ScoreCalculator(hand, winning_conditions)
+    print(profiler.to_dict())
+
+The profiler of `profile_scoring` is a context variable, so it belongs to the
+current thread or asyncio task, and the tasks created from it inherit it.
+Concurrent tasks each profile their own calls, and the calls of every other
+task go to the profiler of the process, if any. When it is off, a stage costs
+one extra function call and a yaku checker one check of the active profiler.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Final, ParamSpec, TypeVar
+
+from app.services.score_calculator.enums.enums import Yaku
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# stages of `ScoreCalculator`
+TENPAI_STAGE: Final[str] = "tenpai"
+SCORE_STAGE: Final[str] = "score"
+DIVISION_STAGE: Final[str] = "division"
+FEATURES_STAGE: Final[str] = "hand_features"
+HAND_YAKU_STAGE: Final[str] = "hand_yaku"
+BLOCKS_YAKU_STAGE: Final[str] = "blocks_yaku"
+BLOCK_RELATION_YAKU_STAGE: Final[str] = "block_relation_yaku"
+WINNING_CONDITIONS_YAKU_STAGE: Final[str] = "winning_conditions_yaku"
+EXCLUSIONS_STAGE: Final[str] = "exclusions"
+
+
+@dataclass
+class TimingStats:
+    """Call count, total time and log2 histogram of the timings of one key.
+
+    Attributes:
+        calls_count (int): Number of timings.
+        total_ns (int): Sum of the timings, in nanoseconds.
+        buckets (dict[int, int]): Count of timings by bit length, so bucket
+            `k` holds the timings below `2**k` ns and at least `2**(k - 1)` ns.
+    """
+
+    calls_count: int = 0
+    total_ns: int = 0
+    buckets: dict[int, int] = field(default_factory=dict)
+
+    def add(self, elapsed_ns: int) -> None:
+        self.calls_count += 1
+        self.total_ns += elapsed_ns
+        bucket: int = elapsed_ns.bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.calls_count if self.calls_count else 0.0
+
+    @property
+    def histogram(self) -> dict[int, int]:
+        """Count of timings by exclusive upper bound in ns, in increasing order."""
+        return {1 << bucket: self.buckets[bucket] for bucket in sorted(self.buckets)}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls_count": self.calls_count,
+            "total_ns": self.total_ns,
+            "mean_ns": self.mean_ns,
+            "histogram": self.histogram,
+        }
+
+
+class ScoringProfiler:
+    """Timings of the scoring stages and of the yaku predicates.
+
+    Stages nest: `SCORE_STAGE` contains the division and yaku stages, and a
+    yaku stage contains the predicate timings of its yakus. Block-combination
+    yakus are memoized, so their predicates are only timed on a miss.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, TimingStats] = {}
+        self.yakus: dict[Yaku, TimingStats] = {}
+
+    def add_stage(self, stage: str, elapsed_ns: int) -> None:
+        if stage not in self.stages:
+            self.stages[stage] = TimingStats()
+        self.stages[stage].add(elapsed_ns)
+
+    def add_yaku(self, yaku: Yaku, elapsed_ns: int) -> None:
+        if yaku not in self.yakus:
+            self.yakus[yaku] = TimingStats()
+        self.yakus[yaku].add(elapsed_ns)
+
+    def check(
+        self,
+        yaku: Yaku,
+        predicate: Callable[P, bool],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> bool:
+        """Evaluate the predicate of `yaku` and record its time."""
+        start: int = time.perf_counter_ns()
+        try:
+            return predicate(*args, **kwargs)
+        finally:
+            self.add_yaku(yaku, time.perf_counter_ns() - start)
+
+    def to_dict(self) -> dict[str, dict[str, dict[str, Any]]]:
+        return {
+            "stages": {stage: stats.to_dict() for stage, stats in self.stages.items()},
+            "yakus": {yaku.name: stats.to_dict() for yaku, stats in self.yakus.items()},
+        }
+
+    def clear(self) -> None:
+        self.stages.clear()
+        self.yakus.clear()
+
+
+class _ProcessProfiling:
+    # the profiler of every thread and task outside `profile_scoring`
+    profiler: ScoringProfiler | None = None
+
+
+_process_profiling: Final[_ProcessProfiling] = _ProcessProfiling()
+_context_profiler: Final[ContextVar[ScoringProfiler | None]] = ContextVar(
+    "context_scoring_profiler",
+    default=None,
+)
+
+
+def get_active_profiler() -> ScoringProfiler | None:
+    profiler: ScoringProfiler | None = _context_profiler.get()
+    return profiler if profiler is not None else _process_profiling.profiler
+
+
+def enable_profiling(profiler: ScoringProfiler | None = None) -> ScoringProfiler:
+    """Profile every score calculated by this process from now on."""
+    _process_profiling.profiler = (
+        profiler if profiler is not None else ScoringProfiler()
+    )
+    return _process_profiling.profiler
+
+
+def disable_profiling() -> None:
+    _process_profiling.profiler = None
+
+
+@contextmanager
+def profile_scoring(
+    profiler: ScoringProfiler | None = None,
+) -> Iterator[ScoringProfiler]:
+    """Profile the scores calculated inside the block.
+
+    It takes precedence over the profiler of the process in the current
+    context, and the previously active profiler is restored on exit.
+    """
+    active_profiler: ScoringProfiler = (
+        profiler if profiler is not None else ScoringProfiler()
+    )
+    token: Token[ScoringProfiler | None] = _context_profiler.set(active_profiler)
+    try:
+        yield active_profiler
+    finally:
+        _context_profiler.reset(token)
+
+
+def timed(
+    stage: str,
+    function: Callable[P, R],
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> R:
+    """Call `function`, recording its time under `stage` when profiling."""
+    profiler: ScoringProfiler | None = get_active_profiler()
+    if profiler is None:
+        return function(*args, **kwargs)
+    start: int = time.perf_counter_ns()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        profiler.add_stage(stage, time.perf_counter_ns() - start)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from app.services.score_calculator.enums.enums import Tile
+from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.result.result import ScoreResult
+from app.services.score_calculator.score_cache import ScoreCache
+from app.services.score_calculator.score_calculator import (
+    ScoreCalculator,
+    ScoreVariantsCalculator,
+)
+from app.services.score_calculator.tenpai_calculator import get_tenpai_tiles
+from app.services.score_calculator.winning_conditions.winning_conditions import (
+    WinningConditions,
+)
+
+
+class ScoringSession:
+    """Scores winning tiles of one tenpai hand, whose waits are computed once.
+
+    Every score is calculated with the count of those waits instead of running
+    `get_tenpai_tiles` again for each winning tile.
+    """
+
+    def __init__(
+        self,
+        tenpai_hand: Hand,
+        tenpai_tiles: list[Tile] | None = None,
+        score_cache: ScoreCache | None = None,
+    ):
+        self.tenpai_hand: Hand = Hand(
+            tiles=tenpai_hand.tiles[:],
+            call_blocks=tenpai_hand.call_blocks[:],
+        )
+        self.tenpai_tiles: list[Tile] = (
+            get_tenpai_tiles(tenpai_hand=self.tenpai_hand)
+            if tenpai_tiles is None
+            else tenpai_tiles
+        )
+        self.score_cache: ScoreCache | None = score_cache
+
+    def create_winning_hand(self, winning_tile: Tile) -> Hand:
+        hand = Hand(
+            tiles=self.tenpai_hand.tiles[:],
+            call_blocks=self.tenpai_hand.call_blocks[:],
+        )
+        hand.tiles[winning_tile] += 1
+        return hand
+
+    def get_score_result(self, winning_conditions: WinningConditions) -> ScoreResult:
+        hand: Hand = self.create_winning_hand(winning_conditions.winning_tile)
+        if self.score_cache is not None:
+            return self.score_cache.get_score_result(
+                hand=hand,
+                winning_conditions=winning_conditions,
+                count_tenpai_tiles=len(self.tenpai_tiles),
+            )
+        return ScoreCalculator(
+            hand=hand,
+            winning_conditions=winning_conditions,
+            count_tenpai_tiles=len(self.tenpai_tiles),
+        ).result
+
+    def get_score_results(
+        self,
+        winning_conditions_list: list[WinningConditions],
+    ) -> list[ScoreResult]:
+        """Score one winning tile under several conditions in one pass.
+
+        The conditions must share the winning tile and the winds.
+        """
+        hand: Hand = self.create_winning_hand(winning_conditions_list[0].winning_tile)
+        if self.score_cache is not None:
+            return self.score_cache.get_score_results(
+                hand=hand,
+                winning_conditions_list=winning_conditions_list,
+                count_tenpai_tiles=len(self.tenpai_tiles),
+            )
+        return ScoreVariantsCalculator(
+            hand=hand,
+            winning_conditions_list=winning_conditions_list,
+            count_tenpai_tiles=len(self.tenpai_tiles),
+        ).results
@@ -0,0 +1,271 @@
+"""Shanten number of a hand: how many tiles it is away from tenpai.
+
+A complete hand is -1 and a tenpai hand is 0. The general shape is computed
+from per-suit tables of reachable (pair, melds, partial melds) counts, filled
+lazily for every packed suit vector that is seen, so that a query only looks
+up and combines four suits. The other shapes are counted in closed form.
+"""
+
+from __future__ import annotations
+
+from typing import Final
+
+from app.services.game_manager.models.hand import GameHand
+from app.services.score_calculator.divide.general_shape import (
+    GENERAL_SHAPE_SIZE,
+    KNITTED_CASES,
+    PAIR_SIZE,
+    TRIPLET_SIZE,
+    BlockDivisionState,
+)
+from app.services.score_calculator.divide.suit_decomposition import (
+    HONOR_SIZE,
+    MAX_TILE_COUNT,
+    SUIT_SIZE,
+    TILE_COUNT_BITS,
+    TILE_COUNT_MASK,
+    pack_tiles_count,
+)
+from app.services.score_calculator.enums.enums import Tile
+from app.services.score_calculator.hand.hand import Hand
+
+TENPAI_HAND_SIZE: Final[int] = 13
+FULLY_HAND_SIZE: Final[int] = 14
+MELDS_COUNT: Final[int] = GENERAL_SHAPE_SIZE - 1
+KNITTED_MELDS_COUNT: Final[int] = 3
+KNITTED_TILES_COUNT: Final[int] = 9
+SEVEN_PAIRS_COUNT: Final[int] = 7
+THIRTEEN_ORPHANS_SIZE: Final[int] = 13
+OUTSIDE_TILES: Final[list[int]] = [
+    tile for tile in Tile.all_tiles() if Tile(tile).is_outside
+]
+HONORS_AND_KNITTED_CASES: Final[list[list[int]]] = [
+    [*case, *Tile.honor_tiles()] for case in KNITTED_CASES
+]
+
+# (pair count, melds count, partial melds count)
+Partials = tuple[int, int, int]
+
+_NUMBER_SUIT_PARTIALS: dict[int, tuple[Partials, ...]] = {0: ((0, 0, 0),)}
+_HONOR_PARTIALS: dict[int, tuple[Partials, ...]] = {0: ((0, 0, 0),)}
+# (first tile, size, has sequence, partials table) of each suit
+SUITS: Final[list[tuple[int, int, bool, dict[int, tuple[Partials, ...]]]]] = [
+    (Tile.M1.value, SUIT_SIZE, True, _NUMBER_SUIT_PARTIALS),
+    (Tile.P1.value, SUIT_SIZE, True, _NUMBER_SUIT_PARTIALS),
+    (Tile.S1.value, SUIT_SIZE, True, _NUMBER_SUIT_PARTIALS),
+    (Tile.Z1.value, HONOR_SIZE, False, _HONOR_PARTIALS),
+]
+
+
+def get_shanten(hand: Hand | GameHand) -> int:
+    """Return the lowest shanten number over every MCR hand shape."""
+    tiles_count, calls_count = _get_concealed_tiles_count(hand)
+    general_shanten: int = _general_shanten(tiles_count, calls_count)
+    shanten_numbers: list[int | None] = [
+        general_shanten,
+        _knitted_straight_shanten(tiles_count, calls_count, general_shanten),
+        _seven_pairs_shanten(tiles_count, calls_count),
+        _thirteen_orphans_shanten(tiles_count, calls_count),
+        _honors_and_knitted_shanten(tiles_count, calls_count),
+    ]
+    return min(shanten for shanten in shanten_numbers if shanten is not None)
+
+
+def get_general_shanten(hand: Hand | GameHand) -> int:
+    return _general_shanten(*_get_concealed_tiles_count(hand))
+
+
+def get_knitted_straight_shanten(hand: Hand | GameHand) -> int | None:
+    """Knitted straight plus one meld and a pair, None with two or more calls."""
+    return _knitted_straight_shanten(*_get_concealed_tiles_count(hand))
+
+
+def get_seven_pairs_shanten(hand: Hand | GameHand) -> int | None:
+    return _seven_pairs_shanten(*_get_concealed_tiles_count(hand))
+
+
+def get_thirteen_orphans_shanten(hand: Hand | GameHand) -> int | None:
+    return _thirteen_orphans_shanten(*_get_concealed_tiles_count(hand))
+
+
+def get_honors_and_knitted_shanten(hand: Hand | GameHand) -> int | None:
+    return _honors_and_knitted_shanten(*_get_concealed_tiles_count(hand))
+
+
+def _get_concealed_tiles_count(hand: Hand | GameHand) -> tuple[list[int], int]:
+    if isinstance(hand, GameHand):
+        hand = Hand.create_from_game_hand(hand)
+    tiles_count: list[int] = BlockDivisionState.create_from_hand(
+        hand,
+    ).remaining_tiles_count[: Tile.F0]
+    if any(not 0 <= count <= MAX_TILE_COUNT for count in tiles_count):
+        raise ValueError("Wrong hand.")
+    calls_count: int = len(hand.call_blocks)
+    if sum(tiles_count) + calls_count * TRIPLET_SIZE not in {
+        TENPAI_HAND_SIZE,
+        FULLY_HAND_SIZE,
+    }:
+        raise ValueError("Wrong hand size.")
+    return tiles_count, calls_count
+
+
+def _general_shanten(tiles_count: list[int], calls_count: int) -> int:
+    melds_count: int = MELDS_COUNT - calls_count
+    return 2 * melds_count - _get_best_partials_value(tiles_count, melds_count)
+
+
+def _knitted_straight_shanten(
+    tiles_count: list[int],
+    calls_count: int,
+    upper_bound: int | None = None,
+) -> int | None:
+    # Cases that cannot get below `upper_bound` are not computed, in which case
+    # `upper_bound` itself is returned.
+    melds_count: int = MELDS_COUNT - KNITTED_MELDS_COUNT - calls_count
+    if melds_count < 0:
+        return None
+    best_shanten: int | None = upper_bound
+    for case in KNITTED_CASES:
+        missing_tiles_count: int = sum(1 for tile in case if not tiles_count[tile])
+        # the remaining tiles are worth at most all of their melds and a pair
+        if best_shanten is not None and missing_tiles_count - 1 >= best_shanten:
+            continue
+        remaining: list[int] = tiles_count[:]
+        for tile in case:
+            if remaining[tile]:
+                remaining[tile] -= 1
+        shanten: int = (
+            missing_tiles_count
+            + 2 * melds_count
+            - _get_best_partials_value(remaining, melds_count)
+        )
+        if best_shanten is None or shanten < best_shanten:
+            best_shanten = shanten
+    return best_shanten
+
+
+def _seven_pairs_shanten(tiles_count: list[int], calls_count: int) -> int | None:
+    if calls_count:
+        return None
+    pairs_count: int = sum(count // PAIR_SIZE for count in tiles_count)
+    return SEVEN_PAIRS_COUNT - 1 - min(pairs_count, SEVEN_PAIRS_COUNT)
+
+
+def _thirteen_orphans_shanten(tiles_count: list[int], calls_count: int) -> int | None:
+    if calls_count:
+        return None
+    kinds_count: int = sum(1 for tile in OUTSIDE_TILES if tiles_count[tile])
+    has_pair: bool = any(tiles_count[tile] >= PAIR_SIZE for tile in OUTSIDE_TILES)
+    return THIRTEEN_ORPHANS_SIZE - kinds_count - has_pair
+
+
+def _honors_and_knitted_shanten(tiles_count: list[int], calls_count: int) -> int | None:
+    if calls_count:
+        return None
+    kinds_count: int = max(
+        sum(1 for tile in case if tiles_count[tile])
+        for case in HONORS_AND_KNITTED_CASES
+    )
+    return TENPAI_HAND_SIZE - min(kinds_count, FULLY_HAND_SIZE)
+
+
+def _get_best_partials_value(tiles_count: list[int], melds_count: int) -> int:
+    # 2 per meld, 1 per partial meld and 1 for the pair, with melds and partial
+    # melds together capped by the melds the hand still needs
+    combined: set[Partials] = {(0, 0, 0)}
+    for start_tile, size, has_sequence, table in SUITS:
+        suit_partials: tuple[Partials, ...] = _get_suit_partials(
+            pack_tiles_count(tiles_count[start_tile : start_tile + size]),
+            size,
+            has_sequence,
+            table,
+        )
+        combined = {
+            (pair + suit_pair, melds + suit_melds, partials + suit_partials_count)
+            for pair, melds, partials in combined
+            for suit_pair, suit_melds, suit_partials_count in suit_partials
+            if pair + suit_pair <= 1
+        }
+    best_value: int = 0
+    for pair, melds, partials in combined:
+        used_melds: int = min(melds, melds_count)
+        best_value = max(
+            best_value,
+            2 * used_melds + min(partials, melds_count - used_melds) + pair,
+        )
+    return best_value
+
+
+def _get_suit_partials(
+    packed: int,
+    size: int,
+    has_sequence: bool,
+    table: dict[int, tuple[Partials, ...]],
+) -> tuple[Partials, ...]:
+    cached: tuple[Partials, ...] | None = table.get(packed)
+    if cached is not None:
+        return cached
+
+    found: set[Partials] = set()
+    for rest, pair, melds, partials in _get_first_tile_choices(
+        packed,
+        size,
+        has_sequence,
+    ):
+        for rest_pair, rest_melds, rest_partials in _get_suit_partials(
+            rest,
+            size,
+            has_sequence,
+            table,
+        ):
+            if pair + rest_pair <= 1:
+                found.add(
+                    (pair + rest_pair, melds + rest_melds, partials + rest_partials),
+                )
+    # only the counts not dominated by another with the same pair count matter
+    result: tuple[Partials, ...] = tuple(
+        candidate
+        for candidate in found
+        if not any(
+            other != candidate
+            and other[0] == candidate[0]
+            and other[1] >= candidate[1]
+            and other[2] >= candidate[2]
+            for other in found
+        )
+    )
+    table[packed] = result
+    return result
+
+
+def _get_first_tile_choices(
+    packed: int,
+    size: int,
+    has_sequence: bool,
+) -> list[tuple[int, int, int, int]]:
+    # (remaining suit, pair, melds, partial melds) of each way to use the lowest
+    # tile of the suit, including leaving it isolated
+    offset: int = 0
+    while not (packed >> (offset * TILE_COUNT_BITS)) & TILE_COUNT_MASK:
+        offset += 1
+    unit: int = 1 << (offset * TILE_COUNT_BITS)
+    count: int = (packed >> (offset * TILE_COUNT_BITS)) & TILE_COUNT_MASK
+    choices: list[tuple[int, int, int, int]] = [(packed - unit, 0, 0, 0)]
+    if count >= TRIPLET_SIZE:
+        choices.append((packed - TRIPLET_SIZE * unit, 0, 1, 0))
+    if count >= PAIR_SIZE:
+        choices.append((packed - PAIR_SIZE * unit, 1, 0, 0))
+        choices.append((packed - PAIR_SIZE * unit, 0, 0, 1))
+    if not has_sequence:
+        return choices
+    next_unit: int = unit << TILE_COUNT_BITS
+    gap_unit: int = next_unit << TILE_COUNT_BITS
+    has_next: bool = offset + 1 < size and bool(packed & (next_unit * TILE_COUNT_MASK))
+    has_gap: bool = offset + 2 < size and bool(packed & (gap_unit * TILE_COUNT_MASK))
+    if has_next and has_gap:
+        choices.append((packed - unit - next_unit - gap_unit, 0, 1, 0))
+    if has_next:
+        choices.append((packed - unit - next_unit, 0, 0, 1))
+    if has_gap:
+        choices.append((packed - unit - gap_unit, 0, 0, 1))
+    return choices
@@ -1,50 +1,54 @@
 import logging
-from copy import deepcopy
 from typing import Final
 
-from app.services.score_calculator.divide.general_shape import (
-    divide_general_shape,
-    divide_general_shape_knitted_sub,
-)
-from app.services.score_calculator.divide.honors_and_knitted_shape import (
-    can_divide_honors_and_knitted_shape,
-)
-from app.services.score_calculator.divide.seven_pairs_shape import (
-    divide_seven_pairs_shape,
-)
-from app.services.score_calculator.divide.thirteen_orphans_shape import (
-    can_divide_thirteen_orphans_shape,
-)
 from app.services.score_calculator.enums.enums import BlockType, Tile
 from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.wait_calculator import (
+    calculate_discard_waiting_tiles,
+    calculate_waiting_tiles,
+    can_win_with_tile,
+)
 
 TENPAI_HAND_SIZE: Final[int] = 13
+FULL_HAND_SIZE: Final[int] = 14
 
 
 logger = logging.getLogger(__name__)
 
 
 def get_tenpai_tiles(tenpai_hand: Hand) -> list[Tile]:
+    _validate_tenpai_hand(tenpai_hand)
+    return calculate_waiting_tiles(tenpai_hand)
+
+
+def get_discard_tenpai_tiles(full_hand: Hand) -> dict[Tile, list[Tile]]:
+    """Return `get_tenpai_tiles` of the hand without each of its concealed tiles."""
+    _validate_tenpai_hand(full_hand, FULL_HAND_SIZE)
+    if full_hand.tiles[Tile.F0]:
+        raise ValueError("Wrong full hand with flowers")
+    return calculate_discard_waiting_tiles(full_hand)
+
+
+def get_tenpai_tiles_by_probing(tenpai_hand: Hand) -> list[Tile]:
+    """Add every tile to the hand and run the shape dividers on it.
+
+    Reference for `get_tenpai_tiles`, which computes the same tiles from tables.
+    """
+    _validate_tenpai_hand(tenpai_hand)
+    return [
+        Tile(tile) for tile in Tile.all_tiles() if can_win_with_tile(tenpai_hand, tile)
+    ]
+
+
+def _validate_tenpai_hand(
+    tenpai_hand: Hand,
+    hand_size: int = TENPAI_HAND_SIZE,
+) -> None:
     if any(not 0 <= tiles_count <= 4 for tiles_count in tenpai_hand.tiles):
         logger.debug(f"{tenpai_hand}")
         raise ValueError("Wrong tenpai hand")
     total_tiles_count: int = sum(tenpai_hand.tiles)
     for block in tenpai_hand.call_blocks:
         total_tiles_count -= 1 if block.type == BlockType.QUAD else 0
-    if total_tiles_count != TENPAI_HAND_SIZE:
+    if total_tiles_count != hand_size:
         raise ValueError("Wrong tenpai hand size.")
-
-    tenpai_tiles: list[Tile] = []
-
-    for tile in Tile.all_tiles():
-        hand = deepcopy(tenpai_hand)
-        hand.tiles[tile] += 1
-        if (
-            divide_general_shape(hand)
-            or divide_general_shape_knitted_sub(hand)
-            or divide_seven_pairs_shape(hand)
-            or can_divide_thirteen_orphans_shape(hand)
-            or can_divide_honors_and_knitted_shape(hand)
-        ):
-            tenpai_tiles.append(Tile(tile))
-    return tenpai_tiles
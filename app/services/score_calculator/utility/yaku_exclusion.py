@@ -0,0 +1,45 @@
+from collections import Counter
+from functools import reduce
+from operator import or_
+from typing import Final
+
+from app.services.score_calculator.enums.enums import Yaku
+from app.services.score_calculator.utility.utility import EXCLUDED_YAKUS
+
+# bit of each yaku in the yaku masks
+YAKU_BITS: Final[dict[Yaku, int]] = {yaku: 1 << i for i, yaku in enumerate(Yaku)}
+# yakus not counted together with each yaku, as a yaku mask
+EXCLUSION_MASKS: Final[dict[Yaku, int]] = {
+    yaku: reduce(
+        or_,
+        (YAKU_BITS[excluded] for excluded in EXCLUDED_YAKUS.get(yaku, [])),
+        0,
+    )
+    for yaku in Yaku
+}
+
+
+def get_yakus_mask(yakus: list[Yaku]) -> int:
+    return reduce(or_, (YAKU_BITS[yaku] for yaku in yakus), 0)
+
+
+def get_excluded_mask(yakus: list[Yaku]) -> int:
+    """Return the mask of the yakus excluded by any of `yakus`.
+
+    A yaku excluded by another one still excludes its own yakus, so the
+    result does not depend on the order the exclusions are applied in.
+    """
+    return reduce(or_, (EXCLUSION_MASKS[yaku] for yaku in yakus), 0)
+
+
+def process_yaku_exclusions(yaku_list: list[Yaku]) -> Counter[Yaku]:
+    """Count the yakus of `yaku_list` that no yaku of the list excludes.
+
+    The counter keeps the order in which the yakus first appear.
+    """
+    yaku_counter: Counter[Yaku] = Counter(yaku_list)
+    excluded_mask: int = get_excluded_mask(list(yaku_counter))
+    if excluded_mask:
+        for yaku in [yaku for yaku in yaku_counter if YAKU_BITS[yaku] & excluded_mask]:
+            del yaku_counter[yaku]
+    return yaku_counter
@@ -0,0 +1,339 @@
+"""Winning tiles of a tenpai hand, computed without probing every tile.
+
+The general shape (also with a knitted straight) is resolved per suit with the
+precomputed waits tables, while seven pairs, thirteen orphans and honors and
+knitted are checked in closed form. The result is the same as adding each tile
+to the hand and running every shape divider on it.
+
+`calculate_discard_waiting_tiles` does the same for every discard of a full
+hand at once: the suits are packed once, a discard only repacks its own, and
+the knitted cases the full hand is too far from are skipped for every discard.
+"""
+
+from typing import Final
+
+from app.services.score_calculator.divide.general_shape import (
+    GENERAL_SHAPE_SIZE,
+    KNITTED_CASES,
+    PAIR_SIZE,
+    BlockDivisionState,
+    divide_general_shape,
+    divide_general_shape_knitted_sub,
+)
+from app.services.score_calculator.divide.honors_and_knitted_shape import (
+    can_divide_honors_and_knitted_shape,
+)
+from app.services.score_calculator.divide.seven_pairs_shape import (
+    divide_seven_pairs_shape,
+)
+from app.services.score_calculator.divide.suit_decomposition import (
+    HONOR_SIZE,
+    HONOR_TABLE,
+    HONOR_WAITS_TABLE,
+    MAX_TILE_COUNT,
+    NUMBER_SUIT_TABLE,
+    NUMBER_SUIT_WAITS_TABLE,
+    SUIT_SIZE,
+    TILE_COUNT_BITS,
+    SuitDecomposition,
+    pack_tiles_count,
+)
+from app.services.score_calculator.divide.thirteen_orphans_shape import (
+    can_divide_thirteen_orphans_shape,
+)
+from app.services.score_calculator.enums.enums import Tile
+from app.services.score_calculator.hand.hand import Hand
+
+MELD_SIZE: Final[int] = 3
+KNITTED_BLOCKS_COUNT: Final[int] = 3
+# (first tile, size, decomposition table, waits table) of each suit
+SUITS: Final[
+    list[
+        tuple[
+            int,
+            int,
+            dict[int, tuple[SuitDecomposition, ...]],
+            dict[int, tuple[int, ...]],
+        ]
+    ]
+] = [
+    (Tile.M1.value, SUIT_SIZE, NUMBER_SUIT_TABLE, NUMBER_SUIT_WAITS_TABLE),
+    (Tile.P1.value, SUIT_SIZE, NUMBER_SUIT_TABLE, NUMBER_SUIT_WAITS_TABLE),
+    (Tile.S1.value, SUIT_SIZE, NUMBER_SUIT_TABLE, NUMBER_SUIT_WAITS_TABLE),
+    (Tile.Z1.value, HONOR_SIZE, HONOR_TABLE, HONOR_WAITS_TABLE),
+]
+OUTSIDE_TILES: Final[list[int]] = [
+    tile for tile in Tile.all_tiles() if Tile(tile).is_outside
+]
+INSIDE_TILES: Final[list[int]] = [
+    tile for tile in Tile.all_tiles() if not Tile(tile).is_outside
+]
+KNITTED_HONORS_CASES: Final[list[tuple[set[int], list[int]]]] = [
+    (
+        set(case),
+        [
+            *sorted(case),
+            *Tile.honor_tiles(),
+        ],
+    )
+    for case in KNITTED_CASES
+]
+
+# (packed tile counts, tiles count) of each of `SUITS`
+PackedSuit = tuple[int, int]
+
+
+def can_win_with_tile(tenpai_hand: Hand, tile: int) -> bool:
+    """Check whether adding `tile` to the hand completes any shape."""
+    hand = Hand(tiles=tenpai_hand.tiles[:], call_blocks=tenpai_hand.call_blocks)
+    hand.tiles[tile] += 1
+    return bool(
+        divide_general_shape(hand)
+        or divide_general_shape_knitted_sub(hand)
+        or divide_seven_pairs_shape(hand)
+        or can_divide_thirteen_orphans_shape(hand)
+        or can_divide_honors_and_knitted_shape(hand),
+    )
+
+
+def calculate_waiting_tiles(tenpai_hand: Hand) -> list[Tile]:
+    """Return the winning tiles of a valid 13-tile hand, in tile order."""
+    remaining: list[int] = BlockDivisionState.create_from_hand(
+        tenpai_hand,
+    ).remaining_tiles_count[: Tile.F0]
+    if any(count < 0 for count in remaining):
+        return _probe_waiting_tiles(tenpai_hand)
+    return _calculate_waiting_tiles(tenpai_hand, remaining, _pack_suits(remaining))
+
+
+def calculate_discard_waiting_tiles(full_hand: Hand) -> dict[Tile, list[Tile]]:
+    """Return the winning tiles left by each discard of a valid 14-tile hand.
+
+    Every concealed tile is a key, in tile order, and its value is
+    `calculate_waiting_tiles` of the hand without it. The hand must not have
+    flowers.
+    """
+    remaining: list[int] = BlockDivisionState.create_from_hand(
+        full_hand,
+    ).remaining_tiles_count[: Tile.F0]
+    is_valid: bool = all(count >= 0 for count in remaining)
+    suits: list[PackedSuit] = _pack_suits(remaining)
+    # A discard removes one tile, so it fixes at most one missing or extra tile.
+    knitted_cases: list[list[Tile]] = [
+        case
+        for case in KNITTED_CASES
+        if sum(1 for tile in case if not remaining[tile]) <= 1
+    ]
+    honors_and_knitted_cases: list[tuple[set[int], list[int]]] = [
+        (case, allowed_tiles)
+        for case, allowed_tiles in KNITTED_HONORS_CASES
+        if _get_honors_and_knitted_extra_tiles_count(
+            full_hand.tiles,
+            case,
+            allowed_tiles,
+        )
+        <= 1
+    ]
+    discard_waiting_tiles: dict[Tile, list[Tile]] = {}
+    for discard_tile in Tile.all_tiles():
+        if remaining[discard_tile] <= 0:
+            continue
+        tenpai_hand = Hand(tiles=full_hand.tiles[:], call_blocks=full_hand.call_blocks)
+        tenpai_hand.tiles[discard_tile] -= 1
+        if not is_valid:
+            discard_waiting_tiles[Tile(discard_tile)] = _probe_waiting_tiles(
+                tenpai_hand,
+            )
+            continue
+        remaining[discard_tile] -= 1
+        suit_index: int = _get_suit_index(discard_tile)
+        start_tile, _, _, _ = SUITS[suit_index]
+        discard_suits: list[PackedSuit] = suits[:]
+        packed, suit_count = suits[suit_index]
+        discard_suits[suit_index] = (
+            packed - (1 << ((discard_tile - start_tile) * TILE_COUNT_BITS)),
+            suit_count - 1,
+        )
+        discard_waiting_tiles[Tile(discard_tile)] = _calculate_waiting_tiles(
+            tenpai_hand,
+            remaining,
+            discard_suits,
+            knitted_cases,
+            honors_and_knitted_cases,
+        )
+        remaining[discard_tile] += 1
+    return discard_waiting_tiles
+
+
+def _probe_waiting_tiles(tenpai_hand: Hand) -> list[Tile]:
+    return [
+        Tile(tile) for tile in Tile.all_tiles() if can_win_with_tile(tenpai_hand, tile)
+    ]
+
+
+def _pack_suits(tiles_count: list[int]) -> list[PackedSuit]:
+    return [
+        (
+            pack_tiles_count(tiles_count[start_tile : start_tile + size]),
+            sum(tiles_count[start_tile : start_tile + size]),
+        )
+        for start_tile, size, _, _ in SUITS
+    ]
+
+
+def _get_suit_index(tile: int) -> int:
+    return min(tile // SUIT_SIZE, len(SUITS) - 1)
+
+
+def _calculate_waiting_tiles(
+    tenpai_hand: Hand,
+    remaining: list[int],
+    suits: list[PackedSuit],
+    knitted_cases: list[list[Tile]] = KNITTED_CASES,
+    honors_and_knitted_cases: list[tuple[set[int], list[int]]] = KNITTED_HONORS_CASES,
+) -> list[Tile]:
+    calls_count: int = len(tenpai_hand.call_blocks)
+    waiting_tiles: set[int] = _get_suits_waits(
+        suits=suits,
+        tiles_count=sum(remaining),
+        blocks_count=GENERAL_SHAPE_SIZE - calls_count,
+    )
+    waiting_tiles |= _knitted_sub_waits(
+        remaining=remaining,
+        blocks_count=GENERAL_SHAPE_SIZE - KNITTED_BLOCKS_COUNT - calls_count,
+        cases=knitted_cases,
+    )
+    if not calls_count:
+        waiting_tiles |= _seven_pairs_waits(tenpai_hand.tiles)
+        waiting_tiles |= _thirteen_orphans_waits(tenpai_hand.tiles)
+        waiting_tiles |= _honors_and_knitted_waits(
+            tenpai_hand.tiles,
+            honors_and_knitted_cases,
+        )
+    # A fifth copy of a tile is out of the tables' range, so it is still probed.
+    waiting_tiles.update(
+        tile
+        for tile in Tile.all_tiles()
+        if tenpai_hand.tiles[tile] == MAX_TILE_COUNT
+        and tile not in waiting_tiles
+        and can_win_with_tile(tenpai_hand, tile)
+    )
+    return [Tile(tile) for tile in sorted(waiting_tiles)]
+
+
+def _general_shape_waits(tiles_count: list[int], blocks_count: int) -> set[int]:
+    return _get_suits_waits(
+        suits=_pack_suits(tiles_count),
+        tiles_count=sum(tiles_count),
+        blocks_count=blocks_count,
+    )
+
+
+def _get_suits_waits(
+    suits: list[PackedSuit],
+    tiles_count: int,
+    blocks_count: int,
+) -> set[int]:
+    # one tile short of `blocks_count` blocks, exactly one of them a pair
+    if tiles_count + 1 != blocks_count * MELD_SIZE - 1:
+        return set()
+    incomplete_suits: list[int] = [
+        index
+        for index, (packed, _) in enumerate(suits)
+        if packed not in SUITS[index][2]
+    ]
+    if len(incomplete_suits) > 1:
+        return set()
+
+    pairs_count: int = sum(
+        1 for _, suit_count in suits if suit_count % MELD_SIZE == PAIR_SIZE
+    )
+    waiting_tiles: set[int] = set()
+    for index in incomplete_suits or range(len(SUITS)):
+        packed, suit_count = suits[index]
+        start_tile, _, _, waits_table = SUITS[index]
+        if (
+            pairs_count
+            - (suit_count % MELD_SIZE == PAIR_SIZE)
+            + ((suit_count + 1) % MELD_SIZE == PAIR_SIZE)
+            != 1
+        ):
+            continue
+        waiting_tiles.update(
+            start_tile + offset for offset in waits_table.get(packed, ())
+        )
+    return waiting_tiles
+
+
+def _is_general_shape(tiles_count: list[int], blocks_count: int) -> bool:
+    if sum(tiles_count) != blocks_count * MELD_SIZE - 1:
+        return False
+    pairs_count: int = 0
+    for start_tile, size, table, _ in SUITS:
+        suit: list[int] = tiles_count[start_tile : start_tile + size]
+        if pack_tiles_count(suit) not in table:
+            return False
+        pairs_count += sum(suit) % MELD_SIZE == PAIR_SIZE
+    return pairs_count == 1
+
+
+def _knitted_sub_waits(
+    remaining: list[int],
+    blocks_count: int,
+    cases: list[list[Tile]] = KNITTED_CASES,
+) -> set[int]:
+    waiting_tiles: set[int] = set()
+    for case in cases:
+        tiles_count: list[int] = remaining[:]
+        for tile in case:
+            tiles_count[tile] -= 1
+        short_tiles: list[int] = [
+            tile for tile in Tile.all_tiles() if tiles_count[tile] < 0
+        ]
+        if not short_tiles:
+            waiting_tiles |= _general_shape_waits(tiles_count, blocks_count)
+        elif len(short_tiles) == 1 and tiles_count[short_tiles[0]] == -1:
+            tiles_count[short_tiles[0]] = 0
+            if _is_general_shape(tiles_count, blocks_count):
+                waiting_tiles.add(short_tiles[0])
+    return waiting_tiles
+
+
+def _seven_pairs_waits(tiles: list[int]) -> set[int]:
+    odd_tiles: list[int] = [
+        tile for tile in Tile.all_tiles() if tiles[tile] % PAIR_SIZE
+    ]
+    return set(odd_tiles) if len(odd_tiles) == 1 else set()
+
+
+def _thirteen_orphans_waits(tiles: list[int]) -> set[int]:
+    if any(tiles[tile] for tile in INSIDE_TILES):
+        return set()
+    missing_tiles: list[int] = [tile for tile in OUTSIDE_TILES if not tiles[tile]]
+    if not missing_tiles:
+        return set(OUTSIDE_TILES)
+    return set(missing_tiles) if len(missing_tiles) == 1 else set()
+
+
+def _honors_and_knitted_waits(
+    tiles: list[int],
+    cases: list[tuple[set[int], list[int]]] = KNITTED_HONORS_CASES,
+) -> set[int]:
+    waiting_tiles: set[int] = set()
+    for case, allowed_tiles in cases:
+        if any(tiles[tile] for tile in Tile.number_tiles() if tile not in case) or any(
+            tiles[tile] > 1 for tile in allowed_tiles
+        ):
+            continue
+        waiting_tiles.update(tile for tile in allowed_tiles if not tiles[tile])
+    return waiting_tiles
+
+
+def _get_honors_and_knitted_extra_tiles_count(
+    tiles: list[int],
+    case: set[int],
+    allowed_tiles: list[int],
+) -> int:
+    return sum(tiles[tile] for tile in Tile.number_tiles() if tile not in case) + sum(
+        tiles[tile] - 1 for tile in allowed_tiles if tiles[tile] > 1
+    )
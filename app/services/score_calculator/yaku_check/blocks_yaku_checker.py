@@ -1,55 +1,62 @@
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from functools import cached_property
-from typing import Final
-
-from app.services.score_calculator.block.block import Block
+from typing import ClassVar, Final
+
+from app.services.score_calculator.block.block import (
+    DRAGON_FLAG,
+    HAS_FIVE_FLAG,
+    HAS_OUTSIDE_FLAG,
+    KNITTED_FLAG,
+    NUMBER_FLAG,
+    PUNG_FLAG,
+    SEQUENCE_FLAG,
+    WIND_FLAG,
+    Block,
+)
 from app.services.score_calculator.enums.enums import BlockType, Tile, Yaku
+from app.services.score_calculator.scoring_profiler import (
+    ScoringProfiler,
+    get_active_profiler,
+)
+from app.services.score_calculator.yaku_check.hand_features import (
+    ALL_BLOCK_FLAGS,
+    HandFeatures,
+)
 from app.services.score_calculator.yaku_check.yaku_checker import YakuChecker
 
+NUMBER_SEQUENCES: Final[int] = NUMBER_FLAG | SEQUENCE_FLAG
+NUMBER_PUNGS: Final[int] = NUMBER_FLAG | PUNG_FLAG
+TILES_COUNT: Final[int] = Tile.F0.value + 1
+BLOCKS_YAKUS_CACHE_SIZE: Final[int] = 1 << 16
+
+# (flags every block must have, predicate, yaku); a rule whose flags are not
+# shared by all blocks is skipped without running its predicate
+BlocksYakuRule = tuple[int, Callable[["BlocksYakuChecker"], bool], Yaku]
+
 
 # yaku checker for combination of blocks
 class BlocksYakuChecker(YakuChecker):
-    def __init__(self, blocks: list[Block]):
+    """Yakus of 2 to 5 blocks.
+
+    For 2 to 4 blocks the rules of `RULES` run in priority order until one
+    holds; for 5 blocks every rule runs. Rules are skipped by their flags
+    before their predicate is evaluated.
+    """
+
+    RULES: ClassVar[dict[int, list[BlocksYakuRule]]]
+
+    def __init__(self, blocks: list[Block], features: HandFeatures | None = None):
         super().__init__()
         self.blocks: list[Block] = blocks
+        # features of the same blocks, when the caller already has them
+        self.features: HandFeatures | None = features
         self._yakus: list[Yaku]
-        self.conditions: dict[int, list[tuple[bool, Yaku]]] = {
-            2: [
-                (self.is_two_dragons_pungs, Yaku.TwoDragonsPungs),
-                (self.is_double_pung, Yaku.DoublePung),
-                (self.is_pure_double_chow, Yaku.PureDoubleChow),
-                (self.is_mixed_double_chow, Yaku.MixedDoubleChow),
-                (self.is_short_straight, Yaku.ShortStraight),
-                (self.is_two_terminal_chows, Yaku.TwoTerminalChows),
-            ],
-            3: [
-                (self.is_big_three_dragons, Yaku.BigThreeDragons),
-                (self.is_pure_triple_chow, Yaku.PureTripleChow),
-                (self.is_pure_shifted_pungs, Yaku.PureShiftedPungs),
-                (self.is_pure_shifted_chows, Yaku.PureShiftedChows),
-                (self.is_pure_straight, Yaku.PureStraight),
-                (self.is_triple_pung, Yaku.TriplePung),
-                (self.is_big_three_winds, Yaku.BigThreeWinds),
-                (self.is_knitted_straight, Yaku.KnittedStraight),
-                (self.is_mixed_triple_chow, Yaku.MixedTripleChow),
-                (self.is_mixed_straight, Yaku.MixedStraight),
-                (self.is_mixed_shifted_pungs, Yaku.MixedShiftedPungs),
-                (self.is_mixed_shifted_chows, Yaku.MixedShiftedChows),
-            ],
-            4: [
-                (self.is_big_four_winds, Yaku.BigFourWinds),
-                (self.is_quadruple_chow, Yaku.QuadrupleChow),
-                (self.is_four_pure_shifted_chows, Yaku.FourPureShiftedChows),
-                (self.is_four_pure_shifted_pungs, Yaku.FourPureShiftedPungs),
-            ],
-            5: [
-                (self.is_all_fives, Yaku.AllFives),
-                (self.is_outside_hand, Yaku.OutsideHand),
-                (self.is_little_four_winds, Yaku.LittleFourWinds),
-                (self.is_little_three_dragons, Yaku.LittleThreeDragons),
-                (self.is_all_types, Yaku.AllTypes),
-            ],
-        }
+        self.common_flags: int = ALL_BLOCK_FLAGS
+        if features is not None:
+            self.common_flags = features.common_flags
+        else:
+            for block in blocks:
+                self.common_flags &= block.flags
         self.set_yakus()
 
     STRAIGHT_GAP: Final[int] = 3
@@ -61,25 +68,35 @@ class BlocksYakuChecker(YakuChecker):
 
     def set_yakus(self) -> None:
         if len(self.blocks) == 5:
-            self._yakus = [
-                yaku for checker, yaku in self.conditions[len(self.blocks)] if checker
-            ]
+            self._yakus = list(self._get_matched_yakus())
         else:
             self._yakus = (
                 [] if (result := self.blocks_checker()) == Yaku.ERROR else [result]
             )
 
     def blocks_checker(self) -> Yaku:
-        if len(self.blocks) not in self.conditions:
+        if len(self.blocks) not in self.RULES:
             raise IndexError("Invalid blocks size.")
-        return next(
-            (yaku for checker, yaku in self.conditions[len(self.blocks)] if checker),
-            Yaku.ERROR,
-        )
+        return next(self._get_matched_yakus(), Yaku.ERROR)
+
+    def _get_matched_yakus(self) -> Iterator[Yaku]:
+        common_flags: int = self.common_flags
+        profiler: ScoringProfiler | None = get_active_profiler()
+        for required_flags, predicate, yaku in self.RULES[len(self.blocks)]:
+            if required_flags & ~common_flags:
+                continue
+            if (
+                predicate(self)
+                if profiler is None
+                else profiler.check(yaku, predicate, self)
+            ):
+                yield yaku
 
     # utils
-    @property
+    @cached_property
     def tile_type_count(self) -> int:
+        if self.features is not None:
+            return self.features.tile_types_count
         return len({block.tile.type for block in self.blocks})
 
     @property
@@ -310,3 +327,91 @@ class BlocksYakuChecker(YakuChecker):
     @property
     def is_all_types(self) -> bool:
         return self.tile_type_count == 5
+
+
+BlocksYakuChecker.RULES = {
+    2: [
+        (
+            DRAGON_FLAG | PUNG_FLAG,
+            lambda c: c.is_two_dragons_pungs,
+            Yaku.TwoDragonsPungs,
+        ),
+        (NUMBER_PUNGS, lambda c: c.is_double_pung, Yaku.DoublePung),
+        (NUMBER_SEQUENCES, lambda c: c.is_pure_double_chow, Yaku.PureDoubleChow),
+        (NUMBER_SEQUENCES, lambda c: c.is_mixed_double_chow, Yaku.MixedDoubleChow),
+        (NUMBER_SEQUENCES, lambda c: c.is_short_straight, Yaku.ShortStraight),
+        (NUMBER_SEQUENCES, lambda c: c.is_two_terminal_chows, Yaku.TwoTerminalChows),
+    ],
+    3: [
+        (
+            DRAGON_FLAG | PUNG_FLAG,
+            lambda c: c.is_big_three_dragons,
+            Yaku.BigThreeDragons,
+        ),
+        (NUMBER_SEQUENCES, lambda c: c.is_pure_triple_chow, Yaku.PureTripleChow),
+        (NUMBER_PUNGS, lambda c: c.is_pure_shifted_pungs, Yaku.PureShiftedPungs),
+        (NUMBER_SEQUENCES, lambda c: c.is_pure_shifted_chows, Yaku.PureShiftedChows),
+        (NUMBER_SEQUENCES, lambda c: c.is_pure_straight, Yaku.PureStraight),
+        (NUMBER_PUNGS, lambda c: c.is_triple_pung, Yaku.TriplePung),
+        (WIND_FLAG | PUNG_FLAG, lambda c: c.is_big_three_winds, Yaku.BigThreeWinds),
+        (
+            NUMBER_FLAG | KNITTED_FLAG,
+            lambda c: c.is_knitted_straight,
+            Yaku.KnittedStraight,
+        ),
+        (NUMBER_SEQUENCES, lambda c: c.is_mixed_triple_chow, Yaku.MixedTripleChow),
+        (NUMBER_SEQUENCES, lambda c: c.is_mixed_straight, Yaku.MixedStraight),
+        (NUMBER_PUNGS, lambda c: c.is_mixed_shifted_pungs, Yaku.MixedShiftedPungs),
+        (NUMBER_SEQUENCES, lambda c: c.is_mixed_shifted_chows, Yaku.MixedShiftedChows),
+    ],
+    4: [
+        (WIND_FLAG | PUNG_FLAG, lambda c: c.is_big_four_winds, Yaku.BigFourWinds),
+        (NUMBER_SEQUENCES, lambda c: c.is_quadruple_chow, Yaku.QuadrupleChow),
+        (
+            NUMBER_SEQUENCES,
+            lambda c: c.is_four_pure_shifted_chows,
+            Yaku.FourPureShiftedChows,
+        ),
+        (
+            NUMBER_PUNGS,
+            lambda c: c.is_four_pure_shifted_pungs,
+            Yaku.FourPureShiftedPungs,
+        ),
+    ],
+    5: [
+        (HAS_FIVE_FLAG, lambda c: c.is_all_fives, Yaku.AllFives),
+        (HAS_OUTSIDE_FLAG, lambda c: c.is_outside_hand, Yaku.OutsideHand),
+        (0, lambda c: c.is_little_four_winds, Yaku.LittleFourWinds),
+        (0, lambda c: c.is_little_three_dragons, Yaku.LittleThreeDragons),
+        (0, lambda c: c.is_all_types, Yaku.AllTypes),
+    ],
+}
+
+
+# (type, first tile) index of every block, so open and closed blocks share it
+_BLOCK_SIGNATURES: Final[dict[Block, int]] = {
+    Block(block_type, Tile(tile), is_opened): block_type.value * TILES_COUNT + tile
+    for block_type in BlockType
+    for tile in range(TILES_COUNT)
+    for is_opened in (False, True)
+}
+_blocks_yakus: dict[tuple[int, ...], tuple[Yaku, ...]] = {}
+
+
+def get_blocks_yakus(blocks: list[Block]) -> tuple[Yaku, ...]:
+    """Return `BlocksYakuChecker(blocks).yakus`, memoized for the whole process.
+
+    The yakus only depend on the multiset of (type, first tile) of the blocks,
+    so blocks in any order and open state share one entry. The table is
+    emptied when it reaches `BLOCKS_YAKUS_CACHE_SIZE` entries.
+    """
+    signature: tuple[int, ...] = tuple(
+        sorted(map(_BLOCK_SIGNATURES.__getitem__, blocks)),
+    )
+    yakus: tuple[Yaku, ...] | None = _blocks_yakus.get(signature)
+    if yakus is None:
+        if len(_blocks_yakus) >= BLOCKS_YAKUS_CACHE_SIZE:
+            _blocks_yakus.clear()
+        yakus = tuple(BlocksYakuChecker(blocks).yakus)
+        _blocks_yakus[signature] = yakus
+    return yakus
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Final
+
+from app.services.score_calculator.block.block import (
+    DRAGON_FLAG,
+    HAS_FIVE_FLAG,
+    KNITTED_FLAG,
+    MANZU_FLAG,
+    PAIR_FLAG,
+    PINZU_FLAG,
+    PUNG_FLAG,
+    QUAD_FLAG,
+    SEQUENCE_FLAG,
+    SOUZU_FLAG,
+    WIND_FLAG,
+    Block,
+)
+from app.services.score_calculator.enums.enums import BlockType, Tile
+from app.services.score_calculator.winning_conditions.winning_conditions import (
+    WinningConditions,
+)
+
+SUIT_FLAGS: Final[int] = MANZU_FLAG | PINZU_FLAG | SOUZU_FLAG
+TILE_TYPE_FLAGS: Final[int] = SUIT_FLAGS | WIND_FLAG | DRAGON_FLAG
+ALL_BLOCK_FLAGS: Final[int] = (HAS_FIVE_FLAG << 1) - 1
+TRIPLET_SIZE: Final[int] = 3
+# tiles of each block type, as offsets from its first tile
+BLOCK_TILE_OFFSETS: Final[dict[BlockType, tuple[tuple[int, int], ...]]] = {
+    BlockType.SEQUENCE: ((0, 1), (1, 1), (2, 1)),
+    BlockType.TRIPLET: ((0, 3),),
+    BlockType.QUAD: ((0, 4),),
+    BlockType.PAIR: ((0, 2),),
+    BlockType.KNITTED: ((0, 1), (3, 1), (6, 1)),
+}
+
+
+def get_tiles_mask(condition: Callable[[Tile], bool]) -> int:
+    """Return the bitmask, one bit per tile, of the tiles satisfying `condition`."""
+    return sum(1 << tile for tile in Tile.all_tiles() if condition(Tile(tile)))
+
+
+@dataclass(frozen=True, slots=True)
+class HandFeatures:
+    """Everything the yaku checkers look at, extracted from a division in one pass.
+
+    `ScoreCalculator` creates it once per division and shares it, read-only,
+    with `HandYakuChecker`, `BlocksYakuChecker` and `WinningConditionsYakuChecker`.
+
+    Attributes:
+        tiles (dict[Tile, int]): Tile counts of the blocks, in block order.
+        tiles_mask (int): Bit `tile` is set for every tile in `tiles`.
+        suits_mask (int): The suit `*_FLAG` bits of the number blocks.
+        common_flags (int): The `Block.flags` bits shared by all blocks.
+        tile_types_count (int): Number of distinct `Tile.type` of the first tiles.
+        has_honor_block (bool): Whether a block starts with an honor tile.
+        first_tile_numbers (tuple[int, ...]): Sorted numbers of the first tiles.
+        concealed_sequence_tiles (tuple[Tile, ...]): First tiles of the concealed
+            sequences.
+        pair_tiles (tuple[Tile, ...]): Tiles of the pairs.
+        knitted_tiles (tuple[Tile, ...]): First tiles of the knitted blocks.
+    """
+
+    blocks_count: int
+    tiles: dict[Tile, int]
+    tiles_mask: int
+    suits_mask: int
+    common_flags: int
+    tile_types_count: int
+    has_honor_block: bool
+    has_opened_block: bool
+    opened_blocks_count: int
+    pairs_count: int
+    pungs_count: int
+    chows_count: int
+    quads_count: int
+    concealed_quads_count: int
+    concealed_pungs_count: int
+    dragon_pungs_count: int
+    prevalent_wind_pungs_count: int
+    seat_wind_pungs_count: int
+    first_tile_numbers: tuple[int, ...]
+    concealed_sequence_tiles: tuple[Tile, ...]
+    pair_tiles: tuple[Tile, ...]
+    knitted_tiles: tuple[Tile, ...]
+    winning_tile: Tile
+    count_tenpai_tiles: int
+
+    @property
+    def suits_count(self) -> int:
+        return self.suits_mask.bit_count()
+
+    @staticmethod
+    def create_from_blocks(
+        blocks: list[Block],
+        winning_conditions: WinningConditions,
+    ) -> HandFeatures:
+        counter = _BlocksCounter(winning_conditions)
+        for block in blocks:
+            counter.add(block)
+        return counter.create_features(blocks, winning_conditions)
+
+    @staticmethod
+    def create_variants_from_blocks(
+        blocks: list[Block],
+        winning_conditions_list: list[WinningConditions],
+    ) -> list[HandFeatures]:
+        """Count the blocks once and create the features of each conditions.
+
+        The conditions must share their winds, which the block counts use.
+        """
+        counter = _BlocksCounter(winning_conditions_list[0])
+        for block in blocks:
+            counter.add(block)
+        return [
+            counter.create_features(blocks, winning_conditions)
+            for winning_conditions in winning_conditions_list
+        ]
+
+
+class _BlocksCounter:
+    def __init__(self, winning_conditions: WinningConditions):
+        self.round_wind: int = int(winning_conditions.round_wind)
+        self.seat_wind: int = int(winning_conditions.seat_wind)
+        self.tiles: dict[Tile, int] = {}
+        self.concealed_tiles: dict[Tile, int] = {}
+        self.suits_mask: int = 0
+        self.common_flags: int = ALL_BLOCK_FLAGS
+        self.tile_types_mask: int = 0
+        self.has_honor_block: bool = False
+        self.opened_blocks_count: int = 0
+        self.counts: dict[int, int] = dict.fromkeys(
+            (PAIR_FLAG, PUNG_FLAG, QUAD_FLAG, SEQUENCE_FLAG | KNITTED_FLAG),
+            0,
+        )
+        self.concealed_quads_count: int = 0
+        self.concealed_pung_tiles: list[Tile] = []
+        self.dragon_pungs_count: int = 0
+        self.prevalent_wind_pungs_count: int = 0
+        self.seat_wind_pungs_count: int = 0
+        self.concealed_sequence_tiles: list[Tile] = []
+        self.pair_tiles: list[Tile] = []
+        self.knitted_tiles: list[Tile] = []
+
+    def add(self, block: Block) -> None:
+        flags: int = block.flags
+        tile: Tile = block.tile
+        for offset, count in BLOCK_TILE_OFFSETS[block.type]:
+            block_tile: Tile = tile + offset if offset else tile
+            self.tiles[block_tile] = self.tiles.get(block_tile, 0) + count
+            if not block.is_opened:
+                self.concealed_tiles[block_tile] = (
+                    self.concealed_tiles.get(block_tile, 0) + count
+                )
+        self.suits_mask |= flags & SUIT_FLAGS
+        self.common_flags &= flags
+        self.tile_types_mask |= flags & TILE_TYPE_FLAGS
+        self.has_honor_block = self.has_honor_block or not tile.is_number
+        self.opened_blocks_count += block.is_opened
+        for flag in self.counts:
+            if flags & flag:
+                self.counts[flag] += 1
+        if flags & PAIR_FLAG:
+            self.pair_tiles.append(tile)
+        elif flags & KNITTED_FLAG:
+            self.knitted_tiles.append(tile)
+        elif flags & SEQUENCE_FLAG and not block.is_opened:
+            self.concealed_sequence_tiles.append(tile)
+        elif flags & PUNG_FLAG:
+            self._add_pung(block)
+
+    def _add_pung(self, block: Block) -> None:
+        if not block.is_opened:
+            self.concealed_pung_tiles.append(block.tile)
+            self.concealed_quads_count += bool(block.flags & QUAD_FLAG)
+        self.dragon_pungs_count += bool(block.flags & DRAGON_FLAG)
+        self.prevalent_wind_pungs_count += int(block.tile) == self.round_wind
+        self.seat_wind_pungs_count += int(block.tile) == self.seat_wind
+
+    def create_features(
+        self,
+        blocks: list[Block],
+        winning_conditions: WinningConditions,
+    ) -> HandFeatures:
+        winning_tile: Tile = winning_conditions.winning_tile
+        return HandFeatures(
+            blocks_count=len(blocks),
+            tiles=self.tiles,
+            tiles_mask=sum(1 << tile for tile in self.tiles),
+            suits_mask=self.suits_mask,
+            common_flags=self.common_flags,
+            tile_types_count=self.tile_types_mask.bit_count(),
+            has_honor_block=self.has_honor_block,
+            has_opened_block=self.opened_blocks_count > 0,
+            opened_blocks_count=self.opened_blocks_count,
+            pairs_count=self.counts[PAIR_FLAG],
+            pungs_count=self.counts[PUNG_FLAG],
+            chows_count=self.counts[SEQUENCE_FLAG | KNITTED_FLAG],
+            quads_count=self.counts[QUAD_FLAG],
+            concealed_quads_count=self.concealed_quads_count,
+            # a pung completed by a discard is not concealed, unless the
+            # winning tile can be counted in another concealed block
+            concealed_pungs_count=sum(
+                1
+                for tile in self.concealed_pung_tiles
+                if not winning_conditions.is_discarded
+                or tile != winning_tile
+                or self.concealed_tiles[tile] - TRIPLET_SIZE > 0
+            ),
+            dragon_pungs_count=self.dragon_pungs_count,
+            prevalent_wind_pungs_count=self.prevalent_wind_pungs_count,
+            seat_wind_pungs_count=self.seat_wind_pungs_count,
+            first_tile_numbers=tuple(sorted(block.tile.number for block in blocks)),
+            concealed_sequence_tiles=tuple(self.concealed_sequence_tiles),
+            pair_tiles=tuple(self.pair_tiles),
+            knitted_tiles=tuple(self.knitted_tiles),
+            winning_tile=winning_tile,
+            count_tenpai_tiles=winning_conditions.count_tenpai_tiles,
+        )
@@ -3,9 +3,14 @@ from enum import Enum
 
 from app.services.score_calculator.block.block import Block
 from app.services.score_calculator.enums.enums import Yaku
+from app.services.score_calculator.scoring_profiler import (
+    ScoringProfiler,
+    get_active_profiler,
+)
 from app.services.score_calculator.winning_conditions.winning_conditions import (
     WinningConditions,
 )
+from app.services.score_calculator.yaku_check.hand_features import HandFeatures
 from app.services.score_calculator.yaku_check.yaku_checker import YakuChecker
 
 
@@ -18,10 +23,17 @@ class YakuType(Enum):
 
 # yaku checker for winning conditions
 class WinningConditionsYakuChecker(YakuChecker):
-    def __init__(self, blocks: list[Block], winning_conditions: WinningConditions):
+    def __init__(
+        self,
+        blocks: list[Block],
+        winning_conditions: WinningConditions,
+        features: HandFeatures | None = None,
+    ):
         super().__init__()
         self.blocks: list[Block] = blocks
         self.winning_conditions: WinningConditions = winning_conditions
+        # features of the same blocks, when the caller already has them
+        self.features: HandFeatures | None = features
         self._yakus: list[Yaku]
         self.conditions: dict[YakuType, list[tuple[Callable[[], bool], Yaku]]] = {
             YakuType.LAST_TILE_OF_GAME: self._get_last_tile_of_game_conditions(),
@@ -49,11 +61,29 @@ class WinningConditionsYakuChecker(YakuChecker):
         return all(condition(block) for block in self.blocks)
 
     def is_concealed_hand(self) -> bool:
+        if self.features is not None:
+            return not self.features.has_opened_block
         return all(not block.is_opened for block in self.blocks)
 
+    def is_melded_hand(self) -> bool:
+        if self.features is not None:
+            return (
+                self.features.blocks_count == 5
+                and self.features.opened_blocks_count + self.features.pairs_count
+                == self.features.blocks_count
+            )
+        return len(self.blocks) == 5 and self.validate_blocks(
+            lambda b: b.is_pair or b.is_opened,
+        )
+
     def _get_yaku_by_type(self, yaku_type: YakuType) -> Yaku:
+        profiler: ScoringProfiler | None = get_active_profiler()
         return next(
-            (yaku for checker, yaku in self.conditions[yaku_type] if checker()),
+            (
+                yaku
+                for checker, yaku in self.conditions[yaku_type]
+                if (checker() if profiler is None else profiler.check(yaku, checker))
+            ),
             Yaku.ERROR,
         )
 
@@ -94,9 +124,7 @@ class WinningConditionsYakuChecker(YakuChecker):
                 Yaku.SelfDrawn,
             ),
             (
-                lambda: self.winning_conditions.is_discarded
-                and len(self.blocks) == 5
-                and self.validate_blocks(lambda b: b.is_pair or b.is_opened),
+                lambda: self.winning_conditions.is_discarded and self.is_melded_hand(),
                 Yaku.MeldedHand,
             ),
         ]
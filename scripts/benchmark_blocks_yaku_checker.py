@@ -0,0 +1,88 @@
+"""Benchmark for `BlocksYakuChecker`.
+
+Runs the checker on every 2-, 3- and 4-block combination and on the 5 blocks of
+each division of the benchmark hands, as `BlockRelationScoringContext` and
+`ScoreCalculator` do, and compares the lazy rule walk with the previous
+evaluation, which computed every condition of the block count up front.
+
+    poetry run python -m scripts.benchmark_blocks_yaku_checker
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Iterator
+from itertools import combinations
+
+from app.services.score_calculator.block.block import Block
+from app.services.score_calculator.divide.general_shape import divide_general_shape
+from app.services.score_calculator.enums.enums import Yaku
+from app.services.score_calculator.yaku_check.blocks_yaku_checker import (
+    BlocksYakuChecker,
+)
+from scripts.benchmark_divide_general_shape import load_benchmark_hands
+
+
+class LegacyBlocksYakuChecker(BlocksYakuChecker):
+    """Previous eager evaluation, kept only as a baseline."""
+
+    def _get_matched_yakus(self) -> Iterator[Yaku]:
+        conditions: list[tuple[bool, Yaku]] = [
+            (predicate(self), yaku)
+            for _, predicate, yaku in self.RULES[len(self.blocks)]
+        ]
+        return (yaku for condition, yaku in conditions if condition)
+
+
+def load_block_combinations() -> list[list[Block]]:
+    block_combinations: list[list[Block]] = []
+    for hand in load_benchmark_hands():
+        for blocks in divide_general_shape(hand):
+            for size in range(2, len(blocks)):
+                block_combinations.extend(
+                    list(combination) for combination in combinations(blocks, size)
+                )
+            block_combinations.append(blocks)
+    return block_combinations
+
+
+def measure(
+    checker: type[BlocksYakuChecker],
+    block_combinations: list[list[Block]],
+    repeat: int,
+) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for blocks in block_combinations:
+            checker(blocks)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    block_combinations = load_block_combinations()
+    for blocks in block_combinations:
+        if LegacyBlocksYakuChecker(blocks).yakus != BlocksYakuChecker(blocks).yakus:
+            raise AssertionError(f"yakus differ for blocks\n{blocks}")
+
+    print(f"{len(block_combinations)} block combinations x {args.repeat} repeats")
+    results: dict[str, float] = {}
+    for name, checker in (
+        ("eager (before)", LegacyBlocksYakuChecker),
+        ("lazy", BlocksYakuChecker),
+    ):
+        elapsed = measure(checker, block_combinations, args.repeat)
+        results[name] = elapsed
+        print(
+            f"{name:>16}: "
+            f"{len(block_combinations) * args.repeat / elapsed:12.0f} checks/s",
+        )
+    print(f"lazy speedup: {results['eager (before)'] / results['lazy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Benchmark for `divide_general_shape`.
+
+Compares the per-suit table divider and the in-place backtracking search with
+the previous implementation, which deep-copied the whole division state for
+every branch.
+
+    poetry run python -m scripts.benchmark_divide_general_shape
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Final
+
+from app.services.score_calculator.block.block import Block
+from app.services.score_calculator.divide.general_shape import (
+    GENERAL_SHAPE_SIZE,
+    PAIR_SIZE,
+    SEQUENCE_MAX_START_POINT,
+    TRIPLET_SIZE,
+    BlockDivisionState,
+    divide_general_shape,
+    search_general_shape,
+)
+from app.services.score_calculator.enums.enums import BlockType, Tile
+from app.services.score_calculator.hand.hand import Hand
+from scripts.benchmark_suite import generate_corpus
+
+# hands per shape of the seeded `scripts.benchmark_suite` corpus
+BENCHMARK_CASES_PER_SHAPE: Final[int] = 10
+
+
+@dataclass
+class _LegacyBlockDivisionState:
+    remaining_tiles_count: list[int]
+    parsed_blocks: list[Block]
+    current_tile: Tile
+    previous_tile: Tile
+    has_pair: bool
+    previous_was_sequence: bool
+
+
+def legacy_divide_general_shape(hand: Hand) -> list[list[Block]]:
+    """Previous deepcopy-per-branch divider, kept only as a baseline."""
+    parsed_hands: list[list[Block]] = []
+    stack: list[_LegacyBlockDivisionState] = [
+        _LegacyBlockDivisionState(
+            remaining_tiles_count=BlockDivisionState.create_from_hand(
+                hand,
+            ).remaining_tiles_count,
+            parsed_blocks=deepcopy(hand.call_blocks),
+            current_tile=Tile.M1,
+            previous_tile=Tile.F0,
+            has_pair=False,
+            previous_was_sequence=False,
+        ),
+    ]
+    while stack:
+        state = stack.pop()
+        next_tile: Tile = state.current_tile
+        while next_tile < Tile.F0 and state.remaining_tiles_count[next_tile] == 0:
+            next_tile = next_tile + 1
+        if next_tile >= Tile.F0:
+            if len(state.parsed_blocks) == GENERAL_SHAPE_SIZE:
+                parsed_hands.append(state.parsed_blocks)
+            continue
+        not_after_sequence: bool = (
+            state.previous_tile != next_tile or not state.previous_was_sequence
+        )
+        if (
+            state.remaining_tiles_count[next_tile] >= TRIPLET_SIZE
+            and not_after_sequence
+        ):
+            next_state = deepcopy(state)
+            next_state.remaining_tiles_count[next_tile] -= TRIPLET_SIZE
+            next_state.parsed_blocks.append(Block(BlockType.TRIPLET, next_tile))
+            next_state.previous_was_sequence = False
+            next_state.previous_tile = next_tile
+            stack.append(next_state)
+        if (
+            state.remaining_tiles_count[next_tile] >= PAIR_SIZE
+            and not state.has_pair
+            and not_after_sequence
+        ):
+            next_state = deepcopy(state)
+            next_state.remaining_tiles_count[next_tile] -= PAIR_SIZE
+            next_state.parsed_blocks.append(Block(BlockType.PAIR, next_tile))
+            next_state.has_pair = True
+            next_state.previous_was_sequence = False
+            next_state.previous_tile = next_tile
+            stack.append(next_state)
+        if (
+            next_tile.is_number
+            and next_tile.number <= SEQUENCE_MAX_START_POINT
+            and state.remaining_tiles_count[next_tile + 1] >= 1
+            and state.remaining_tiles_count[next_tile + 2] >= 1
+        ):
+            next_state = deepcopy(state)
+            for i in range(3):
+                next_state.remaining_tiles_count[next_tile + i] -= 1
+            next_state.parsed_blocks.append(Block(BlockType.SEQUENCE, next_tile))
+            next_state.previous_was_sequence = True
+            next_state.previous_tile = next_tile
+            stack.append(next_state)
+    return parsed_hands
+
+
+def load_benchmark_hands(
+    seed: int = 0,
+    cases_per_shape: int = BENCHMARK_CASES_PER_SHAPE,
+) -> list[Hand]:
+    """Return the winning hands of the seeded benchmark corpus, every shape."""
+    return [
+        case.hand
+        for cases in generate_corpus(seed, cases_per_shape).values()
+        for case in cases
+    ]
+
+
+def measure(
+    divider: Callable[[Hand], list[list[Block]]],
+    hands: list[Hand],
+    repeat: int,
+) -> tuple[float, int]:
+    divisions_count: int = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for hand in hands:
+            divisions_count += len(divider(hand))
+    return time.perf_counter() - start, divisions_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    hands = load_benchmark_hands(args.seed)
+    for hand in hands:
+        expected = legacy_divide_general_shape(hand)
+        if not expected == divide_general_shape(hand) == search_general_shape(hand):
+            raise AssertionError(f"divisions differ for hand\n{hand}")
+
+    print(f"{len(hands)} hands x {args.repeat} repeats")
+    results: dict[str, float] = {}
+    for name, divider in (
+        ("deepcopy (before)", legacy_divide_general_shape),
+        ("backtracking", search_general_shape),
+        ("suit tables", divide_general_shape),
+    ):
+        elapsed, divisions_count = measure(divider, hands, args.repeat)
+        results[name] = elapsed
+        print(
+            f"{name:>22}: {divisions_count / elapsed:12.0f} divisions/s "
+            f"{len(hands) * args.repeat / elapsed:12.0f} hands/s",
+        )
+    for name in ("backtracking", "suit tables"):
+        print(f"{name} speedup: {results['deepcopy (before)'] / results[name]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark for the division pruning mode of `ScoreCalculator`.
+
+Scores every benchmark hand once for each of its tiles as the winning tile,
+with and without `prune_divisions`, checks that the results are the same and
+reports how many divisions the bound pruned.
+
+    poetry run python -m scripts.benchmark_division_pruning
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from app.services.score_calculator.divide.general_shape import divide_general_shape
+from app.services.score_calculator.enums.enums import Tile, Wind
+from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.score_calculator import ScoreCalculator
+from app.services.score_calculator.winning_conditions.winning_conditions import (
+    WinningConditions,
+)
+from scripts.benchmark_divide_general_shape import load_benchmark_hands
+
+
+def create_winning_conditions(winning_tile: Tile) -> WinningConditions:
+    return WinningConditions(
+        winning_tile=winning_tile,
+        is_discarded=True,
+        is_last_tile_in_the_game=False,
+        is_last_tile_of_its_kind=False,
+        is_replacement_tile=False,
+        is_robbing_the_kong=False,
+        count_tenpai_tiles=1,
+        seat_wind=Wind.EAST,
+        round_wind=Wind.EAST,
+    )
+
+
+def load_winning_hands() -> list[tuple[Hand, Tile]]:
+    return [
+        (hand, Tile(tile))
+        for hand in load_benchmark_hands()
+        for tile in Tile.all_tiles()
+        if hand.tiles[tile]
+    ]
+
+
+def measure(
+    winning_hands: list[tuple[Hand, Tile]],
+    repeat: int,
+    prune_divisions: bool,
+) -> tuple[float, int]:
+    pruned_divisions_count: int = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for hand, winning_tile in winning_hands:
+            pruned_divisions_count += ScoreCalculator(
+                hand=hand,
+                winning_conditions=create_winning_conditions(winning_tile),
+                prune_divisions=prune_divisions,
+            ).pruned_divisions_count
+    return time.perf_counter() - start, pruned_divisions_count // repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    winning_hands = load_winning_hands()
+    for hand, winning_tile in winning_hands:
+        expected = ScoreCalculator(hand, create_winning_conditions(winning_tile))
+        pruned = ScoreCalculator(
+            hand,
+            create_winning_conditions(winning_tile),
+            prune_divisions=True,
+        )
+        if (expected.result.total_score, expected.result.yaku_score_list) != (
+            pruned.result.total_score,
+            pruned.result.yaku_score_list,
+        ):
+            raise AssertionError(f"scores differ for hand\n{hand}\n{winning_tile}")
+
+    multi_division_hands = [
+        (hand, winning_tile)
+        for hand, winning_tile in winning_hands
+        if len(divide_general_shape(hand)) > 1
+    ]
+    for title, hands in (
+        ("all", winning_hands),
+        ("with several divisions", multi_division_hands),
+    ):
+        print(f"{title}: {len(hands)} winning hands x {args.repeat} repeats")
+        results: dict[bool, float] = {}
+        for prune_divisions in (False, True):
+            elapsed, pruned_divisions_count = measure(
+                hands,
+                args.repeat,
+                prune_divisions,
+            )
+            results[prune_divisions] = elapsed
+            name = "pruned" if prune_divisions else "all divisions"
+            print(
+                f"{name:>14}: {len(hands) * args.repeat / elapsed:10.0f} hands/s "
+                f"{pruned_divisions_count:6d} divisions pruned per pass",
+            )
+        print(f"pruning speedup: {results[False] / results[True]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,433 @@
+"""Benchmark suite for scoring, waits and the tenpai assistant.
+
+Generates a seeded corpus of winning hands stratified by shape, then measures
+the per-call latency (p50, p99) and the throughput of `ScoreCalculator`,
+`get_tenpai_tiles` and `TenpaiAssistant.get_tenpai_assistance_info_in_full_hand`
+for each shape. The results can be written as JSON and compared with the JSON
+of another commit.
+
+    poetry run python -m scripts.benchmark_suite --output before.json
+    poetry run python -m scripts.benchmark_suite --baseline before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import time
+from collections import Counter
+from collections.abc import Callable
+from copy import deepcopy
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+
+from app.services.game_manager.helpers.tenpai_assistant import TenpaiAssistant
+from app.services.game_manager.models.call_block import CallBlock
+from app.services.game_manager.models.enums import AbsoluteSeat, GameTile, RelativeSeat
+from app.services.game_manager.models.hand import GameHand
+from app.services.game_manager.models.types import CallBlockType
+from app.services.game_manager.models.winning_conditions import GameWinningConditions
+from app.services.score_calculator.divide.general_shape import divide_general_shape
+from app.services.score_calculator.enums.enums import Tile
+from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.score_cache import score_cache
+from app.services.score_calculator.score_calculator import ScoreCalculator
+from app.services.score_calculator.tenpai_calculator import get_tenpai_tiles
+from app.services.score_calculator.winning_conditions.winning_conditions import (
+    WinningConditions,
+)
+
+SHAPES: Final[tuple[str, ...]] = (
+    "general",
+    "seven_pairs",
+    "knitted",
+    "thirteen_orphans",
+    "melded_heavy",
+    "multi_division",
+)
+TARGETS: Final[tuple[str, ...]] = ("score_calculator", "tenpai_tiles", "tenpai_assist")
+SUITS_COUNT: Final[int] = 3
+SUIT_SIZE: Final[int] = 9
+HONOR_TILES: Final[tuple[int, ...]] = tuple(Tile.honor_tiles())
+ORPHAN_TILES: Final[tuple[int, ...]] = (0, 8, 9, 17, 18, 26, *HONOR_TILES)
+NINE_GATES_NUMBERS: Final[tuple[int, ...]] = (1, 1, 1, 2, 3, 4, 5, 6, 7, 8, 9, 9, 9)
+KONG_TYPES: Final[tuple[CallBlockType, ...]] = (
+    CallBlockType.AN_KONG,
+    CallBlockType.SHOMIN_KONG,
+    CallBlockType.DAIMIN_KONG,
+)
+KONG_SIZE: Final[int] = 4
+FULL_HAND_SIZE: Final[int] = 14
+MAX_TILE_COUNT: Final[int] = 4
+
+# (call block type, first tile)
+CallSpec = tuple[CallBlockType, int]
+# concealed tiles, with the winning tile, and the call blocks
+HandSpec = tuple[list[int], list[CallSpec]]
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One winning hand of the corpus, with the inputs of every target.
+
+    Attributes:
+        shape (str): The stratum of `SHAPES` the hand was generated for.
+        hand (Hand): The winning hand, with the winning tile.
+        winning_conditions (WinningConditions): Conditions of the win.
+        game_hand (GameHand): The hand right after drawing the winning tile,
+            with its analysis enabled as during a round.
+        game_winning_conditions (GameWinningConditions): Conditions of the round.
+        visible_tiles_count (Counter[GameTile]): Tiles shown by the call blocks.
+        seat_wind (AbsoluteSeat): Seat of the player.
+        round_wind (AbsoluteSeat): Wind of the round.
+    """
+
+    shape: str
+    hand: Hand
+    winning_conditions: WinningConditions
+    game_hand: GameHand
+    game_winning_conditions: GameWinningConditions
+    visible_tiles_count: Counter[GameTile]
+    seat_wind: AbsoluteSeat
+    round_wind: AbsoluteSeat
+
+    @property
+    def tenpai_hand(self) -> Hand:
+        tiles: list[int] = list(self.hand.tiles)
+        tiles[self.winning_conditions.winning_tile] -= 1
+        return Hand(tiles=tiles, call_blocks=list(self.hand.call_blocks))
+
+    def create_tenpai_assistant(self) -> TenpaiAssistant:
+        return TenpaiAssistant(
+            game_hand=self.game_hand,
+            game_winning_conditions=self.game_winning_conditions,
+            visible_tiles_count=self.visible_tiles_count,
+            seat_wind=self.seat_wind,
+            round_wind=self.round_wind,
+        )
+
+
+@dataclass(frozen=True)
+class LatencyStats:
+    calls_count: int
+    p50_us: float
+    p99_us: float
+    mean_us: float
+    calls_per_second: float
+
+    @staticmethod
+    def create_from_latencies(latencies_ns: list[int]) -> LatencyStats:
+        latencies_ns = sorted(latencies_ns)
+        total_ns: int = sum(latencies_ns)
+        return LatencyStats(
+            calls_count=len(latencies_ns),
+            p50_us=get_percentile(latencies_ns, 50) / 1000,
+            p99_us=get_percentile(latencies_ns, 99) / 1000,
+            mean_us=total_ns / len(latencies_ns) / 1000,
+            calls_per_second=len(latencies_ns) / total_ns * 1e9 if total_ns else 0.0,
+        )
+
+
+def get_percentile(sorted_values: list[int], percent: int) -> int:
+    """Nearest-rank percentile of non-empty sorted values."""
+    rank: int = -(-len(sorted_values) * percent // 100)
+    return sorted_values[max(rank, 1) - 1]
+
+
+def _get_suit_tile(suit: int, number: int) -> int:
+    return suit * SUIT_SIZE + number - 1
+
+
+def _get_random_block(rng: random.Random, suits: tuple[int, ...]) -> CallSpec:
+    if rng.random() < 0.6:
+        return CallBlockType.CHII, _get_suit_tile(rng.choice(suits), rng.randint(1, 7))
+    if len(suits) == SUITS_COUNT:
+        return CallBlockType.PUNG, rng.randrange(Tile.F0)
+    return CallBlockType.PUNG, _get_suit_tile(rng.choice(suits), rng.randint(1, 9))
+
+
+def get_block_tiles(block: CallSpec) -> list[int]:
+    block_type, tile = block
+    if block_type == CallBlockType.CHII:
+        return [tile, tile + 1, tile + 2]
+    return [tile] * (KONG_SIZE if block_type in KONG_TYPES else 3)
+
+
+def _generate_general(
+    rng: random.Random,
+    suits: tuple[int, ...] = (0, 1, 2),
+    called_blocks_count: int = 0,
+) -> HandSpec:
+    blocks: list[CallSpec] = [_get_random_block(rng, suits) for _ in range(4)]
+    concealed: list[int] = [
+        tile
+        for block in blocks[called_blocks_count:]
+        for tile in get_block_tiles(block)
+    ]
+    pair_tile: int = (
+        rng.randrange(Tile.F0)
+        if len(suits) == SUITS_COUNT
+        else _get_suit_tile(rng.choice(suits), rng.randint(1, 9))
+    )
+    calls: list[CallSpec] = [
+        (rng.choice(KONG_TYPES), tile)
+        if block_type == CallBlockType.PUNG and rng.random() < 0.3
+        else (block_type, tile)
+        for block_type, tile in blocks[:called_blocks_count]
+    ]
+    return [*concealed, pair_tile, pair_tile], calls
+
+
+def _generate_seven_pairs(rng: random.Random) -> HandSpec:
+    return [tile for tile in rng.sample(range(Tile.F0), 7) for _ in range(2)], []
+
+
+def _generate_knitted(rng: random.Random) -> HandSpec:
+    suits: list[int] = rng.sample(range(SUITS_COUNT), SUITS_COUNT)
+    knitted: list[int] = [
+        _get_suit_tile(suit, number)
+        for start, suit in enumerate(suits, start=1)
+        for number in range(start, SUIT_SIZE + 1, 3)
+    ]
+    if rng.random() < 0.5:
+        # lesser honors and knitted tiles
+        return rng.sample([*knitted, *HONOR_TILES], FULL_HAND_SIZE), []
+    # knitted straight with the last block and the pair of a general hand
+    concealed, _ = _generate_general(rng)
+    return [*knitted, *concealed[len(knitted) :]], []
+
+
+def _generate_thirteen_orphans(rng: random.Random) -> HandSpec:
+    return [*ORPHAN_TILES, rng.choice(ORPHAN_TILES)], []
+
+
+def _generate_melded_heavy(rng: random.Random) -> HandSpec:
+    return _generate_general(rng, called_blocks_count=rng.randint(2, 4))
+
+
+def _generate_multi_division(rng: random.Random) -> HandSpec:
+    suit: int = rng.randrange(SUITS_COUNT)
+    if rng.random() < 0.5:
+        nine_gates: list[int] = [
+            _get_suit_tile(suit, number) for number in NINE_GATES_NUMBERS
+        ]
+        return [*nine_gates, _get_suit_tile(suit, rng.randint(1, 9))], []
+    return _generate_general(rng, suits=(suit,))
+
+
+GENERATORS: Final[dict[str, Callable[[random.Random], HandSpec]]] = {
+    "general": _generate_general,
+    "seven_pairs": _generate_seven_pairs,
+    "knitted": _generate_knitted,
+    "thirteen_orphans": _generate_thirteen_orphans,
+    "melded_heavy": _generate_melded_heavy,
+    "multi_division": _generate_multi_division,
+}
+
+
+def is_valid_spec(shape: str, spec: HandSpec) -> bool:
+    concealed, calls = spec
+    tiles_count: Counter[int] = Counter(concealed)
+    for call in calls:
+        tiles_count.update(get_block_tiles(call))
+    if max(tiles_count.values()) > MAX_TILE_COUNT:
+        return False
+    if shape == "multi_division":
+        hand = Hand(
+            tiles=[tiles_count[tile] for tile in range(Tile.F0.value + 1)],
+            call_blocks=[],
+        )
+        return len(divide_general_shape(hand)) > 1
+    return True
+
+
+def create_game_hand(tiles: Counter[int], calls: list[CallSpec]) -> GameHand:
+    return GameHand(
+        tiles=Counter(
+            {GameTile(tile): count for tile, count in tiles.items() if count},
+        ),
+        call_blocks=[
+            CallBlock(type=block_type, first_tile=GameTile(tile), source_seat=seat)
+            for (block_type, tile), seat in zip(
+                calls,
+                (RelativeSeat.KAMI, RelativeSeat.TOI, RelativeSeat.SHIMO) * 2,
+                strict=False,
+            )
+        ],
+    )
+
+
+def create_case(
+    shape: str,
+    spec: HandSpec,
+    rng: random.Random,
+) -> BenchmarkCase:
+    concealed, calls = spec
+    winning_tile: int = rng.choice(concealed)
+    tenpai_tiles: Counter[int] = Counter(concealed)
+    tenpai_tiles[winning_tile] -= 1
+    game_hand: GameHand = create_game_hand(tenpai_tiles, calls)
+    game_hand.enable_analysis()
+    game_hand.apply_tsumo(GameTile(winning_tile))
+    game_winning_conditions = GameWinningConditions.create_default_conditions()
+    game_winning_conditions.winning_tile = GameTile(winning_tile)
+    game_winning_conditions.is_discarded = rng.random() < 0.5
+    seat_wind, round_wind = (
+        rng.choice(list(AbsoluteSeat)),
+        rng.choice(list(AbsoluteSeat)),
+    )
+    visible_tiles_count: Counter[GameTile] = Counter(
+        GameTile(tile) for call in calls for tile in get_block_tiles(call)
+    )
+    return BenchmarkCase(
+        shape=shape,
+        hand=Hand.create_from_game_hand(game_hand),
+        winning_conditions=WinningConditions.create_from_game_winning_conditions(
+            game_winning_conditions=game_winning_conditions,
+            seat_wind=seat_wind,
+            round_wind=round_wind,
+        ),
+        game_hand=game_hand,
+        game_winning_conditions=game_winning_conditions,
+        visible_tiles_count=visible_tiles_count,
+        seat_wind=seat_wind,
+        round_wind=round_wind,
+    )
+
+
+def generate_corpus(
+    seed: int,
+    cases_per_shape: int,
+    shapes: tuple[str, ...] = SHAPES,
+) -> dict[str, list[BenchmarkCase]]:
+    """Generate `cases_per_shape` winning hands of every shape.
+
+    The same seed always gives the same corpus, so JSON results of different
+    commits measure the same hands.
+    """
+    rng = random.Random(seed)
+    corpus: dict[str, list[BenchmarkCase]] = {}
+    for shape in shapes:
+        cases: list[BenchmarkCase] = []
+        while len(cases) < cases_per_shape:
+            spec: HandSpec = GENERATORS[shape](rng)
+            if is_valid_spec(shape, spec):
+                cases.append(create_case(shape, spec, rng))
+        corpus[shape] = cases
+    return corpus
+
+
+def _run_score_calculator(case: BenchmarkCase) -> Callable[[], object]:
+    winning_conditions: WinningConditions = deepcopy(case.winning_conditions)
+    return lambda: ScoreCalculator(case.hand, winning_conditions).result
+
+
+def _run_tenpai_tiles(case: BenchmarkCase) -> Callable[[], object]:
+    tenpai_hand: Hand = case.tenpai_hand
+    return lambda: get_tenpai_tiles(tenpai_hand)
+
+
+def _run_tenpai_assist(case: BenchmarkCase) -> Callable[[], object]:
+    tenpai_assistant: TenpaiAssistant = case.create_tenpai_assistant()
+    # every call starts with a cold score cache, as on the first turn of a round
+    score_cache.clear()
+    return tenpai_assistant.get_tenpai_assistance_info_in_full_hand
+
+
+RUNNERS: Final[dict[str, Callable[[BenchmarkCase], Callable[[], object]]]] = {
+    "score_calculator": _run_score_calculator,
+    "tenpai_tiles": _run_tenpai_tiles,
+    "tenpai_assist": _run_tenpai_assist,
+}
+
+
+def measure(target: str, cases: list[BenchmarkCase], repeat: int) -> LatencyStats:
+    latencies_ns: list[int] = []
+    for _ in range(repeat):
+        for case in cases:
+            call: Callable[[], object] = RUNNERS[target](case)
+            start: int = time.perf_counter_ns()
+            call()
+            latencies_ns.append(time.perf_counter_ns() - start)
+    return LatencyStats.create_from_latencies(latencies_ns)
+
+
+def run_suite(
+    seed: int = 0,
+    cases_per_shape: int = 50,
+    repeat: int = 3,
+    targets: tuple[str, ...] = TARGETS,
+    shapes: tuple[str, ...] = SHAPES,
+) -> dict[str, Any]:
+    """Measure every target on every shape and return the JSON-ready report."""
+    corpus = generate_corpus(seed, cases_per_shape, shapes)
+    return {
+        "metadata": {
+            "seed": seed,
+            "cases_per_shape": cases_per_shape,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": {
+            target: {
+                shape: measure(target, cases, repeat).__dict__
+                for shape, cases in corpus.items()
+            }
+            for target in targets
+        },
+    }
+
+
+def print_report(report: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    metadata: dict[str, Any] = report["metadata"]
+    print(
+        f"seed {metadata['seed']}: {metadata['cases_per_shape']} hands per shape "
+        f"x {metadata['repeat']} repeats",
+    )
+    for target, shapes in report["results"].items():
+        print(target)
+        for shape, stats in shapes.items():
+            line: str = (
+                f"{shape:>17}: p50 {stats['p50_us']:9.1f}us "
+                f"p99 {stats['p99_us']:9.1f}us "
+                f"{stats['calls_per_second']:9.0f} calls/s"
+            )
+            base: dict[str, float] | None = (
+                baseline["results"].get(target, {}).get(shape) if baseline else None
+            )
+            if base:
+                line += f"  p50 speedup {base['p50_us'] / stats['p50_us']:.2f}x"
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", type=int, default=50, help="hands per shape")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--target", choices=TARGETS, action="append")
+    parser.add_argument("--shape", choices=SHAPES, action="append")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="JSON results to compare with")
+    args = parser.parse_args()
+
+    report = run_suite(
+        seed=args.seed,
+        cases_per_shape=args.cases,
+        repeat=args.repeat,
+        targets=tuple(args.target or TARGETS),
+        shapes=tuple(args.shape or SHAPES),
+    )
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    print_report(report, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
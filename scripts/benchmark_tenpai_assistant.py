@@ -0,0 +1,82 @@
+"""Benchmark for the full-hand mode of `TenpaiAssistant`.
+
+Runs `get_tenpai_assistance_info_in_full_hand` on the seeded corpus of
+`scripts.benchmark_suite` and compares it with the per-discard implementation
+it replaced, which deep-copied the game hand for each discard and computed the
+waits of every discard from scratch. The results of both are checked to be the
+same before timing. Every call starts with a cold score cache.
+
+    poetry run python -m scripts.benchmark_tenpai_assistant
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+
+from app.services.game_manager.helpers.tenpai_assistant import TenpaiAssistant
+from app.services.score_calculator.score_cache import score_cache
+from scripts.benchmark_suite import SHAPES, BenchmarkCase, generate_corpus
+from tests.test_utils import (
+    AssistanceInfo,
+    get_assistance_info_per_discard,
+    to_comparable,
+)
+
+
+def get_assistance_info_in_one_pass(
+    tenpai_assistant: TenpaiAssistant,
+) -> AssistanceInfo:
+    return tenpai_assistant.get_tenpai_assistance_info_in_full_hand()
+
+
+def measure(
+    cases: list[BenchmarkCase],
+    repeat: int,
+    get_assistance_info: Callable[[TenpaiAssistant], AssistanceInfo],
+) -> float:
+    elapsed: float = 0.0
+    for _ in range(repeat):
+        for case in cases:
+            tenpai_assistant: TenpaiAssistant = case.create_tenpai_assistant()
+            score_cache.clear()
+            start = time.perf_counter()
+            get_assistance_info(tenpai_assistant)
+            elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", type=int, default=30, help="hands per shape")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.seed, args.cases, SHAPES)
+    for shape, cases in corpus.items():
+        for case in cases:
+            score_cache.clear()
+            expected = get_assistance_info_per_discard(case.create_tenpai_assistant())
+            score_cache.clear()
+            actual = get_assistance_info_in_one_pass(case.create_tenpai_assistant())
+            if to_comparable(expected) != to_comparable(actual):
+                raise AssertionError(
+                    f"assistance info differs for {shape} hand\n{case.hand}",
+                )
+
+    print(f"{args.cases} hands per shape x {args.repeat} repeats")
+    for shape, cases in corpus.items():
+        per_discard = measure(cases, args.repeat, get_assistance_info_per_discard)
+        one_pass = measure(cases, args.repeat, get_assistance_info_in_one_pass)
+        calls_count: int = len(cases) * args.repeat
+        print(
+            f"{shape:>17}: per discard {calls_count / per_discard:8.1f} hands/s "
+            f"one pass {calls_count / one_pass:8.1f} hands/s "
+            f"speedup {per_discard / one_pass:.2f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Micro-benchmarks of the yaku checkers.
+
+Runs each checker on every division of the benchmark hands, the way
+`ScoreCalculator` used to call it, with deep copies of the blocks and the
+winning conditions and features of its own, and the way it calls it now, with
+one `HandFeatures` shared by all checkers.
+
+    poetry run python -m scripts.benchmark_yaku_checkers
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from copy import deepcopy
+from typing import Any
+
+from app.services.score_calculator.block.block import Block
+from app.services.score_calculator.divide.general_shape import divide_general_shape
+from app.services.score_calculator.enums.enums import Tile, Wind, Yaku
+from app.services.score_calculator.winning_conditions.winning_conditions import (
+    WinningConditions,
+)
+from app.services.score_calculator.yaku_check.blocks_yaku_checker import (
+    BlocksYakuChecker,
+)
+from app.services.score_calculator.yaku_check.hand_features import HandFeatures
+from app.services.score_calculator.yaku_check.hand_yaku_checker import HandYakuChecker
+from app.services.score_calculator.yaku_check.winning_conditions_yaku_checker import (
+    WinningConditionsYakuChecker,
+)
+from scripts.benchmark_divide_general_shape import load_benchmark_hands
+
+# (blocks, winning conditions, features of the blocks)
+Division = tuple[list[Block], WinningConditions, HandFeatures]
+# checker of a division, returning its yakus
+Checker = Callable[[Division], list[Yaku]]
+
+
+def load_divisions() -> list[Division]:
+    divisions: list[Division] = []
+    for hand in load_benchmark_hands():
+        winning_conditions = WinningConditions(
+            winning_tile=Tile(
+                next(tile for tile in Tile.all_tiles() if hand.tiles[tile]),
+            ),
+            is_discarded=True,
+            is_last_tile_in_the_game=False,
+            is_last_tile_of_its_kind=False,
+            is_replacement_tile=False,
+            is_robbing_the_kong=False,
+            count_tenpai_tiles=1,
+            seat_wind=Wind.EAST,
+            round_wind=Wind.EAST,
+        )
+        divisions.extend(
+            (
+                blocks,
+                winning_conditions,
+                HandFeatures.create_from_blocks(blocks, winning_conditions),
+            )
+            for blocks in divide_general_shape(hand)
+        )
+    return divisions
+
+
+CHECKERS: dict[str, tuple[Checker, Checker]] = {
+    "HandYakuChecker": (
+        lambda division: HandYakuChecker(
+            blocks=deepcopy(division[0]),
+            winning_conditions=deepcopy(division[1]),
+        ).yakus,
+        lambda division: HandYakuChecker(
+            blocks=division[0],
+            winning_conditions=division[1],
+            features=division[2],
+        ).yakus,
+    ),
+    "BlocksYakuChecker": (
+        lambda division: BlocksYakuChecker(blocks=deepcopy(division[0])).yakus,
+        lambda division: BlocksYakuChecker(
+            blocks=division[0],
+            features=division[2],
+        ).yakus,
+    ),
+    "WinningConditionsYakuChecker": (
+        lambda division: WinningConditionsYakuChecker(
+            blocks=deepcopy(division[0]),
+            winning_conditions=deepcopy(division[1]),
+        ).yakus,
+        lambda division: WinningConditionsYakuChecker(
+            blocks=division[0],
+            winning_conditions=division[1],
+            features=division[2],
+        ).yakus,
+    ),
+}
+
+
+def measure(
+    function: Callable[[Division], Any],
+    divisions: list[Division],
+    repeat: int,
+) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for division in divisions:
+            function(division)
+    return (time.perf_counter() - start) / (repeat * len(divisions))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    divisions = load_divisions()
+    for name, (copied, shared) in CHECKERS.items():
+        for division in divisions:
+            if copied(division) != shared(division):
+                raise AssertionError(f"{name} yakus differ for blocks\n{division[0]}")
+
+    print(f"{len(divisions)} divisions x {args.repeat} repeats, microseconds per call")
+    features_time = measure(
+        lambda division: HandFeatures.create_from_blocks(division[0], division[1]),
+        divisions,
+        args.repeat,
+    )
+    print(f"{'HandFeatures':>30}: {features_time * 1e6:8.2f} (once per division)")
+    for name, (copied, shared) in CHECKERS.items():
+        copied_time = measure(copied, divisions, args.repeat)
+        shared_time = measure(shared, divisions, args.repeat)
+        print(
+            f"{name:>30}: {copied_time * 1e6:8.2f} copies (before) "
+            f"{shared_time * 1e6:8.2f} shared features "
+            f"{copied_time / shared_time:5.1f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
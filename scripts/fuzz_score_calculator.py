@@ -0,0 +1,425 @@
+"""Differential fuzzer between `ScoreCalculator` and another scoring engine.
+
+Every case is a random legal hand, with call blocks, flowers and winning
+conditions, generated from the seed and the case index alone, so a case can
+be regenerated anywhere. Both engines score it; a different `total_score` or
+`yaku_score_list` (compared as a multiset) is minimised to the simplest case
+that still differs and reported as a JSON reproducer.
+
+The engine is one of `ENGINES` or the `module:function` path of any callable
+taking a `Hand` and `WinningConditions` and returning a `ScoreResult`.
+
+    poetry run python -m scripts.fuzz_score_calculator --engine pruned --cases 100000
+    poetry run python -m scripts.fuzz_score_calculator --rate 500 --workers 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import random
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from copy import deepcopy
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any, Final
+
+from app.services.score_calculator.enums.enums import BlockType, Tile, Wind
+from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.result.result import ScoreResult
+from app.services.score_calculator.score_cache import ScoreCache
+from app.services.score_calculator.score_calculator import ScoreCalculator
+from app.services.score_calculator.winning_conditions.winning_conditions import (
+    WinningConditions,
+)
+from scripts.benchmark_suite import (
+    FULL_HAND_SIZE,
+    GENERATORS,
+    MAX_TILE_COUNT,
+    create_game_hand,
+    is_valid_spec,
+)
+
+ScoringEngine = Callable[[Hand, WinningConditions], ScoreResult]
+# (total score, sorted (yaku name, score) pairs), or the error of the engine
+Outcome = tuple[int, tuple[tuple[str, int], ...]] | str
+
+# hands of random tiles, which are mostly not winning
+RANDOM_SHAPE: Final[str] = "random"
+CASE_SHAPES: Final[tuple[str, ...]] = (*GENERATORS, RANDOM_SHAPE)
+FLOWER_RATE: Final[float] = 0.05
+WALL_TILES: Final[tuple[int, ...]] = tuple(
+    tile for tile in Tile.all_tiles() for _ in range(MAX_TILE_COUNT)
+)
+# cases sent to a worker at once
+CHUNK_SIZE: Final[int] = 100
+SUIT_NAMES: Final[str] = "mpsz"
+SUIT_SIZE: Final[int] = 9
+CONDITION_FLAGS: Final[tuple[str, ...]] = (
+    "is_discarded",
+    "is_last_tile_in_the_game",
+    "is_last_tile_of_its_kind",
+    "is_replacement_tile",
+    "is_robbing_the_kong",
+)
+
+
+def calculate_reference(
+    hand: Hand,
+    winning_conditions: WinningConditions,
+) -> ScoreResult:
+    return ScoreCalculator(hand=hand, winning_conditions=winning_conditions).result
+
+
+def calculate_pruned(hand: Hand, winning_conditions: WinningConditions) -> ScoreResult:
+    return ScoreCalculator(
+        hand=hand,
+        winning_conditions=winning_conditions,
+        prune_divisions=True,
+    ).result
+
+
+_score_cache: Final[ScoreCache] = ScoreCache()
+
+
+def calculate_cached(hand: Hand, winning_conditions: WinningConditions) -> ScoreResult:
+    return _score_cache.get_score_result(
+        hand=hand,
+        winning_conditions=winning_conditions,
+    )
+
+
+def calculate_batch(hand: Hand, winning_conditions: WinningConditions) -> ScoreResult:
+    # NumPy is optional, so the batch calculator is only imported when used
+    from app.services.score_calculator.batch_score_calculator import (
+        calculate_batch_scores,
+    )
+
+    batch_result = calculate_batch_scores(
+        tiles=[hand.tiles],
+        call_blocks=[hand.call_blocks],
+        winning_conditions=[winning_conditions],
+    )
+    return ScoreResult(
+        total_score=int(batch_result.total_scores[0]),
+        yaku_score_list=batch_result.yaku_score_lists[0],
+    )
+
+
+ENGINES: Final[dict[str, ScoringEngine]] = {
+    "pruned": calculate_pruned,
+    "score_cache": calculate_cached,
+    "batch": calculate_batch,
+}
+
+
+def load_engine(name: str) -> ScoringEngine:
+    if name in ENGINES:
+        return ENGINES[name]
+    module_name, separator, attribute = name.partition(":")
+    if not separator:
+        raise ValueError(f"Unknown engine {name!r}, use one of {list(ENGINES)}.")
+    engine: ScoringEngine = getattr(importlib.import_module(module_name), attribute)
+    return engine
+
+
+@dataclass(frozen=True)
+class FuzzCase:
+    seed: int
+    index: int
+    hand: Hand
+    winning_conditions: WinningConditions
+
+
+@dataclass
+class FuzzReport:
+    engine: str
+    seed: int
+    cases_count: int = 0
+    elapsed: float = 0.0
+    mismatches: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def cases_per_second(self) -> float:
+        return self.cases_count / self.elapsed if self.elapsed else 0.0
+
+
+def _generate_spec(rng: random.Random, shape: str) -> tuple[list[int], list[Any]]:
+    if shape == RANDOM_SHAPE:
+        return rng.sample(WALL_TILES, FULL_HAND_SIZE), []
+    while True:
+        spec = GENERATORS[shape](rng)
+        if is_valid_spec(shape, spec):
+            return spec
+
+
+def _generate_winning_conditions(
+    rng: random.Random,
+    winning_tile: int,
+) -> WinningConditions:
+    is_discarded: bool = rng.random() < 0.5
+    return WinningConditions(
+        winning_tile=Tile(winning_tile),
+        is_discarded=is_discarded,
+        is_last_tile_in_the_game=rng.random() < 0.1,
+        is_last_tile_of_its_kind=rng.random() < 0.1,
+        # replacement tiles are drawn and robbed kongs are discarded
+        is_replacement_tile=not is_discarded and rng.random() < 0.1,
+        is_robbing_the_kong=is_discarded and rng.random() < 0.05,
+        count_tenpai_tiles=1,
+        seat_wind=rng.choice(list(Wind)),
+        round_wind=rng.choice(list(Wind)),
+    )
+
+
+def generate_case(seed: int, index: int) -> FuzzCase:
+    rng = random.Random(f"{seed}:{index}")
+    concealed, calls = _generate_spec(rng, rng.choice(CASE_SHAPES))
+    winning_tile: int = rng.choice(concealed)
+    tiles: Counter[int] = Counter(concealed)
+    if rng.random() < FLOWER_RATE:
+        # an undeclared flower in place of a tile other than the winning one
+        concealed.remove(winning_tile)
+        tiles[rng.choice(concealed)] -= 1
+        tiles[Tile.F0] += 1
+    return FuzzCase(
+        seed=seed,
+        index=index,
+        hand=Hand.create_from_game_hand(create_game_hand(tiles, calls)),
+        winning_conditions=_generate_winning_conditions(rng, winning_tile),
+    )
+
+
+def get_outcome(engine: ScoringEngine, case: FuzzCase) -> Outcome:
+    try:
+        result: ScoreResult = engine(
+            deepcopy(case.hand),
+            deepcopy(case.winning_conditions),
+        )
+    except Exception as error:
+        return f"{type(error).__name__}: {error}"
+    return result.total_score, tuple(
+        sorted((yaku.name, score) for yaku, score in result.yaku_score_list),
+    )
+
+
+def is_mismatch(engine: ScoringEngine, case: FuzzCase) -> bool:
+    return get_outcome(calculate_reference, case) != get_outcome(engine, case)
+
+
+def get_concealed_tiles(hand: Hand) -> list[int]:
+    tiles: list[int] = list(hand.tiles)
+    for block in hand.call_blocks:
+        for tile in block.tiles:
+            tiles[tile] -= 1
+        if block.is_pung:
+            tiles[block.tile] -= 3 if block.is_quad else 2
+    return tiles
+
+
+def _with_condition(case: FuzzCase, name: str, value: Any) -> FuzzCase:
+    changes: dict[str, Any] = {name: value}
+    return replace(
+        case,
+        winning_conditions=replace(case.winning_conditions, **changes),
+    )
+
+
+def _get_simpler_cases(case: FuzzCase) -> Iterator[FuzzCase]:
+    winning_conditions: WinningConditions = case.winning_conditions
+    for flag in CONDITION_FLAGS:
+        if getattr(winning_conditions, flag):
+            yield _with_condition(case, flag, False)
+    for wind in ("seat_wind", "round_wind"):
+        if getattr(winning_conditions, wind) != Wind.EAST:
+            yield _with_condition(case, wind, Wind.EAST)
+    for index, block in enumerate(case.hand.call_blocks):
+        # called chows and pungs keep their tiles in the hand when concealed
+        if block.is_opened and not block.is_quad:
+            call_blocks = (
+                case.hand.call_blocks[:index] + case.hand.call_blocks[index + 1 :]
+            )
+            yield replace(
+                case,
+                hand=Hand(tiles=list(case.hand.tiles), call_blocks=call_blocks),
+            )
+    concealed_tiles: list[int] = get_concealed_tiles(case.hand)
+    for tile in range(winning_conditions.winning_tile):
+        if concealed_tiles[tile] > 0:
+            yield _with_condition(case, "winning_tile", Tile(tile))
+
+
+def minimise_case(engine: ScoringEngine, case: FuzzCase) -> FuzzCase:
+    """Simplify the case one step at a time while the engines still differ.
+
+    Every step turns off a condition flag, moves a wind to east, conceals an
+    opened chow or pung, or picks a lower winning tile, so it terminates.
+    """
+    changed: bool = True
+    while changed:
+        changed = False
+        for candidate in _get_simpler_cases(case):
+            if is_mismatch(engine, candidate):
+                case, changed = candidate, True
+                break
+    return case
+
+
+def hand_to_raw_string(hand: Hand) -> str:
+    """Format the hand for `tests.test_utils.raw_string_to_hand_class`."""
+    concealed_tiles: list[int] = get_concealed_tiles(hand)
+    groups: list[str] = []
+    for suit, suit_name in enumerate(SUIT_NAMES):
+        numbers: str = "".join(
+            str(number + 1) * concealed_tiles[suit * SUIT_SIZE + number]
+            for number in range(SUIT_SIZE)
+            if suit * SUIT_SIZE + number < Tile.F0
+        )
+        if numbers:
+            groups.append(numbers + suit_name)
+    for block in hand.call_blocks:
+        suit_name = SUIT_NAMES[block.tile // SUIT_SIZE]
+        numbers = (
+            "".join(str(tile % SUIT_SIZE + 1) for tile in block.tiles)
+            if block.type == BlockType.SEQUENCE
+            else str(block.tile % SUIT_SIZE + 1) * (4 if block.is_quad else 3)
+        )
+        opening, closing = ("[", "]") if block.is_opened else ("{", "}")
+        groups.append(f"{opening}{numbers}{suit_name}{closing}")
+    return "".join(groups)
+
+
+def _winning_conditions_to_dict(
+    winning_conditions: WinningConditions,
+) -> dict[str, Any]:
+    # `count_tenpai_tiles` is computed by the calculator
+    conditions: dict[str, Any] = {}
+    for condition in fields(winning_conditions):
+        value: Any = getattr(winning_conditions, condition.name)
+        if condition.name != "count_tenpai_tiles":
+            conditions[condition.name] = (
+                value.name if isinstance(value, Tile | Wind) else value
+            )
+    return conditions
+
+
+def create_reproducer(engine_name: str, case: FuzzCase) -> dict[str, Any]:
+    return {
+        "seed": case.seed,
+        "index": case.index,
+        "engine": engine_name,
+        "hand": hand_to_raw_string(case.hand),
+        "flowers": case.hand.tiles[Tile.F0],
+        "winning_conditions": _winning_conditions_to_dict(case.winning_conditions),
+        "expected": get_outcome(calculate_reference, case),
+        "actual": get_outcome(load_engine(engine_name), case),
+    }
+
+
+def run_cases(
+    engine_name: str,
+    seed: int,
+    start: int,
+    stop: int,
+) -> list[dict[str, Any]]:
+    """Fuzz the cases `start` to `stop` and return the minimised mismatches."""
+    engine: ScoringEngine = load_engine(engine_name)
+    mismatches: list[dict[str, Any]] = []
+    for index in range(start, stop):
+        case: FuzzCase = generate_case(seed, index)
+        if is_mismatch(engine, case):
+            mismatches.append(
+                create_reproducer(engine_name, minimise_case(engine, case)),
+            )
+    return mismatches
+
+
+def _wait_for_rate(start: float, submitted_count: int, rate: float) -> None:
+    if rate > 0:
+        time.sleep(max(0.0, start + submitted_count / rate - time.perf_counter()))
+
+
+def fuzz(
+    engine_name: str,
+    seed: int = 0,
+    cases_count: int = 10000,
+    workers: int = 0,
+    rate: float = 0.0,
+) -> FuzzReport:
+    """Run the cases `0` to `cases_count` over `workers` processes.
+
+    With `workers=0` the cases run in this process. A positive `rate` caps the
+    number of cases started per second.
+    """
+    report = FuzzReport(engine=engine_name, seed=seed, cases_count=cases_count)
+    chunks: list[tuple[int, int]] = [
+        (chunk_start, min(chunk_start + CHUNK_SIZE, cases_count))
+        for chunk_start in range(0, cases_count, CHUNK_SIZE)
+    ]
+    start: float = time.perf_counter()
+    if workers == 0:
+        for chunk_start, chunk_stop in chunks:
+            _wait_for_rate(start, chunk_start, rate)
+            report.mismatches += run_cases(engine_name, seed, chunk_start, chunk_stop)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: set[Future[list[dict[str, Any]]]] = set()
+            for chunk_start, chunk_stop in chunks:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        report.mismatches += future.result()
+                _wait_for_rate(start, chunk_start, rate)
+                pending.add(
+                    executor.submit(
+                        run_cases,
+                        engine_name,
+                        seed,
+                        chunk_start,
+                        chunk_stop,
+                    ),
+                )
+            for future in pending:
+                report.mismatches += future.result()
+    report.elapsed = time.perf_counter() - start
+    report.mismatches.sort(key=lambda mismatch: mismatch["index"])
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--engine", default="pruned")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=0.0, help="cases per second")
+    parser.add_argument("--output", type=Path, help="write the reproducers as JSON")
+    args = parser.parse_args()
+
+    load_engine(args.engine)
+    report = fuzz(
+        engine_name=args.engine,
+        seed=args.seed,
+        cases_count=args.cases,
+        workers=args.workers,
+        rate=args.rate,
+    )
+    for mismatch in report.mismatches:
+        print(json.dumps(mismatch))
+    print(
+        f"{report.engine}: {report.cases_count} cases, "
+        f"{len(report.mismatches)} mismatches, "
+        f"{report.cases_per_second:.0f} cases/s",
+    )
+    if args.output:
+        args.output.write_text(json.dumps(report.mismatches, indent=2) + "\n")
+    if report.mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
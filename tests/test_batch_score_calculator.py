@@ -0,0 +1,84 @@
+from copy import deepcopy
+
+import pytest
+
+from app.services.score_calculator.enums.enums import Tile
+from app.services.score_calculator.score_calculator import ScoreCalculator
+from tests.test_utils import create_default_winning_conditions, raw_string_to_hand_class
+
+np = pytest.importorskip("numpy")
+batch_score_calculator = pytest.importorskip(
+    "app.services.score_calculator.batch_score_calculator",
+)
+
+# (hand, winning tile, whether block division is needed)
+BATCH_HANDS = [
+    ("19m19p19s12345677z", Tile.Z7, False),
+    ("147m258p369s12345z", Tile.Z5, False),
+    ("147m258p36s123456z", Tile.S6, False),
+    ("14m258p369s123457z", Tile.P8, False),
+    ("1133557799m1133z", Tile.Z1, False),
+    ("22446688m2244s66z", Tile.S2, False),
+    ("1122334455667m7m", Tile.M7, True),
+    ("33445566778899p", Tile.P9, True),
+    ("11115555m7777s11z", Tile.Z1, False),
+    ("11112345678999m", Tile.M5, True),
+    ("123m789m123p789p55s", Tile.S5, True),
+    ("222m333p345p[1111z]66p", Tile.P6, True),
+    ("147m258p369s11z234m", Tile.M4, True),
+]
+
+
+@pytest.mark.parametrize("is_discarded", [True, False])
+def test_batch_scores_match_calculator(is_discarded):
+    hands = [raw_string_to_hand_class(hand_string) for hand_string, _, _ in BATCH_HANDS]
+    winning_conditions = [
+        create_default_winning_conditions(
+            winning_tile,
+            is_discarded=is_discarded,
+            is_last_tile_of_its_kind=index % 3 == 0,
+        )
+        for index, (_, winning_tile, _) in enumerate(BATCH_HANDS)
+    ]
+
+    result = batch_score_calculator.calculate_batch_scores(
+        tiles=np.array([hand.tiles for hand in hands]),
+        call_blocks=[hand.call_blocks for hand in hands],
+        winning_conditions=deepcopy(winning_conditions),
+    )
+
+    for index, hand in enumerate(hands):
+        expected = ScoreCalculator(
+            hand=deepcopy(hand),
+            winning_conditions=winning_conditions[index],
+        ).result
+        assert result.total_scores[index] == expected.total_score
+        assert result.yaku_score_lists[index] == expected.yaku_score_list
+    assert result.fallback_rows.tolist() == [
+        needs_division for _, _, needs_division in BATCH_HANDS
+    ]
+
+
+def test_batch_scores_skip_hands_with_flowers():
+    hand = raw_string_to_hand_class("1133557799m1133z")
+    hand.tiles[Tile.F0] += 1
+    result = batch_score_calculator.calculate_batch_scores(
+        tiles=np.array([hand.tiles]),
+        call_blocks=[[]],
+        winning_conditions=[create_default_winning_conditions(Tile.Z1)],
+    )
+    assert result.total_scores.tolist() == [0]
+    assert result.yaku_score_lists == [[]]
+    assert not result.fallback_rows[0]
+
+
+def test_batch_scores_reject_wrong_shape():
+    with pytest.raises(ValueError, match="Wrong batch shape."):
+        batch_score_calculator.calculate_batch_scores(
+            tiles=np.zeros((2, 34), dtype=np.int64),
+            call_blocks=[[], []],
+            winning_conditions=[
+                create_default_winning_conditions(Tile.M1),
+                create_default_winning_conditions(Tile.M1),
+            ],
+        )
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from app.services.score_calculator.divide.general_shape import divide_general_shape
+from app.services.score_calculator.tenpai_calculator import get_tenpai_tiles
+from scripts.benchmark_suite import (
+    SHAPES,
+    TARGETS,
+    generate_corpus,
+    get_percentile,
+    run_suite,
+)
+
+
+def test_generate_corpus_is_seeded():
+    first = generate_corpus(seed=7, cases_per_shape=5)
+    second = generate_corpus(seed=7, cases_per_shape=5)
+    assert list(first) == list(SHAPES)
+    for shape in SHAPES:
+        assert [case.hand.tiles for case in first[shape]] == [
+            case.hand.tiles for case in second[shape]
+        ]
+
+
+def test_generate_corpus_hands_are_winning():
+    corpus = generate_corpus(seed=0, cases_per_shape=10)
+    for shape, cases in corpus.items():
+        assert len(cases) == 10
+        for case in cases:
+            assert case.winning_conditions.winning_tile in get_tenpai_tiles(
+                case.tenpai_hand,
+            ), shape
+            assert case.game_hand.tsumo_tile == case.winning_conditions.winning_tile
+    assert all(len(case.hand.call_blocks) >= 2 for case in corpus["melded_heavy"])
+    assert all(
+        len(divide_general_shape(case.hand)) > 1 for case in corpus["multi_division"]
+    )
+
+
+@pytest.mark.parametrize(
+    "values, percent, expected",
+    [
+        ([5], 99, 5),
+        ([1, 2, 3, 4], 50, 2),
+        (list(range(1, 101)), 99, 99),
+        (list(range(1, 101)), 100, 100),
+    ],
+)
+def test_get_percentile(values, percent, expected):
+    assert get_percentile(values, percent) == expected
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("target", TARGETS)
+def test_benchmark_suite(target, tmp_path):
+    report = run_suite(seed=0, cases_per_shape=5, repeat=2, targets=(target,))
+    output = tmp_path / "benchmark.json"
+    output.write_text(json.dumps(report))
+
+    results = json.loads(output.read_text())["results"]
+    assert list(results) == [target]
+    assert list(results[target]) == list(SHAPES)
+    for stats in results[target].values():
+        assert stats["calls_count"] == 10
+        assert 0 < stats["p50_us"] <= stats["p99_us"]
+        assert stats["calls_per_second"] > 0
@@ -0,0 +1,51 @@
+import pickle
+from copy import deepcopy
+
+import pytest
+
+from app.services.score_calculator.block.block import Block
+from app.services.score_calculator.enums.enums import BlockType, Tile
+
+
+def test_block_is_interned():
+    block = Block(BlockType.SEQUENCE, Tile.M1)
+    assert Block(type=BlockType.SEQUENCE, tile=Tile.M1, is_opened=False) is block
+    assert Block(BlockType.SEQUENCE, Tile.M1, True) is not block
+    assert deepcopy(block) is block
+    assert pickle.loads(pickle.dumps(block)) is block
+    assert len({block, Block(BlockType.SEQUENCE, Tile.M1)}) == 1
+
+
+def test_block_is_immutable():
+    block = Block(BlockType.TRIPLET, Tile.Z1)
+    with pytest.raises(AttributeError):
+        block.is_opened = True
+    with pytest.raises(AttributeError):
+        block.tile = Tile.Z2
+    assert Block(BlockType.TRIPLET, Tile.Z1).is_opened is False
+
+
+def test_block_rejects_wrong_tile():
+    with pytest.raises(ValueError):
+        Block(BlockType.PAIR, 35)
+
+
+@pytest.mark.parametrize("block_type", list(BlockType))
+@pytest.mark.parametrize("tile", [Tile(tile) for tile in Tile.all_tiles()])
+def test_block_flags_match_tiles(block_type, tile):
+    block = Block(block_type, tile)
+    tiles = block.tiles
+    assert block.tile == tiles[0] == tile
+    assert block.is_sequence == (block_type == BlockType.SEQUENCE)
+    assert block.is_pung == (block_type in {BlockType.TRIPLET, BlockType.QUAD})
+    assert block.is_quad == (block_type == BlockType.QUAD)
+    assert block.is_pair == (block_type == BlockType.PAIR)
+    assert block.is_knitted == (block_type == BlockType.KNITTED)
+    assert block.is_number == tile.is_number
+    assert block.is_honor == tile.is_honor
+    assert block.is_wind == tile.is_wind
+    assert block.is_dragon == tile.is_dragon
+    assert block.is_terminal == all(block_tile.is_terminal for block_tile in tiles)
+    assert block.is_outside == (tile.is_honor or block.is_terminal)
+    assert block.has_outside == any(block_tile.is_outside for block_tile in tiles)
+    assert block.has_five == any(block_tile.number == 5 for block_tile in tiles)
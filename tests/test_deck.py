@@ -1,3 +1,5 @@
+import pytest
+
 from app.services.game_manager.models.deck import Deck
 
 
@@ -6,3 +8,13 @@ def test_shuffle_deck():
     original = deck.tiles.copy()
     deck._shuffle_deck()
     assert sorted(deck.tiles) == sorted(original)
+
+
+def test_peek_tile():
+    deck = Deck()
+    tile = deck.peek_tile()
+    assert deck.tiles_remaining == Deck.TOTAL_TILES
+    assert deck.draw_tiles(1) == [tile]
+    deck.draw_index_left = deck.draw_index_right
+    with pytest.raises(ValueError):
+        deck.peek_tile()
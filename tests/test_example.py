@@ -17,6 +17,7 @@ from app.services.score_calculator.winning_conditions.winning_conditions import
 )
 from app.services.score_calculator.yaku_check.blocks_yaku_checker import (
     BlocksYakuChecker,
+    get_blocks_yakus,
 )
 from app.services.score_calculator.yaku_check.hand_yaku_checker import HandYakuChecker
 from app.services.score_calculator.yaku_check.winning_conditions_yaku_checker import (
@@ -511,3 +512,14 @@ def test_block_yaku_checker():
     assert [Yaku.MixedStraight] == BlocksYakuChecker([M123, P456, S789]).yakus
     assert [Yaku.MixedShiftedPungs] == BlocksYakuChecker([M111, P222, S333]).yakus
     assert [Yaku.MixedShiftedChows] == BlocksYakuChecker([M123, P234, S345]).yakus
+
+
+def test_get_blocks_yakus():
+    assert get_blocks_yakus([M123, M456, M789]) == (Yaku.PureStraight,)
+    assert get_blocks_yakus([M789, M123, M456]) == (Yaku.PureStraight,)
+    opened_m456 = Block(BlockType.SEQUENCE, Tile.M4, is_opened=True)
+    assert get_blocks_yakus([M123, opened_m456]) == (Yaku.ShortStraight,)
+    assert get_blocks_yakus([M123, P456]) == ()
+    assert get_blocks_yakus([Z11, Z222, Z333, Z4444, M111]) == tuple(
+        BlocksYakuChecker([Z11, Z222, Z333, Z4444, M111]).yakus,
+    )
@@ -0,0 +1,80 @@
+import pytest
+
+from app.services.score_calculator.enums.enums import Tile, Wind
+from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.result.result import ScoreResult
+from app.services.score_calculator.winning_conditions.winning_conditions import (
+    WinningConditions,
+)
+from scripts.fuzz_score_calculator import (
+    calculate_reference,
+    fuzz,
+    generate_case,
+    hand_to_raw_string,
+    load_engine,
+)
+from tests.test_utils import raw_string_to_hand_class
+
+BROKEN_ENGINE = "tests.test_fuzz_score_calculator:calculate_with_discard_bonus"
+
+
+def calculate_with_discard_bonus(
+    hand: Hand,
+    winning_conditions: WinningConditions,
+) -> ScoreResult:
+    result = calculate_reference(hand, winning_conditions)
+    if winning_conditions.is_discarded and result.total_score:
+        result.total_score += 1
+    return result
+
+
+def test_generate_case_is_seeded():
+    for index in range(50):
+        first = generate_case(seed=3, index=index)
+        second = generate_case(seed=3, index=index)
+        assert first.hand.tiles == second.hand.tiles
+        assert first.hand.call_blocks == second.hand.call_blocks
+        assert first.winning_conditions == second.winning_conditions
+
+
+def test_hand_to_raw_string_round_trip():
+    for index in range(300):
+        hand = generate_case(seed=0, index=index).hand
+        parsed = raw_string_to_hand_class(hand_to_raw_string(hand))
+        assert parsed.tiles[: Tile.F0] == hand.tiles[: Tile.F0]
+        assert parsed.call_blocks == hand.call_blocks
+
+
+def test_load_engine():
+    assert load_engine(BROKEN_ENGINE) is calculate_with_discard_bonus
+    with pytest.raises(ValueError):
+        load_engine("unknown")
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_fuzz_pruned_engine(workers):
+    report = fuzz("pruned", seed=0, cases_count=200, workers=workers)
+    assert report.cases_count == 200
+    assert report.mismatches == []
+
+
+def test_fuzz_minimises_mismatches():
+    report = fuzz(BROKEN_ENGINE, seed=0, cases_count=200)
+    assert report.mismatches
+    for mismatch in report.mismatches:
+        case = generate_case(mismatch["seed"], mismatch["index"])
+        assert case.winning_conditions.is_discarded
+        assert mismatch["winning_conditions"] == {
+            "winning_tile": mismatch["winning_conditions"]["winning_tile"],
+            "is_discarded": True,
+            "is_last_tile_in_the_game": False,
+            "is_last_tile_of_its_kind": False,
+            "is_replacement_tile": False,
+            "is_robbing_the_kong": False,
+            "seat_wind": Wind.EAST.name,
+            "round_wind": Wind.EAST.name,
+        }
+        call_blocks = raw_string_to_hand_class(mismatch["hand"]).call_blocks
+        assert all(block.is_quad for block in call_blocks if block.is_opened)
+        expected_score, actual_score = mismatch["expected"][0], mismatch["actual"][0]
+        assert actual_score == expected_score + 1
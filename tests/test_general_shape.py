@@ -0,0 +1,42 @@
+import pytest
+
+from app.services.score_calculator.divide.general_shape import (
+    divide_general_shape,
+    search_general_shape,
+)
+from app.services.score_calculator.divide.suit_decomposition import (
+    HONOR_TABLE,
+    NUMBER_SUIT_TABLE,
+    pack_tiles_count,
+)
+from app.services.score_calculator.enums.enums import BlockType
+from tests.test_utils import raw_string_to_hand_class
+
+
+@pytest.mark.parametrize(
+    "hand_string",
+    [
+        "11112345678999m",
+        "1112345678999m9m",
+        "11223344556677m",
+        "12223456567789p",
+        "111222z67878999s",
+        "123m789m123m789m55m",
+        "445566m556677p55s",
+        "66m111222333444z",
+        "222m333p345p[1111z]66p",
+        "[1111z]{2222m}[3333s]{5555p}11p",
+    ],
+)
+def test_suit_tables_match_search(hand_string):
+    hand = raw_string_to_hand_class(hand_string)
+    assert divide_general_shape(hand) == search_general_shape(hand)
+
+
+def test_suit_table_decompositions():
+    decompositions = NUMBER_SUIT_TABLE[pack_tiles_count([1, 1, 4, 1, 1, 0, 0, 0, 0])]
+    assert [decomposition.blocks for decomposition in decompositions] == [
+        ((BlockType.SEQUENCE, 0), (BlockType.PAIR, 2), (BlockType.SEQUENCE, 2)),
+    ]
+    assert pack_tiles_count([1, 1, 0, 0, 0, 0, 0]) not in HONOR_TABLE
+    assert HONOR_TABLE[pack_tiles_count([2, 0, 0, 0, 0, 0, 0])][0].pairs_count == 1
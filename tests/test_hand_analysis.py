@@ -0,0 +1,80 @@
+from copy import deepcopy
+
+from app.services.game_manager.models.call_block import CallBlock
+from app.services.game_manager.models.enums import GameTile, RelativeSeat
+from app.services.game_manager.models.hand import GameHand
+from app.services.game_manager.models.types import CallBlockType
+from app.services.score_calculator.enums.enums import Tile
+from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.shanten_calculator import get_shanten
+from app.services.score_calculator.tenpai_calculator import get_tenpai_tiles
+
+
+def create_tenpai_game_hand() -> GameHand:
+    # 123m 456m 789m 11p 22p -> waits on 1p and 2p
+    return GameHand.create_from_tiles(
+        tiles=[
+            *map(GameTile, range(GameTile.M1, GameTile.M9 + 1)),
+            GameTile.P1,
+            GameTile.P1,
+            GameTile.P2,
+            GameTile.P2,
+        ],
+    )
+
+
+def test_analysis_is_opt_in():
+    hand = create_tenpai_game_hand()
+    assert hand.analysis is None
+    hand.apply_tsumo(GameTile.S5)
+    assert hand.analysis is None
+
+
+def test_waiting_tiles_survive_tsumo_and_tsumogiri():
+    hand = create_tenpai_game_hand()
+    analysis = hand.enable_analysis()
+    waiting_tiles = analysis.waiting_tiles
+    assert waiting_tiles == [Tile.P1, Tile.P2]
+
+    hand.apply_tsumo(GameTile.S5)
+    assert analysis.waiting_tiles is waiting_tiles
+    hand.apply_discard(GameTile.S5)
+    assert analysis.waiting_tiles is waiting_tiles
+
+
+def test_waiting_tiles_follow_concealed_tiles():
+    hand = create_tenpai_game_hand()
+    analysis = hand.enable_analysis()
+    hand.apply_tsumo(GameTile.P1)
+    assert analysis.shanten == -1
+    assert analysis.waiting_tiles == [Tile.P1, Tile.P2]
+    hand.apply_discard(GameTile.P2)
+    assert analysis.waiting_tiles == get_tenpai_tiles(Hand.create_from_game_hand(hand))
+    assert analysis.shanten == get_shanten(hand) == 0
+
+    hand.apply_call(
+        CallBlock(
+            type=CallBlockType.PUNG,
+            first_tile=GameTile.P1,
+            source_seat=RelativeSeat.KAMI,
+        ),
+    )
+    assert analysis.waiting_tiles is None
+    hand.apply_discard(GameTile.P2)
+    assert analysis.waiting_tiles == get_tenpai_tiles(Hand.create_from_game_hand(hand))
+
+
+def test_analysis_follows_copied_hand():
+    hand = create_tenpai_game_hand()
+    hand.enable_analysis()
+    copied_hand = deepcopy(hand)
+    assert copied_hand == hand
+    assert copied_hand.analysis is not None
+    assert copied_hand.analysis.game_hand is copied_hand
+    copied_hand.apply_tsumo(GameTile.P1)
+    copied_hand.apply_discard(GameTile.M1)
+    assert hand.analysis is not None
+    assert hand.analysis.waiting_tiles == [Tile.P1, Tile.P2]
+    assert copied_hand.analysis.waiting_tiles == get_tenpai_tiles(
+        Hand.create_from_game_hand(copied_hand),
+    )
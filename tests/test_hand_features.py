@@ -0,0 +1,114 @@
+import pytest
+
+from app.services.score_calculator.block.block import (
+    MANZU_FLAG,
+    NUMBER_FLAG,
+    SEQUENCE_FLAG,
+    SOUZU_FLAG,
+)
+from app.services.score_calculator.divide.general_shape import divide_general_shape
+from app.services.score_calculator.divide.seven_pairs_shape import (
+    divide_seven_pairs_shape,
+)
+from app.services.score_calculator.enums.enums import Tile
+from app.services.score_calculator.yaku_check.blocks_yaku_checker import (
+    BlocksYakuChecker,
+)
+from app.services.score_calculator.yaku_check.hand_features import HandFeatures
+from app.services.score_calculator.yaku_check.hand_yaku_checker import HandYakuChecker
+from app.services.score_calculator.yaku_check.winning_conditions_yaku_checker import (
+    WinningConditionsYakuChecker,
+)
+from tests.test_utils import create_default_winning_conditions, raw_string_to_hand_class
+
+
+def test_hand_features_from_blocks():
+    blocks = divide_general_shape(
+        raw_string_to_hand_class("123m555z[1111s]{2222m}66z"),
+    )[0]
+    features = HandFeatures.create_from_blocks(
+        blocks,
+        create_default_winning_conditions(Tile.Z5, is_discarded=True),
+    )
+    assert features.blocks_count == 5
+    assert features.tiles == {
+        Tile.S1: 4,
+        Tile.M2: 5,
+        Tile.M1: 1,
+        Tile.M3: 1,
+        Tile.Z5: 3,
+        Tile.Z6: 2,
+    }
+    assert features.tiles_mask == sum(1 << tile for tile in features.tiles)
+    assert features.suits_mask == MANZU_FLAG | SOUZU_FLAG
+    assert features.suits_count == 2
+    assert features.has_honor_block
+    assert features.has_opened_block
+    assert features.opened_blocks_count == 1
+    assert features.tile_types_count == 3
+    assert features.common_flags == 0
+    assert (features.quads_count, features.concealed_quads_count) == (2, 1)
+    assert features.pungs_count == 3
+    # the dragon pung is completed by the discard
+    assert features.concealed_pungs_count == 1
+    assert features.dragon_pungs_count == 1
+    assert features.concealed_sequence_tiles == (Tile.M1,)
+    assert features.pair_tiles == (Tile.Z6,)
+
+
+def test_hand_features_concealed_pung_with_self_drawn_tile():
+    blocks = divide_general_shape(
+        raw_string_to_hand_class("123m555z[1111s]{2222m}66z"),
+    )[0]
+    features = HandFeatures.create_from_blocks(
+        blocks,
+        create_default_winning_conditions(Tile.Z5, is_discarded=False),
+    )
+    assert features.concealed_pungs_count == 2
+
+
+def test_hand_features_common_flags():
+    blocks = divide_general_shape(raw_string_to_hand_class("123456789m234p55s"))[0]
+    features = HandFeatures.create_from_blocks(
+        blocks,
+        create_default_winning_conditions(Tile.S5),
+    )
+    assert features.common_flags & NUMBER_FLAG
+    assert not features.common_flags & SEQUENCE_FLAG
+    assert features.tile_types_count == 3
+
+
+@pytest.mark.parametrize(
+    "hand_string, winning_tile, is_discarded",
+    [
+        ("123m555z[1111s]{2222m}66z", Tile.Z5, True),
+        ("11z[222z][333z][444z]555m", Tile.Z1, True),
+        ("123m456p789s234m55s", Tile.S5, False),
+        ("11223344556677m", Tile.M7, True),
+    ],
+)
+def test_checkers_with_shared_features(hand_string, winning_tile, is_discarded):
+    winning_conditions = create_default_winning_conditions(
+        winning_tile,
+        is_discarded=is_discarded,
+    )
+    hand = raw_string_to_hand_class(hand_string)
+    for blocks in divide_general_shape(hand) + divide_seven_pairs_shape(hand):
+        features = HandFeatures.create_from_blocks(blocks, winning_conditions)
+        assert (
+            HandYakuChecker(blocks, winning_conditions, features=features).yakus
+            == HandYakuChecker(blocks, winning_conditions).yakus
+        )
+        assert (
+            WinningConditionsYakuChecker(
+                blocks,
+                winning_conditions,
+                features=features,
+            ).yakus
+            == WinningConditionsYakuChecker(blocks, winning_conditions).yakus
+        )
+        if len(blocks) == 5:
+            assert (
+                BlocksYakuChecker(blocks, features=features).yakus
+                == BlocksYakuChecker(blocks).yakus
+            )
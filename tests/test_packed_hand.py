@@ -0,0 +1,85 @@
+from collections import Counter
+
+import pytest
+
+from app.services.game_manager.models.call_block import CallBlock
+from app.services.game_manager.models.enums import GameTile, RelativeSeat
+from app.services.game_manager.models.hand import GameHand
+from app.services.game_manager.models.types import CallBlockType
+from app.services.score_calculator.divide.suit_decomposition import (
+    NUMBER_SUIT_TABLE,
+    SUIT_SIZE,
+)
+from app.services.score_calculator.enums.enums import Tile
+from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.hand.packed_hand import PackedHand
+from tests.test_utils import raw_string_to_hand_class
+
+
+@pytest.mark.parametrize(
+    "hand_string",
+    [
+        "11112345678999m",
+        "222m333p345p[1111z]66p",
+        "[1111z]{2222m}[3333s]{5555p}11p",
+        "19m19p19s12345677z",
+    ],
+)
+def test_packed_hand_round_trip(hand_string):
+    hand = raw_string_to_hand_class(hand_string)
+    packed_hand = PackedHand.create_from_hand(hand)
+    assert packed_hand.tiles_count == hand.tiles
+    assert [packed_hand[tile] for tile in range(len(hand.tiles))] == hand.tiles
+    assert packed_hand.to_hand() == hand
+    assert packed_hand == PackedHand.create_from_hand(
+        raw_string_to_hand_class(hand_string),
+    )
+    assert hash(packed_hand) == hash(PackedHand.create_from_hand(packed_hand.to_hand()))
+
+
+def test_packed_hand_increment_and_decrement():
+    hand = raw_string_to_hand_class("1112345678999m")
+    packed_hand = PackedHand.create_from_hand(hand)
+
+    winning_hand = packed_hand.increment(Tile.M5)
+    hand.tiles[Tile.M5] += 1
+    assert winning_hand.tiles_count == hand.tiles
+    assert winning_hand.decrement(Tile.M5) == packed_hand
+    assert packed_hand[Tile.M5] == 1
+    assert {packed_hand: "tenpai", winning_hand: "win"}[winning_hand] == "win"
+    assert packed_hand.increment(Tile.P1, 3).decrement(Tile.P1, 3) == packed_hand
+
+
+def test_packed_hand_rejects_wrong_count():
+    packed_hand = PackedHand.create_from_hand(raw_string_to_hand_class("111m"))
+    with pytest.raises(ValueError, match="Wrong tile count."):
+        packed_hand.decrement(Tile.M2)
+    with pytest.raises(ValueError, match="Wrong tile count."):
+        packed_hand.increment(Tile.M1, 5)
+    with pytest.raises(ValueError, match="Wrong hand."):
+        PackedHand.create_from_hand(Hand(tiles=[8] + [0] * 34, call_blocks=[]))
+
+
+def test_packed_hand_suit_is_table_key():
+    packed_hand = PackedHand.create_from_hand(
+        raw_string_to_hand_class("123m789m123p789p55s"),
+    )
+    assert packed_hand.get_packed_tiles(Tile.P1, SUIT_SIZE) in NUMBER_SUIT_TABLE
+    assert packed_hand.get_packed_tiles(Tile.S1, SUIT_SIZE) in NUMBER_SUIT_TABLE
+    assert packed_hand.get_packed_tiles(Tile.Z1, 7) == 0
+
+
+def test_packed_hand_from_game_hand():
+    game_hand = GameHand(
+        tiles=Counter({GameTile.M1: 2, GameTile.P5: 3, GameTile.Z1: 3}),
+        call_blocks=[
+            CallBlock(
+                type=CallBlockType.CHII,
+                first_tile=GameTile.S3,
+                source_seat=RelativeSeat.KAMI,
+            ),
+        ],
+    )
+    assert PackedHand.create_from_game_hand(game_hand) == PackedHand.create_from_hand(
+        Hand.create_from_game_hand(game_hand),
+    )
@@ -0,0 +1,310 @@
+import asyncio
+import logging
+
+import pytest
+
+from app.schemas.ws import MessageEventType
+from app.services.game_manager import round_manager as round_manager_module
+from app.services.game_manager.models.enums import AbsoluteSeat, GameTile
+from app.services.game_manager.models.event import GameEvent
+from app.services.game_manager.models.types import GameEventType
+from app.services.game_manager.round_manager import RoundManager
+from app.services.score_calculator.shanten_calculator import get_shanten
+from tests.test_utils import (
+    RecordingNetworkService,
+    create_round_manager,
+    raw_string_to_game_hand,
+)
+
+
+class DummyTenpaiAssistService:
+    def __init__(self) -> None:
+        self.is_running: bool = True
+        self.timeout: float = 1.0
+        self.info: dict | None = {}
+        self.tenpai_assistants: list = []
+        # speculative requests wait for `release` and then raise `error`
+        self.is_idle: bool = True
+        self.release: asyncio.Event = asyncio.Event()
+        self.error: Exception | None = None
+        self.speculative_assistants: list = []
+
+    async def get_tenpai_assistance_info_in_full_hand(self, tenpai_assistant):
+        self.tenpai_assistants.append(tenpai_assistant)
+        return self.info
+
+    async def fill_assist_cache(self, tenpai_assistant, is_speculative=False):
+        assert is_speculative
+        if not self.is_idle:
+            return False
+        self.speculative_assistants.append(tenpai_assistant)
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return True
+
+
+@pytest.fixture
+def assist_service(monkeypatch):
+    service = DummyTenpaiAssistService()
+    monkeypatch.setattr(round_manager_module, "tenpai_assist_service", service)
+    return service
+
+
+async def test_assistance_skips_hands_far_from_tenpai(assist_service):
+    round_manager = create_round_manager()
+    far_hand = raw_string_to_game_hand("1357m2468p13579s1z")
+    assert get_shanten(far_hand) > 0
+    round_manager.hands[AbsoluteSeat.EAST] = far_hand
+    assert await round_manager.get_tenpai_assist_data(AbsoluteSeat.EAST) == {}
+    assert not assist_service.tenpai_assistants
+
+    tenpai_ready_hand = raw_string_to_game_hand("123m456m789m11p23p")
+    tenpai_ready_hand.apply_tsumo(GameTile.S5)
+    round_manager.hands[AbsoluteSeat.EAST] = tenpai_ready_hand
+    round_manager.set_winning_conditions(
+        winning_tile=GameTile.S5,
+        previous_event_type=GameEventType.DISCARD,
+    )
+    assist_service.info = {"assist": "info"}
+    assert await round_manager.get_tenpai_assist_data(AbsoluteSeat.EAST) == {
+        "assist": "info",
+    }
+    assert len(assist_service.tenpai_assistants) == 1
+
+
+async def test_tsumo_actions_leave_out_a_late_assistance(assist_service):
+    round_manager = create_round_manager()
+    game_hand = raw_string_to_game_hand("123m456m789m11p23p")
+    game_hand.apply_tsumo(GameTile.S5)
+    round_manager.hands[AbsoluteSeat.EAST] = game_hand
+    round_manager.set_winning_conditions(
+        winning_tile=GameTile.S5,
+        previous_event_type=GameEventType.DISCARD,
+    )
+    network_service = round_manager.game_manager.network_service
+    assert isinstance(network_service, RecordingNetworkService)
+
+    # the service returns None when the deadline passes
+    for info in (None, {"assist": "info"}):
+        assist_service.info = info
+        await round_manager._send_actions_message(
+            seat=AbsoluteSeat.EAST,
+            actions=[],
+            message_event_type=MessageEventType.TSUMO_ACTIONS,
+            left_time=round_manager.DEFAULT_TURN_TIMEOUT,
+        )
+    (late_uid, late_message), (uid, message) = network_service.personal_messages
+    assert late_uid == uid == round_manager.get_player_from_seat(AbsoluteSeat.EAST).uid
+    assert "tenpai_assist" not in late_message["data"]
+    assert message["data"]["tenpai_assist"] == {"assist": "info"}
+    assert len(assist_service.tenpai_assistants) == 2
+
+
+def create_discarding_round_manager(monkeypatch) -> RoundManager:
+    """EAST discards Z1 and SOUTH, one tile from tenpai, draws S5 next."""
+    round_manager = create_round_manager()
+    round_manager.current_player_seat = AbsoluteSeat.EAST
+    round_manager.hands[AbsoluteSeat.EAST] = raw_string_to_game_hand(
+        "1357m2468p13579s1z",
+    )
+    round_manager.hands[AbsoluteSeat.SOUTH] = raw_string_to_game_hand(
+        "123m456m789m11p23p",
+    )
+    tile_deck = round_manager.tile_deck
+    tile_deck.tiles[tile_deck.draw_index_left] = GameTile.S5
+
+    async def send_tsumo_actions_and_wait(actions_lists):
+        await round_manager._send_actions_message(
+            seat=round_manager.current_player_seat,
+            actions=actions_lists[round_manager.current_player_seat],
+            message_event_type=MessageEventType.TSUMO_ACTIONS,
+            left_time=round_manager.DEFAULT_TURN_TIMEOUT,
+        )
+        return GameEvent(
+            event_type=GameEventType.DISCARD,
+            player_seat=round_manager.current_player_seat,
+            action_id=round_manager.game_manager.action_id,
+        )
+
+    monkeypatch.setattr(
+        round_manager,
+        "send_tsumo_actions_and_wait",
+        send_tsumo_actions_and_wait,
+    )
+    return round_manager
+
+
+async def discard_east_z1(
+    monkeypatch,
+    round_manager: RoundManager,
+    response_event: GameEvent | None = None,
+) -> asyncio.Task:
+    """Discard Z1 from EAST, answered by `response_event`.
+
+    Returns the speculative task that ran while the calls were awaited.
+    """
+    speculative_tasks: list[asyncio.Task | None] = []
+
+    async def send_actions_and_wait(message_event_type, actions_lists):
+        speculative_tasks.append(round_manager.speculative_assist_task)
+        # the speculation runs while the calls are awaited
+        await asyncio.sleep(0)
+        return response_event
+
+    monkeypatch.setattr(round_manager, "send_actions_and_wait", send_actions_and_wait)
+    assert (
+        await round_manager.do_discard(
+            previous_turn_type=GameEventType.TSUMO,
+            discarded_tile=GameTile.Z1,
+        )
+        is response_event
+    )
+    (speculative_task,) = speculative_tasks
+    assert speculative_task is not None
+    return speculative_task
+
+
+def get_tsumo_actions_data(round_manager: RoundManager) -> dict:
+    network_service = round_manager.game_manager.network_service
+    assert isinstance(network_service, RecordingNetworkService)
+    (message,) = (
+        message
+        for _, message in network_service.personal_messages
+        if message["event"] == MessageEventType.TSUMO_ACTIONS
+    )
+    return message["data"]
+
+
+async def test_next_drawer_assistance_is_speculated_during_the_discard(
+    assist_service,
+    monkeypatch,
+):
+    round_manager = create_discarding_round_manager(monkeypatch)
+    speculative_task = await discard_east_z1(monkeypatch, round_manager)
+    assert speculative_task is round_manager.speculative_assist_task
+    (speculative_assistant,) = assist_service.speculative_assistants
+    assert speculative_assistant.game_hand.tsumo_tile == GameTile.S5
+    assert speculative_assistant.assist_cache is round_manager.tenpai_assist_cache
+
+    assist_service.release.set()
+    assist_service.info = {"assist": "info"}
+    await round_manager.do_tsumo(previous_event_type=GameEventType.DISCARD)
+    assert round_manager.current_player_seat == AbsoluteSeat.SOUTH
+    assert round_manager.hands[AbsoluteSeat.SOUTH] == speculative_assistant.game_hand
+    assert speculative_task.done()
+    assert not speculative_task.cancelled()
+    assert round_manager.speculative_assist_task is None
+    # the drawer reads the speculated discards from the cache
+    assert get_tsumo_actions_data(round_manager)["tenpai_assist"] == {
+        "assist": "info",
+    }
+    (tenpai_assistant,) = assist_service.tenpai_assistants
+    assert tenpai_assistant.game_hand == speculative_assistant.game_hand
+
+
+async def test_a_speculation_past_the_drawer_deadline_is_not_requested_again(
+    assist_service,
+    monkeypatch,
+):
+    round_manager = create_discarding_round_manager(monkeypatch)
+    speculative_task = await discard_east_z1(monkeypatch, round_manager)
+    # the speculation outlives the drawer's deadline
+    assist_service.timeout = 0.01
+    await round_manager.do_tsumo(previous_event_type=GameEventType.DISCARD)
+    assert "tenpai_assist" not in get_tsumo_actions_data(round_manager)
+    assert not assist_service.tenpai_assistants
+    assert round_manager.speculative_assist_task is None
+    # only the wait is cancelled, the service caches the worker's result
+    with pytest.raises(asyncio.CancelledError):
+        await speculative_task
+
+
+@pytest.mark.parametrize(
+    "event_type",
+    [GameEventType.CHII, GameEventType.PON, GameEventType.HU],
+)
+async def test_a_response_to_the_discard_cancels_the_speculation(
+    assist_service,
+    monkeypatch,
+    event_type,
+):
+    round_manager = create_discarding_round_manager(monkeypatch)
+    response_event = GameEvent(
+        event_type=event_type,
+        player_seat=AbsoluteSeat.NORTH,
+        action_id=round_manager.game_manager.action_id,
+    )
+    speculative_task = await discard_east_z1(
+        monkeypatch,
+        round_manager,
+        response_event,
+    )
+    assert round_manager.speculative_assist_task is None
+    with pytest.raises(asyncio.CancelledError):
+        await speculative_task
+
+
+async def test_the_end_of_the_round_cancels_the_speculation(
+    assist_service,
+    monkeypatch,
+):
+    round_manager = create_discarding_round_manager(monkeypatch)
+    speculative_task = await discard_east_z1(monkeypatch, round_manager)
+    await round_manager.end_round_as_draw()
+    assert round_manager.speculative_assist_task is None
+    with pytest.raises(asyncio.CancelledError):
+        await speculative_task
+
+
+async def test_no_speculation_without_a_tile_or_a_running_service(
+    assist_service,
+    monkeypatch,
+):
+    round_manager = create_discarding_round_manager(monkeypatch)
+    assist_service.is_running = False
+    round_manager.start_speculative_tenpai_assist()
+    assert round_manager.speculative_assist_task is None
+
+    assist_service.is_running = True
+    tile_deck = round_manager.tile_deck
+    tile_deck.draw_index_left = tile_deck.draw_index_right
+    round_manager.start_speculative_tenpai_assist()
+    assert round_manager.speculative_assist_task is None
+    assert not assist_service.speculative_assistants
+
+
+async def test_a_speculation_without_an_idle_worker_is_dropped(
+    assist_service,
+    monkeypatch,
+):
+    round_manager = create_discarding_round_manager(monkeypatch)
+    assist_service.is_idle = False
+    speculative_task = await discard_east_z1(monkeypatch, round_manager)
+    await round_manager.do_tsumo(previous_event_type=GameEventType.DISCARD)
+    assert speculative_task.result() is False
+    assert not assist_service.speculative_assistants
+    # the drawer's own request computes the assistance
+    assert get_tsumo_actions_data(round_manager)["tenpai_assist"] == {}
+    (tenpai_assistant,) = assist_service.tenpai_assistants
+    assert tenpai_assistant.game_hand.tsumo_tile == GameTile.S5
+
+
+async def test_a_failed_speculation_does_not_break_the_tsumo(
+    assist_service,
+    monkeypatch,
+    caplog,
+):
+    round_manager = create_discarding_round_manager(monkeypatch)
+    speculative_task = await discard_east_z1(monkeypatch, round_manager)
+    assist_service.error = RuntimeError("worker failed")
+    assist_service.release.set()
+    with caplog.at_level(logging.ERROR):
+        tsumo_event = await round_manager.do_tsumo(
+            previous_event_type=GameEventType.DISCARD,
+        )
+    assert tsumo_event.player_seat == AbsoluteSeat.SOUTH
+    assert isinstance(speculative_task.exception(), RuntimeError)
+    assert "speculative assistance failed" in caplog.text
+    assert get_tsumo_actions_data(round_manager)["tenpai_assist"] == {}
+    assert len(assist_service.tenpai_assistants) == 1
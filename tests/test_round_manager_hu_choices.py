@@ -0,0 +1,114 @@
+import pytest
+
+from app.services.game_manager.models.action import Action
+from app.services.game_manager.models.enums import AbsoluteSeat, GameTile, RelativeSeat
+from app.services.game_manager.models.hand import GameHand
+from app.services.game_manager.models.types import ActionType, GameEventType
+from app.services.game_manager.round_manager import RoundManager
+from tests.test_utils import create_round_manager, raw_string_to_game_hand
+
+NINE_GATES_HAND: str = "1112345678999m"
+
+
+@pytest.fixture
+def round_manager() -> RoundManager:
+    round_manager = create_round_manager()
+    round_manager.current_player_seat = AbsoluteSeat.EAST
+    return round_manager
+
+
+def create_hu_action(winner_seat: AbsoluteSeat, tile: GameTile) -> Action:
+    return Action(
+        type=ActionType.HU,
+        seat_priority=RelativeSeat.create_from_absolute_seats(
+            current_seat=AbsoluteSeat.EAST,
+            target_seat=winner_seat,
+        ),
+        tile=tile,
+    )
+
+
+@pytest.mark.parametrize(
+    "winning_tile, expected_actions",
+    [
+        (GameTile.M5, [create_hu_action(AbsoluteSeat.SOUTH, GameTile.M5)]),
+        (GameTile.P5, []),
+    ],
+)
+def test_hu_choices_on_discard(round_manager, winning_tile, expected_actions):
+    round_manager.hands[AbsoluteSeat.SOUTH] = raw_string_to_game_hand(NINE_GATES_HAND)
+    round_manager.set_winning_conditions(
+        winning_tile=winning_tile,
+        previous_event_type=GameEventType.TSUMO,
+    )
+    assert round_manager.winning_conditions.is_discarded
+    assert (
+        round_manager.get_possible_hu_choices(player_seat=AbsoluteSeat.SOUTH)
+        == expected_actions
+    )
+
+
+def test_hu_choices_on_robbing_the_kong(round_manager):
+    round_manager.hands[AbsoluteSeat.WEST] = raw_string_to_game_hand(NINE_GATES_HAND)
+    round_manager.set_winning_conditions(
+        winning_tile=GameTile.M5,
+        previous_event_type=GameEventType.SHOMIN_KAN,
+    )
+    assert round_manager.winning_conditions.is_robbing_the_kong
+    assert round_manager.get_possible_hu_choices(player_seat=AbsoluteSeat.WEST) == [
+        create_hu_action(AbsoluteSeat.WEST, GameTile.M5),
+    ]
+
+
+def test_hu_choices_on_tsumo_of_another_tile(round_manager):
+    # the winning tile is not in the waits of the hand without its tsumo tile,
+    # so the tracked waits are not used and the full hand is scored instead
+    hand = raw_string_to_game_hand("123m456m789m1p222p")
+    hand.apply_tsumo(GameTile.P1)
+    assert hand.analysis is not None
+    assert hand.analysis.waiting_tiles is not None
+    assert GameTile.M5 not in hand.analysis.waiting_tiles
+    round_manager.hands[AbsoluteSeat.EAST] = hand
+    round_manager.set_winning_conditions(
+        winning_tile=GameTile.M5,
+        previous_event_type=GameEventType.DISCARD,
+    )
+    assert not round_manager.winning_conditions.is_discarded
+    assert round_manager.get_possible_hu_choices(player_seat=AbsoluteSeat.EAST) == [
+        create_hu_action(AbsoluteSeat.EAST, GameTile.M5),
+    ]
+
+
+@pytest.mark.parametrize(
+    "winning_tile, expected_actions",
+    [
+        (GameTile.M9, [create_hu_action(AbsoluteSeat.NORTH, GameTile.M9)]),
+        (GameTile.S1, []),
+    ],
+)
+def test_hu_choices_of_untracked_hand(round_manager, winning_tile, expected_actions):
+    hand: GameHand = GameHand.create_from_tiles(
+        tiles=list(raw_string_to_game_hand(NINE_GATES_HAND).tiles.elements()),
+    )
+    assert hand.analysis is None
+    round_manager.hands[AbsoluteSeat.NORTH] = hand
+    round_manager.set_winning_conditions(
+        winning_tile=winning_tile,
+        previous_event_type=GameEventType.TSUMO,
+    )
+    assert (
+        round_manager.get_possible_hu_choices(player_seat=AbsoluteSeat.NORTH)
+        == expected_actions
+    )
+
+
+def test_hu_choices_below_minimum_score(round_manager):
+    # all chows, mixed double chow and concealed hand only make 5 points
+    round_manager.hands[AbsoluteSeat.SOUTH] = raw_string_to_game_hand(
+        "234m456m678p11s23s",
+    )
+    round_manager.set_winning_conditions(
+        winning_tile=GameTile.S4,
+        previous_event_type=GameEventType.TSUMO,
+    )
+    assert round_manager.get_possible_hu_choices(player_seat=AbsoluteSeat.SOUTH) == []
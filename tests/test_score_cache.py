@@ -0,0 +1,132 @@
+import pytest
+
+from app.services.score_calculator.enums.enums import Tile, Yaku
+from app.services.score_calculator.score_cache import ScoreCache
+from app.services.score_calculator.score_calculator import ScoreCalculator
+from tests.test_utils import create_default_winning_conditions, raw_string_to_hand_class
+
+
+@pytest.mark.parametrize(
+    "hand_string, winning_tile, is_discarded",
+    [
+        ("11112345678999m", Tile.M5, True),
+        ("123m789m123p789p55s", Tile.S5, False),
+        ("222m333p345p[1111z]66p", Tile.P6, True),
+        ("19m19p19s12345677z", Tile.Z7, False),
+    ],
+)
+def test_score_cache_matches_calculator(hand_string, winning_tile, is_discarded):
+    cache = ScoreCache()
+    expected_conditions = create_default_winning_conditions(
+        winning_tile,
+        is_discarded=is_discarded,
+    )
+    expected = ScoreCalculator(
+        hand=raw_string_to_hand_class(hand_string),
+        winning_conditions=expected_conditions,
+    ).result
+    for _ in range(2):
+        winning_conditions = create_default_winning_conditions(
+            winning_tile,
+            is_discarded=is_discarded,
+            count_tenpai_tiles=0,
+        )
+        result = cache.get_score_result(
+            hand=raw_string_to_hand_class(hand_string),
+            winning_conditions=winning_conditions,
+        )
+        assert result.total_score == expected.total_score
+        assert result.yaku_score_list == expected.yaku_score_list
+        assert (
+            winning_conditions.count_tenpai_tiles
+            == expected_conditions.count_tenpai_tiles
+        )
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_score_cache_is_safe_from_mutations():
+    cache = ScoreCache()
+    hand = raw_string_to_hand_class("11112345678999m")
+    result = cache.get_score_result(
+        hand=hand,
+        winning_conditions=create_default_winning_conditions(Tile.M5),
+    )
+    total_score = result.total_score
+    result.add_yaku(Yaku.ChickenHand, 1)
+    hand.tiles[Tile.M1] -= 1
+    hand.tiles[Tile.M5] += 1
+
+    cache.get_score_result(
+        hand=hand,
+        winning_conditions=create_default_winning_conditions(Tile.M5),
+    )
+    assert cache.stats.misses == 2
+    cached_result = cache.get_score_result(
+        hand=raw_string_to_hand_class("11112345678999m"),
+        winning_conditions=create_default_winning_conditions(Tile.M5),
+    )
+    assert cache.stats.hits == 1
+    assert cached_result.total_score == total_score
+    assert (Yaku.ChickenHand, 1) not in cached_result.yaku_score_list
+
+
+def test_score_cache_evicts_least_recently_used():
+    cache = ScoreCache(max_size=2)
+    hand = raw_string_to_hand_class("11112345678999m")
+    for winning_tile in (Tile.M1, Tile.M2, Tile.M1, Tile.M3, Tile.M2):
+        cache.get_score_result(
+            hand=hand,
+            winning_conditions=create_default_winning_conditions(winning_tile),
+        )
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 4, 2, 2)
+    assert stats.hit_rate == pytest.approx(0.2)
+
+    cache.clear()
+    assert cache.stats.size == cache.stats.hits == 0
+    with pytest.raises(ValueError):
+        ScoreCache(max_size=0)
+
+
+def test_score_cache_get_score_results_matches_get_score_result():
+    hand_string = "123m789m123p789p55s"
+    variants_cache = ScoreCache()
+    single_cache = ScoreCache()
+    tsumo_conditions = create_default_winning_conditions(Tile.S5, is_discarded=False)
+    # the discarded variant is already cached, so only tsumo is calculated
+    variants_cache.get_score_result(
+        hand=raw_string_to_hand_class(hand_string),
+        winning_conditions=create_default_winning_conditions(Tile.S5),
+    )
+
+    results = variants_cache.get_score_results(
+        hand=raw_string_to_hand_class(hand_string),
+        winning_conditions_list=[
+            tsumo_conditions,
+            create_default_winning_conditions(Tile.S5),
+        ],
+    )
+
+    expected = [
+        single_cache.get_score_result(
+            hand=raw_string_to_hand_class(hand_string),
+            winning_conditions=create_default_winning_conditions(
+                Tile.S5,
+                is_discarded=is_discarded,
+            ),
+        )
+        for is_discarded in (False, True)
+    ]
+    assert [(r.total_score, r.yaku_score_list) for r in results] == [
+        (r.total_score, r.yaku_score_list) for r in expected
+    ]
+    assert (variants_cache.stats.hits, variants_cache.stats.misses) == (1, 2)
+    assert variants_cache.stats.size == 2
+    assert (
+        variants_cache.get_score_result(
+            hand=raw_string_to_hand_class(hand_string),
+            winning_conditions=tsumo_conditions,
+        ).yaku_score_list
+        == results[0].yaku_score_list
+    )
+    assert variants_cache.stats.hits == 2
@@ -1,7 +1,11 @@
 import pytest
 
 from app.services.score_calculator.enums.enums import Tile, Wind, Yaku
-from app.services.score_calculator.score_calculator import ScoreCalculator
+from app.services.score_calculator.score_calculator import (
+    ScoreCalculator,
+    ScoreVariantsCalculator,
+    can_reach_score,
+)
 from app.services.score_calculator.winning_conditions.winning_conditions import (
     WinningConditions,
 )
@@ -153,3 +157,198 @@ def test_score_checker(hand_string, yaku_score_list, winning_conditions):
     print(sc._highest_result.yaku_score_list)
     print(hand)
     assert set(sc._highest_result.yaku_score_list) == set(yaku_score_list)
+
+
+@pytest.mark.parametrize(
+    "hand_string, winning_tile, is_discarded",
+    [
+        ("11223344556677m", Tile.M7, True),
+        ("11223344667788m", Tile.M8, False),
+        ("445566m556677p55s", Tile.S5, True),
+        ("11112345678999m", Tile.M5, True),
+        ("111222333m444p55s", Tile.S5, True),
+        ("66m111222333444z", Tile.M6, True),
+        ("123m123p123s11z[888p]", Tile.Z1, True),
+    ],
+)
+def test_pruned_divisions_score(hand_string, winning_tile, is_discarded):
+    expected = ScoreCalculator(
+        hand=raw_string_to_hand_class(hand_string),
+        winning_conditions=create_default_winning_conditions(
+            winning_tile=winning_tile,
+            is_discarded=is_discarded,
+        ),
+    ).result
+    sc = ScoreCalculator(
+        hand=raw_string_to_hand_class(hand_string),
+        winning_conditions=create_default_winning_conditions(
+            winning_tile=winning_tile,
+            is_discarded=is_discarded,
+        ),
+        prune_divisions=True,
+    )
+    assert sc.result.total_score == expected.total_score
+    assert sc.result.yaku_score_list == expected.yaku_score_list
+
+
+def test_pruned_divisions_count():
+    sc = ScoreCalculator(
+        hand=raw_string_to_hand_class("11223344556677m"),
+        winning_conditions=create_default_winning_conditions(winning_tile=Tile.M7),
+        prune_divisions=True,
+    )
+    assert sc.pruned_divisions_count > 0
+    assert (
+        ScoreCalculator(
+            hand=raw_string_to_hand_class("11223344556677m"),
+            winning_conditions=create_default_winning_conditions(winning_tile=Tile.M7),
+        ).pruned_divisions_count
+        == 0
+    )
+
+
+@pytest.mark.parametrize(
+    "hand_string, winning_tile, target_score",
+    [
+        ("66m111222333444z", Tile.M6, 8),
+        ("11223344556677m", Tile.M7, 100),
+        ("123m456p789s234m55z", Tile.Z5, 8),
+        ("123m456p789s234m5z6z", Tile.Z6, 8),
+        ("123m456p789s234m55s", Tile.S5, 8),
+        ("234m456p678s234m55s", Tile.M4, 8),
+    ],
+)
+def test_can_reach_score(hand_string, winning_tile, target_score):
+    expected = ScoreCalculator(
+        hand=raw_string_to_hand_class(hand_string),
+        winning_conditions=create_default_winning_conditions(winning_tile),
+    ).result.total_score
+    assert can_reach_score(
+        hand=raw_string_to_hand_class(hand_string),
+        winning_conditions=create_default_winning_conditions(winning_tile),
+        target_score=target_score,
+    ) == (expected >= target_score)
+
+
+def test_can_reach_score_rejects_from_waiting_tiles():
+    # the hand is complete, but the given waits rule the winning tile out
+    assert not can_reach_score(
+        hand=raw_string_to_hand_class("66m111222333444z"),
+        winning_conditions=create_default_winning_conditions(Tile.M6),
+        target_score=8,
+        waiting_tiles=[Tile.Z4],
+    )
+    assert can_reach_score(
+        hand=raw_string_to_hand_class("66m111222333444z"),
+        winning_conditions=create_default_winning_conditions(Tile.M6),
+        target_score=8,
+        waiting_tiles=[Tile.M6],
+    )
+
+
+def test_target_score_stops_at_first_division():
+    sc = ScoreCalculator(
+        hand=raw_string_to_hand_class("11223344556677m"),
+        winning_conditions=create_default_winning_conditions(winning_tile=Tile.M7),
+        target_score=8,
+    )
+    assert sc.reaches_target_score
+    with pytest.raises(ValueError):
+        _ = ScoreCalculator(
+            hand=raw_string_to_hand_class("11223344556677m"),
+            winning_conditions=create_default_winning_conditions(Tile.M7),
+        ).reaches_target_score
+
+
+@pytest.mark.parametrize(
+    "hand_string, winning_tile",
+    [
+        ("11112345678999m", Tile.M5),
+        ("123m789m123p789p55s", Tile.S5),
+        ("[123m][789m][123p][789p]55s", Tile.S5),
+        ("222m333p345p[1111z]66p", Tile.P6),
+        ("19m19p19s12345677z", Tile.Z7),
+        ("11223344556677m", Tile.M7),
+        ("147m258p369s12345z", Tile.Z5),
+        ("123m789m123p789p55s1f", Tile.S5),
+    ],
+)
+def test_score_variants_calculator_matches_calculator(hand_string, winning_tile):
+    variants = [
+        create_default_winning_conditions(winning_tile, is_discarded=False),
+        create_default_winning_conditions(winning_tile, is_discarded=True),
+        create_default_winning_conditions(
+            winning_tile,
+            is_discarded=False,
+            is_last_tile_in_the_game=True,
+            is_replacement_tile=True,
+        ),
+        create_default_winning_conditions(
+            winning_tile,
+            is_discarded=True,
+            is_last_tile_of_its_kind=True,
+            is_robbing_the_kong=True,
+        ),
+    ]
+    results = ScoreVariantsCalculator(
+        hand=raw_string_to_hand_class(hand_string),
+        winning_conditions_list=variants,
+    ).results
+
+    assert len(results) == len(variants)
+    for winning_conditions, result in zip(variants, results, strict=True):
+        expected_conditions = create_default_winning_conditions(
+            winning_tile,
+            is_discarded=winning_conditions.is_discarded,
+            is_last_tile_in_the_game=winning_conditions.is_last_tile_in_the_game,
+            is_last_tile_of_its_kind=winning_conditions.is_last_tile_of_its_kind,
+            is_replacement_tile=winning_conditions.is_replacement_tile,
+            is_robbing_the_kong=winning_conditions.is_robbing_the_kong,
+        )
+        expected = ScoreCalculator(
+            hand=raw_string_to_hand_class(hand_string),
+            winning_conditions=expected_conditions,
+        ).result
+        assert result.total_score == expected.total_score
+        assert result.yaku_score_list == expected.yaku_score_list
+        assert (
+            winning_conditions.count_tenpai_tiles
+            == expected_conditions.count_tenpai_tiles
+        )
+
+
+def test_score_variants_calculator_result_is_first_variant():
+    sc = ScoreVariantsCalculator(
+        hand=raw_string_to_hand_class("123m789m123p789p55s"),
+        winning_conditions_list=[
+            create_default_winning_conditions(Tile.S5, is_discarded=False),
+            create_default_winning_conditions(Tile.S5, is_discarded=True),
+        ],
+        count_tenpai_tiles=2,
+    )
+    assert sc.result == sc.results[0]
+    assert sc.results[0].total_score > sc.results[1].total_score
+
+
+@pytest.mark.parametrize(
+    "other_conditions",
+    [
+        create_default_winning_conditions(Tile.S2),
+        create_default_winning_conditions(Tile.S5, seat_wind=Wind.SOUTH),
+        create_default_winning_conditions(Tile.S5, round_wind=Wind.WEST),
+    ],
+)
+def test_score_variants_calculator_rejects_other_tile_or_winds(other_conditions):
+    with pytest.raises(ValueError):
+        ScoreVariantsCalculator(
+            hand=raw_string_to_hand_class("123m789m123p789p55s"),
+            winning_conditions_list=[
+                create_default_winning_conditions(Tile.S5),
+                other_conditions,
+            ],
+        )
+    with pytest.raises(ValueError):
+        ScoreVariantsCalculator(
+            hand=raw_string_to_hand_class("123m789m123p789p55s"),
+            winning_conditions_list=[],
+        )
@@ -0,0 +1,157 @@
+import asyncio
+
+from app.services.score_calculator.enums.enums import Tile, Yaku
+from app.services.score_calculator.score_calculator import ScoreCalculator
+from app.services.score_calculator.scoring_profiler import (
+    BLOCK_RELATION_YAKU_STAGE,
+    BLOCKS_YAKU_STAGE,
+    DIVISION_STAGE,
+    EXCLUSIONS_STAGE,
+    FEATURES_STAGE,
+    HAND_YAKU_STAGE,
+    SCORE_STAGE,
+    TENPAI_STAGE,
+    WINNING_CONDITIONS_YAKU_STAGE,
+    ScoringProfiler,
+    TimingStats,
+    disable_profiling,
+    enable_profiling,
+    get_active_profiler,
+    profile_scoring,
+)
+from tests.test_utils import create_default_winning_conditions, raw_string_to_hand_class
+
+
+def calculate(hand_string: str, winning_tile: Tile) -> ScoreCalculator:
+    return ScoreCalculator(
+        hand=raw_string_to_hand_class(hand_string),
+        winning_conditions=create_default_winning_conditions(
+            winning_tile,
+            is_discarded=False,
+        ),
+    )
+
+
+def test_profiling_is_disabled_by_default():
+    assert get_active_profiler() is None
+
+
+def test_profile_scoring_records_stages_and_yakus():
+    expected = calculate("11122233344455m", Tile.M5).result
+    with profile_scoring() as profiler:
+        assert get_active_profiler() is profiler
+        result = calculate("11122233344455m", Tile.M5).result
+    assert get_active_profiler() is None
+
+    assert result == expected
+    assert result.yaku_score_list == expected.yaku_score_list
+    assert set(profiler.stages) == {
+        TENPAI_STAGE,
+        SCORE_STAGE,
+        DIVISION_STAGE,
+        FEATURES_STAGE,
+        HAND_YAKU_STAGE,
+        BLOCKS_YAKU_STAGE,
+        BLOCK_RELATION_YAKU_STAGE,
+        WINNING_CONDITIONS_YAKU_STAGE,
+        EXCLUSIONS_STAGE,
+    }
+    assert profiler.stages[TENPAI_STAGE].calls_count == 1
+    assert profiler.stages[SCORE_STAGE].calls_count == 1
+    divisions_count = profiler.stages[HAND_YAKU_STAGE].calls_count
+    assert divisions_count > 1
+    assert profiler.stages[EXCLUSIONS_STAGE].calls_count == divisions_count
+    assert Yaku.FullFlush in profiler.yakus
+    assert Yaku.FullyConcealedHand in profiler.yakus
+
+
+def test_profile_scoring_restores_previous_profiler():
+    outer = enable_profiling()
+    try:
+        with profile_scoring() as inner:
+            calculate("123m789m123p789p55s", Tile.S5)
+        assert get_active_profiler() is outer
+        assert inner.stages
+        assert not outer.stages
+        calculate("123m789m123p789p55s", Tile.S5)
+        assert outer.stages[SCORE_STAGE].calls_count == 1
+    finally:
+        disable_profiling()
+    assert get_active_profiler() is None
+
+
+async def test_profile_scoring_is_separate_per_task():
+    barrier = asyncio.Barrier(2)
+
+    async def profile(hand_string: str, winning_tile: Tile) -> ScoringProfiler:
+        with profile_scoring() as profiler:
+            # both tasks have entered their own profile_scoring
+            await barrier.wait()
+            assert get_active_profiler() is profiler
+            calculate(hand_string, winning_tile)
+            await barrier.wait()
+            return profiler
+
+    first, second = await asyncio.gather(
+        profile("11122233344455m", Tile.M5),
+        profile("123m789m123p789p55s", Tile.S5),
+    )
+    assert get_active_profiler() is None
+    assert first is not second
+    for profiler, hand_string, winning_tile in (
+        (first, "11122233344455m", Tile.M5),
+        (second, "123m789m123p789p55s", Tile.S5),
+    ):
+        with profile_scoring() as expected:
+            calculate(hand_string, winning_tile)
+        assert {
+            stage: stats.calls_count for stage, stats in profiler.stages.items()
+        } == {stage: stats.calls_count for stage, stats in expected.stages.items()}
+
+
+async def test_enable_profiling_reaches_every_task():
+    enabled = asyncio.Event()
+
+    async def score_once_enabled() -> None:
+        await enabled.wait()
+        calculate("123m789m123p789p55s", Tile.S5)
+
+    # the scoring task runs before profiling is enabled
+    scoring_task = asyncio.create_task(score_once_enabled())
+    await asyncio.sleep(0)
+
+    async def enable() -> ScoringProfiler:
+        profiler = enable_profiling()
+        enabled.set()
+        return profiler
+
+    try:
+        profiler = await asyncio.create_task(enable())
+        await scoring_task
+        assert profiler.stages[SCORE_STAGE].calls_count == 1
+    finally:
+        disable_profiling()
+    assert get_active_profiler() is None
+
+
+def test_timing_stats_histogram():
+    stats = TimingStats()
+    for elapsed_ns in (0, 1, 3, 4, 1000):
+        stats.add(elapsed_ns)
+    assert stats.calls_count == 5
+    assert stats.total_ns == 1008
+    assert stats.mean_ns == 1008 / 5
+    assert stats.histogram == {1: 1, 2: 1, 4: 1, 8: 1, 1024: 1}
+
+
+def test_profiler_to_dict():
+    profiler = ScoringProfiler()
+    with profile_scoring(profiler):
+        calculate("19m19p19s12345677z", Tile.Z7)
+    exported = profiler.to_dict()
+    assert HAND_YAKU_STAGE not in exported["stages"]
+    assert exported["stages"][WINNING_CONDITIONS_YAKU_STAGE]["calls_count"] == 1
+    for stats in (*exported["stages"].values(), *exported["yakus"].values()):
+        assert sum(stats["histogram"].values()) == stats["calls_count"]
+    profiler.clear()
+    assert profiler.to_dict() == {"stages": {}, "yakus": {}}
@@ -0,0 +1,98 @@
+import pytest
+
+from app.services.score_calculator.enums.enums import Tile
+from app.services.score_calculator.score_cache import ScoreCache
+from app.services.score_calculator.score_calculator import ScoreCalculator
+from app.services.score_calculator.scoring_session import ScoringSession
+from app.services.score_calculator.tenpai_calculator import get_tenpai_tiles
+from tests.test_utils import create_default_winning_conditions, raw_string_to_hand_class
+
+
+@pytest.mark.parametrize(
+    "hand_string",
+    [
+        "1112345678999m",
+        "123m789m123p789p5s",
+        "222m333p45p[1111z]66p",
+        "19m19p19s1234567z",
+        "147m258p369s1234z",
+    ],
+)
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_scoring_session_matches_calculator(hand_string, use_cache):
+    tenpai_hand = raw_string_to_hand_class(hand_string)
+    session = ScoringSession(
+        tenpai_hand=tenpai_hand,
+        score_cache=ScoreCache() if use_cache else None,
+    )
+    assert session.tenpai_tiles == get_tenpai_tiles(tenpai_hand=tenpai_hand)
+    assert session.tenpai_tiles
+
+    for winning_tile in session.tenpai_tiles:
+        for is_discarded in (False, True):
+            hand = raw_string_to_hand_class(hand_string)
+            hand.tiles[winning_tile] += 1
+            expected_conditions = create_default_winning_conditions(
+                winning_tile,
+                is_discarded=is_discarded,
+            )
+            expected = ScoreCalculator(
+                hand=hand,
+                winning_conditions=expected_conditions,
+            ).result
+
+            winning_conditions = create_default_winning_conditions(
+                winning_tile,
+                is_discarded=is_discarded,
+                count_tenpai_tiles=0,
+            )
+            result = session.get_score_result(winning_conditions=winning_conditions)
+            assert result.total_score == expected.total_score
+            assert result.yaku_score_list == expected.yaku_score_list
+            assert (
+                winning_conditions.count_tenpai_tiles
+                == expected_conditions.count_tenpai_tiles
+            )
+    assert tenpai_hand.tiles == raw_string_to_hand_class(hand_string).tiles
+
+
+def test_scoring_session_uses_given_tenpai_tiles():
+    session = ScoringSession(
+        tenpai_hand=raw_string_to_hand_class("123m789m123p789p5s"),
+        tenpai_tiles=[Tile.S5, Tile.S6],
+    )
+    winning_conditions = create_default_winning_conditions(Tile.S5)
+    session.get_score_result(winning_conditions=winning_conditions)
+    assert winning_conditions.count_tenpai_tiles == 2
+
+
+def test_score_calculator_uses_given_count_tenpai_tiles():
+    winning_conditions = create_default_winning_conditions(Tile.S5)
+    ScoreCalculator(
+        hand=raw_string_to_hand_class("123m789m123p789p55s"),
+        winning_conditions=winning_conditions,
+        count_tenpai_tiles=3,
+    )
+    assert winning_conditions.count_tenpai_tiles == 3
+
+
+def test_scoring_session_get_score_results():
+    session = ScoringSession(
+        tenpai_hand=raw_string_to_hand_class("123m789m123p789p5s"),
+        score_cache=ScoreCache(),
+    )
+    variants = [
+        create_default_winning_conditions(Tile.S5, is_discarded=is_discarded)
+        for is_discarded in (False, True)
+    ]
+    results = session.get_score_results(variants)
+    for winning_conditions, result in zip(variants, results, strict=True):
+        expected = session.get_score_result(
+            winning_conditions=create_default_winning_conditions(
+                Tile.S5,
+                is_discarded=winning_conditions.is_discarded,
+            ),
+        )
+        assert result.total_score == expected.total_score
+        assert result.yaku_score_list == expected.yaku_score_list
+        assert winning_conditions.count_tenpai_tiles == 1
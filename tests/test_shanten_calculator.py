@@ -0,0 +1,105 @@
+from collections import Counter
+
+import pytest
+
+from app.services.game_manager.models.call_block import CallBlock
+from app.services.game_manager.models.enums import GameTile, RelativeSeat
+from app.services.game_manager.models.hand import GameHand
+from app.services.game_manager.models.types import CallBlockType
+from app.services.score_calculator.shanten_calculator import (
+    get_general_shanten,
+    get_honors_and_knitted_shanten,
+    get_knitted_straight_shanten,
+    get_seven_pairs_shanten,
+    get_shanten,
+    get_thirteen_orphans_shanten,
+)
+from app.services.score_calculator.tenpai_calculator import get_tenpai_tiles
+from tests.test_utils import raw_string_to_hand_class
+
+
+@pytest.mark.parametrize(
+    "hand_string, shanten",
+    [
+        ("11112345678999m", -1),
+        ("1112345678999m", 0),
+        ("123m456p789s1234z", 2),
+        ("13579m2468p135s7z", 4),
+        ("147m258p369s1234z", 0),
+        ("123m456p11z[789s][111z]", -1),
+        ("23m456p11z[789s][111z]", 0),
+    ],
+)
+def test_shanten(hand_string, shanten):
+    assert get_shanten(raw_string_to_hand_class(hand_string)) == shanten
+
+
+@pytest.mark.parametrize(
+    "hand_string, expected",
+    [
+        ("1122m3344p5566s7z", (3, 6, 0, 10, 9)),
+        ("19m19p19s1234567z", (8, 9, 6, 0, 4)),
+        ("147m258p369s1234z", (8, 2, 6, 7, 0)),
+        ("147m258p369s11z45m", (5, 0, 4, 9, 3)),
+    ],
+)
+def test_shanten_by_shape(hand_string, expected):
+    hand = raw_string_to_hand_class(hand_string)
+    assert (
+        get_general_shanten(hand),
+        get_knitted_straight_shanten(hand),
+        get_seven_pairs_shanten(hand),
+        get_thirteen_orphans_shanten(hand),
+        get_honors_and_knitted_shanten(hand),
+    ) == expected
+
+
+def test_shanten_with_calls_skips_concealed_shapes():
+    hand = raw_string_to_hand_class("123m456p1z[789s][111z]")
+    assert get_seven_pairs_shanten(hand) is None
+    assert get_thirteen_orphans_shanten(hand) is None
+    assert get_honors_and_knitted_shanten(hand) is None
+    assert get_knitted_straight_shanten(hand) is None
+
+
+def test_shanten_of_game_hand():
+    game_hand = GameHand(
+        tiles=Counter(
+            {
+                GameTile.M1: 1,
+                GameTile.M2: 1,
+                GameTile.M3: 1,
+                GameTile.P4: 1,
+                GameTile.P5: 1,
+                GameTile.Z1: 2,
+                GameTile.S1: 3,
+            },
+        ),
+        call_blocks=[
+            CallBlock(
+                type=CallBlockType.PUNG,
+                first_tile=GameTile.Z5,
+                source_seat=RelativeSeat.SHIMO,
+            ),
+        ],
+    )
+    assert get_shanten(game_hand) == 0
+    assert get_shanten(game_hand) == get_shanten(
+        raw_string_to_hand_class("123m45p111s11z[555z]"),
+    )
+
+
+@pytest.mark.parametrize(
+    "hand_string",
+    [
+        "123m123s111p222p3p",
+        "2233344556677s",
+        "19s19p19m1234577z",
+        "147m258p36s12345z",
+        "1112223334445m",
+        "1357m2468p1357s1z",
+    ],
+)
+def test_shanten_matches_tenpai_tiles(hand_string):
+    hand = raw_string_to_hand_class(hand_string)
+    assert (get_shanten(hand) == 0) == bool(get_tenpai_tiles(tenpai_hand=hand))
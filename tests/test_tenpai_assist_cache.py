@@ -0,0 +1,103 @@
+from collections import Counter
+
+from app.services.game_manager.helpers.tenpai_assist_cache import (
+    TenpaiAssistCache,
+    create_tenpai_assist_key,
+)
+from app.services.game_manager.helpers.tenpai_assistant import TenpaiAssistant
+from app.services.game_manager.models.enums import AbsoluteSeat, GameTile
+from app.services.game_manager.models.hand import GameHand
+from app.services.game_manager.models.winning_conditions import GameWinningConditions
+from app.services.score_calculator.enums.enums import Tile
+from app.services.score_calculator.tenpai_calculator import get_tenpai_tiles
+from tests.test_utils import (
+    TENPAI_ASSIST_HANDS,
+    create_default_winning_conditions,
+    raw_string_to_game_hand,
+    raw_string_to_hand_class,
+    raw_string_to_tenpai_assistant,
+    to_comparable,
+)
+
+
+def create_tenpai_assistant(
+    game_hand: GameHand,
+    visible_tiles_count: Counter[GameTile],
+    assist_cache: TenpaiAssistCache,
+) -> TenpaiAssistant:
+    game_winning_conditions = GameWinningConditions.create_default_conditions()
+    game_winning_conditions.winning_tile = game_hand.tsumo_tile
+    tenpai_assistant = TenpaiAssistant(
+        game_hand=game_hand,
+        game_winning_conditions=game_winning_conditions,
+        visible_tiles_count=visible_tiles_count,
+        seat_wind=AbsoluteSeat.SOUTH,
+        round_wind=AbsoluteSeat.EAST,
+    )
+    tenpai_assistant.assist_cache = assist_cache
+    return tenpai_assistant
+
+
+def test_cached_assistance_matches_uncached():
+    assist_cache = TenpaiAssistCache()
+    for string, tsumo_tile in TENPAI_ASSIST_HANDS:
+        expected = to_comparable(
+            raw_string_to_tenpai_assistant(
+                string,
+                tsumo_tile,
+            ).get_tenpai_assistance_info_in_full_hand(),
+        )
+        for _ in range(2):
+            tenpai_assistant = raw_string_to_tenpai_assistant(string, tsumo_tile)
+            tenpai_assistant.assist_cache = assist_cache
+            info = tenpai_assistant.get_tenpai_assistance_info_in_full_hand()
+            assert to_comparable(info) == expected
+    misses_count = assist_cache.misses
+    assert assist_cache.hits >= misses_count
+    assist_cache.clear()
+    assert len(assist_cache) == 0
+    assert assist_cache.hits == assist_cache.misses == 0
+
+
+def test_next_turn_reuses_the_kept_discards():
+    assist_cache = TenpaiAssistCache()
+    game_hand = raw_string_to_game_hand("123456m123p34s44z")
+    game_hand.apply_tsumo(GameTile.S5)
+    first_turn = create_tenpai_assistant(game_hand, Counter(), assist_cache)
+    first_turn.get_tenpai_assistance_info_in_full_hand()
+    first_turn_misses_count = assist_cache.misses
+
+    game_hand.apply_discard(GameTile.S5)
+    game_hand.apply_tsumo(GameTile.Z1)
+    second_turn = create_tenpai_assistant(game_hand, Counter(), assist_cache)
+    assert second_turn.get_uncached_discard_tiles() == [
+        tile for tile in game_hand.tiles if tile != GameTile.Z1
+    ]
+    # discarding the new tile leaves the hand of the first turn's S5 discard
+    second_turn.get_tenpai_assistance_info_in_full_hand()
+    assert assist_cache.hits == 1
+    assert assist_cache.misses == first_turn_misses_count + len(game_hand.tiles) - 1
+
+
+def test_key_only_depends_on_visible_waits():
+    tenpai_hand = raw_string_to_hand_class("123m456m789m123p5p")
+    tenpai_tiles = get_tenpai_tiles(tenpai_hand)
+    winning_conditions = create_default_winning_conditions(Tile.P5, is_discarded=False)
+    key = create_tenpai_assist_key(
+        tenpai_hand,
+        tenpai_tiles,
+        Counter({GameTile.P5: 2}),
+        winning_conditions,
+    )
+    assert key == create_tenpai_assist_key(
+        tenpai_hand,
+        tenpai_tiles,
+        Counter({GameTile.P5: 2, GameTile.S1: 3, GameTile.Z1: 4}),
+        winning_conditions,
+    )
+    assert key != create_tenpai_assist_key(
+        tenpai_hand,
+        tenpai_tiles,
+        Counter({GameTile.P5: 3}),
+        winning_conditions,
+    )
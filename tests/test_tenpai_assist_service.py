@@ -0,0 +1,194 @@
+import asyncio
+
+import pytest
+
+from app.services.game_manager.helpers.tenpai_assist_cache import TenpaiAssistCache
+from app.services.game_manager.helpers.tenpai_assist_service import (
+    TenpaiAssistService,
+    decode_request,
+    decode_response,
+    encode_request,
+    encode_response,
+)
+from app.services.game_manager.helpers.tenpai_assistant import TenpaiAssistant
+from app.services.game_manager.models.enums import GameTile
+from tests.test_utils import (
+    TENPAI_ASSIST_HANDS,
+    raw_string_to_tenpai_assistant,
+    to_comparable,
+)
+
+Case = tuple[str, GameTile]
+
+
+@pytest.fixture
+def cases() -> list[Case]:
+    return list(TENPAI_ASSIST_HANDS)
+
+
+def create_tenpai_assistant(case: Case) -> TenpaiAssistant:
+    string, tsumo_tile = case
+    return raw_string_to_tenpai_assistant(string, tsumo_tile)
+
+
+def get_expected_info(case: Case) -> object:
+    return to_comparable(
+        create_tenpai_assistant(case).get_tenpai_assistance_info_in_full_hand(),
+    )
+
+
+def test_request_round_trip(cases):
+    for case in cases:
+        expected = create_tenpai_assistant(case)
+        expected.winning_conditions.is_discarded = True
+        discard_tiles = list(expected.game_hand.tiles)[:2]
+        tenpai_assistant, decoded_discard_tiles = decode_request(
+            encode_request(expected, discard_tiles),
+        )
+        assert decoded_discard_tiles == tuple(discard_tiles)
+        assert tenpai_assistant.game_hand == expected.game_hand
+        assert list(tenpai_assistant.game_hand.tiles) == list(expected.game_hand.tiles)
+        assert tenpai_assistant.winning_conditions == expected.winning_conditions
+        assert tenpai_assistant.visible_tiles_count == expected.visible_tiles_count
+        assert decode_request(encode_request(expected))[1] is None
+
+
+def test_response_round_trip(cases):
+    for case in cases:
+        info = create_tenpai_assistant(case).get_tenpai_assistance_info_in_full_hand()
+        response = encode_response(info)
+        assert to_comparable(decode_response(response)) == to_comparable(info)
+
+
+async def test_service_computes_inline_when_not_started(cases):
+    service = TenpaiAssistService(max_workers=0, timeout=0.0)
+    service.start()
+    assert not service.is_running
+    info = await service.get_tenpai_assistance_info_in_full_hand(
+        create_tenpai_assistant(cases[0]),
+    )
+    assert to_comparable(info) == get_expected_info(cases[0])
+    tenpai_assistant = create_tenpai_assistant(cases[0])
+    tenpai_assistant.assist_cache = TenpaiAssistCache()
+    assert not await service.fill_assist_cache(tenpai_assistant, is_speculative=True)
+    assert len(tenpai_assistant.assist_cache) == 0
+
+
+async def test_service_uses_worker_processes(cases):
+    service = TenpaiAssistService(max_workers=2, timeout=30.0)
+    service.start()
+    try:
+        assert service.is_running
+        # every worker has been spawned and warmed up by start
+        assert service._executor is not None
+        assert len(service._executor._processes) == service.max_workers
+        assist_cache = TenpaiAssistCache()
+        for case in cases:
+            info = await service.get_tenpai_assistance_info_in_full_hand(
+                create_tenpai_assistant(case),
+            )
+            assert to_comparable(info) == get_expected_info(case)
+            tenpai_assistant = create_tenpai_assistant(case)
+            tenpai_assistant.assist_cache = assist_cache
+            info = await service.get_tenpai_assistance_info_in_full_hand(
+                tenpai_assistant,
+            )
+            assert to_comparable(info) == get_expected_info(case)
+            assert not tenpai_assistant.get_uncached_discard_tiles()
+
+        # a speculative request only takes an idle worker
+        tenpai_assistant = create_tenpai_assistant(cases[0])
+        tenpai_assistant.assist_cache = TenpaiAssistCache()
+        service._pending_count = service.max_workers
+        assert not await service.fill_assist_cache(
+            tenpai_assistant,
+            is_speculative=True,
+        )
+        service._pending_count = 0
+        assert await service.fill_assist_cache(tenpai_assistant, is_speculative=True)
+        assert not tenpai_assistant.get_uncached_discard_tiles()
+
+        service.timeout = 0.0
+        assert (
+            await service.get_tenpai_assistance_info_in_full_hand(
+                create_tenpai_assistant(cases[0]),
+            )
+            is None
+        )
+
+        # the result of a request past its deadline is still cached
+        tenpai_assistant = create_tenpai_assistant(cases[0])
+        tenpai_assistant.assist_cache = TenpaiAssistCache()
+        assert (
+            await service.get_tenpai_assistance_info_in_full_hand(tenpai_assistant)
+            is None
+        )
+        for _ in range(300):
+            if not tenpai_assistant.get_uncached_discard_tiles():
+                break
+            await asyncio.sleep(0.01)
+        assert not tenpai_assistant.get_uncached_discard_tiles()
+        assert to_comparable(
+            tenpai_assistant.get_tenpai_assistance_info_in_full_hand(),
+        ) == get_expected_info(cases[0])
+
+        # a speculative request has no deadline, and a cancelled one still
+        # caches its result
+        tenpai_assistant = create_tenpai_assistant(cases[1])
+        tenpai_assistant.assist_cache = TenpaiAssistCache()
+        assert await service.fill_assist_cache(tenpai_assistant, is_speculative=True)
+        tenpai_assistant = create_tenpai_assistant(cases[2])
+        tenpai_assistant.assist_cache = TenpaiAssistCache()
+        speculation = asyncio.create_task(
+            service.fill_assist_cache(tenpai_assistant, is_speculative=True),
+        )
+        await asyncio.sleep(0)
+        speculation.cancel()
+        for _ in range(300):
+            if not tenpai_assistant.get_uncached_discard_tiles():
+                break
+            await asyncio.sleep(0.01)
+        assert speculation.cancelled()
+        assert not tenpai_assistant.get_uncached_discard_tiles()
+    finally:
+        service.shutdown()
+    assert not service.is_running
+
+
+async def test_broken_pool_is_restarted_once(cases, monkeypatch):
+    service = TenpaiAssistService(max_workers=1, timeout=30.0)
+    service.start()
+    try:
+        executors = []
+        create_executor = service._create_executor
+
+        def record_executor(*args, **kwargs):
+            executor = create_executor(*args, **kwargs)
+            executors.append(executor)
+            return executor
+
+        monkeypatch.setattr(service, "_create_executor", record_executor)
+        broken_executor = service._executor
+        assert broken_executor is not None
+        requests = [
+            asyncio.create_task(
+                service.get_tenpai_assistance_info_in_full_hand(
+                    create_tenpai_assistant(case),
+                ),
+            )
+            for case in cases[:2]
+        ]
+        # both requests are submitted before the worker dies
+        await asyncio.sleep(0)
+        for process in broken_executor._processes.values():
+            process.kill()
+        assert await asyncio.gather(*requests) == [None, None]
+
+        assert len(executors) == 1
+        assert service._executor is executors[0]
+        info = await service.get_tenpai_assistance_info_in_full_hand(
+            create_tenpai_assistant(cases[0]),
+        )
+        assert to_comparable(info) == get_expected_info(cases[0])
+    finally:
+        service.shutdown()
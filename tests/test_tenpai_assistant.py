@@ -0,0 +1,19 @@
+from tests.test_utils import (
+    TENPAI_ASSIST_HANDS,
+    get_assistance_info_per_discard,
+    raw_string_to_tenpai_assistant,
+    to_comparable,
+)
+
+
+def test_full_hand_assistance_matches_per_discard():
+    for string, tsumo_tile in TENPAI_ASSIST_HANDS:
+        expected = get_assistance_info_per_discard(
+            raw_string_to_tenpai_assistant(string, tsumo_tile),
+        )
+        actual = raw_string_to_tenpai_assistant(
+            string,
+            tsumo_tile,
+        ).get_tenpai_assistance_info_in_full_hand()
+        assert list(actual) == list(expected)
+        assert to_comparable(actual) == to_comparable(expected)
@@ -1,7 +1,14 @@
+from copy import deepcopy
+
 import pytest
 
+from app.services.score_calculator.divide.general_shape import BlockDivisionState
 from app.services.score_calculator.enums.enums import Tile
-from app.services.score_calculator.tenpai_calculator import get_tenpai_tiles
+from app.services.score_calculator.tenpai_calculator import (
+    get_discard_tenpai_tiles,
+    get_tenpai_tiles,
+    get_tenpai_tiles_by_probing,
+)
 from tests.test_utils import raw_string_to_hand_class
 
 
@@ -17,3 +24,69 @@ from tests.test_utils import raw_string_to_hand_class
 def test_tenpai_tiles_checker(hand_string, tenpai_tiles):
     hand = raw_string_to_hand_class(hand_string)
     assert sorted(get_tenpai_tiles(tenpai_hand=hand)) == tenpai_tiles
+
+
+@pytest.mark.parametrize(
+    "hand_string",
+    [
+        "11112345678999m",
+        "1112345678999m9m",
+        "11223344556677m",
+        "11112222333344m",
+        "12223456567789p",
+        "123m789m123m789m55m",
+        "445566m556677p55s",
+        "66m111222333444z",
+        "147m258p369s12355z",
+        "147m258p369s11z[123s]",
+        "147m258p369s12345z",
+        "19m19p19s12345677z",
+        "222m333p345p[1111z]66p",
+        "[1111z]{2222m}[3333s]{5555p}11p",
+    ],
+)
+def test_tenpai_tiles_match_probing(hand_string):
+    hand = raw_string_to_hand_class(hand_string)
+    for tile in Tile.all_tiles():
+        if not hand.tiles[tile]:
+            continue
+        tenpai_hand = deepcopy(hand)
+        tenpai_hand.tiles[tile] -= 1
+        assert get_tenpai_tiles(tenpai_hand=tenpai_hand) == (
+            get_tenpai_tiles_by_probing(tenpai_hand=tenpai_hand)
+        )
+
+
+@pytest.mark.parametrize(
+    "hand_string",
+    [
+        "11112345678999m",
+        "11223344556677m",
+        "12223456567789p",
+        "445566m556677p55s",
+        "147m258p369s12355z",
+        "147m258p369s11z[123s]",
+        "147m258p369s12345z",
+        "19m19p19s12345677z",
+        "222m333p345p[1111z]66p",
+        "123456789m1234z5z",
+    ],
+)
+def test_discard_tenpai_tiles_match_per_discard(hand_string):
+    hand = raw_string_to_hand_class(hand_string)
+    discard_tenpai_tiles = get_discard_tenpai_tiles(full_hand=hand)
+    concealed_tiles = BlockDivisionState.create_from_hand(hand).remaining_tiles_count
+    assert list(discard_tenpai_tiles) == [
+        Tile(tile) for tile in Tile.all_tiles() if concealed_tiles[tile]
+    ]
+    for tile, tenpai_tiles in discard_tenpai_tiles.items():
+        tenpai_hand = deepcopy(hand)
+        tenpai_hand.tiles[tile] -= 1
+        assert tenpai_tiles == get_tenpai_tiles(tenpai_hand=tenpai_hand)
+
+
+def test_discard_tenpai_tiles_reject_flowers():
+    hand = raw_string_to_hand_class("123m123s111p222p3p")
+    hand.tiles[Tile.F0] += 1
+    with pytest.raises(ValueError):
+        get_discard_tenpai_tiles(full_hand=hand)
@@ -1,8 +1,20 @@
-from typing import Final
+from collections import Counter
+from copy import deepcopy
+from typing import Any, Final
 
+from app.services.game_manager.game_manager import GameManager
+from app.services.game_manager.helpers.tenpai_assistant import TenpaiAssistant
+from app.services.game_manager.models.call_block import CallBlock
+from app.services.game_manager.models.enums import AbsoluteSeat, GameTile, RelativeSeat
+from app.services.game_manager.models.hand import GameHand
+from app.services.game_manager.models.player import PlayerData
+from app.services.game_manager.models.types import CallBlockType
+from app.services.game_manager.models.winning_conditions import GameWinningConditions
+from app.services.game_manager.round_manager import RoundManager
 from app.services.score_calculator.block.block import Block
 from app.services.score_calculator.enums.enums import BlockType, Tile, Wind
 from app.services.score_calculator.hand.hand import Hand
+from app.services.score_calculator.result.result import ScoreResult
 from app.services.score_calculator.winning_conditions.winning_conditions import (
     WinningConditions,
 )
@@ -63,8 +75,171 @@ def raw_string_to_hand_class(string: str) -> Hand:
     return Hand(tiles_count, blocks_list)
 
 
+def raw_string_to_game_hand(string: str) -> GameHand:
+    """`GameHand` of the tiles of `string`, with its analysis enabled.
+
+    The opened blocks of `string` become chii, pung and daimin kong calls, and
+    its closed quads an kongs.
+    """
+    hand: Hand = raw_string_to_hand_class(string)
+    call_blocks: list[CallBlock] = [
+        CallBlock(
+            type=CALL_BLOCK_TYPES[block.type, block.is_opened],
+            first_tile=GameTile(block.tile),
+            source_seat=RelativeSeat.TOI if block.is_opened else RelativeSeat.SELF,
+        )
+        for block in hand.call_blocks
+    ]
+    called_tiles: list[int] = get_called_tiles(call_blocks)
+    game_hand = GameHand(
+        tiles=Counter(
+            {
+                GameTile(tile): count - called_tiles[tile]
+                for tile, count in enumerate(hand.tiles)
+                if count > called_tiles[tile]
+            },
+        ),
+        call_blocks=call_blocks,
+    )
+    game_hand.enable_analysis()
+    return game_hand
+
+
+def get_called_tiles(call_blocks: list[CallBlock]) -> list[int]:
+    """Count of every tile in `call_blocks`, indexed by tile."""
+    return Hand.create_from_game_hand(
+        GameHand(tiles=Counter(), call_blocks=call_blocks),
+    ).tiles
+
+
+def raw_string_to_tenpai_assistant(
+    string: str,
+    tsumo_tile: GameTile,
+) -> TenpaiAssistant:
+    """`TenpaiAssistant` of the hand of `string` right after drawing `tsumo_tile`."""
+    game_hand: GameHand = raw_string_to_game_hand(string)
+    game_hand.apply_tsumo(tsumo_tile)
+    game_winning_conditions = GameWinningConditions.create_default_conditions()
+    game_winning_conditions.winning_tile = tsumo_tile
+    return TenpaiAssistant(
+        game_hand=game_hand,
+        game_winning_conditions=game_winning_conditions,
+        visible_tiles_count=Counter(
+            {
+                GameTile(tile): count
+                for tile, count in enumerate(get_called_tiles(game_hand.call_blocks))
+                if count
+            },
+        ),
+        seat_wind=AbsoluteSeat.SOUTH,
+        round_wind=AbsoluteSeat.EAST,
+    )
+
+
+AssistanceInfo = dict[GameTile, dict[GameTile, tuple[ScoreResult, ScoreResult]]]
+
+
+def get_assistance_info_per_discard(
+    tenpai_assistant: TenpaiAssistant,
+) -> AssistanceInfo:
+    """Assistance info of the full hand, computed from scratch for each discard.
+
+    Reference for `TenpaiAssistant.get_tenpai_assistance_info_in_full_hand`.
+    """
+    result: AssistanceInfo = {}
+    for discard_tile in tenpai_assistant.game_hand.tiles:
+        tenpai_game_hand = deepcopy(tenpai_assistant.game_hand)
+        tenpai_game_hand.apply_discard(discard_tile)
+        if tenpai_game_hand.has_flower:
+            continue
+        visible_tiles = deepcopy(tenpai_assistant.visible_tiles_count)
+        visible_tiles[discard_tile] += 1
+        sub_info = tenpai_assistant._evaluate_tenpai_tiles(
+            tenpai_hand=Hand.create_from_game_hand(hand=tenpai_game_hand),
+            working_winning_conditions=deepcopy(tenpai_assistant.winning_conditions),
+            visible_tiles=visible_tiles,
+        )
+        if sub_info:
+            result[discard_tile] = sub_info
+    return result
+
+
+def to_comparable(info: AssistanceInfo) -> object:
+    return [
+        (
+            discard_tile,
+            [
+                (
+                    tenpai_tile,
+                    [(score.total_score, score.yaku_score_list) for score in scores],
+                )
+                for tenpai_tile, scores in sub_info.items()
+            ],
+        )
+        for discard_tile, sub_info in info.items()
+    ]
+
+
+class RecordingNetworkService:
+    """Network service that keeps the messages instead of sending them."""
+
+    def __init__(self) -> None:
+        # (user id, message) pairs
+        self.personal_messages: list[tuple[str, dict[str, Any]]] = []
+        self.broadcast_messages: list[dict[str, Any]] = []
+
+    async def send_personal_message(
+        self,
+        message: dict[str, Any],
+        game_id: int,
+        user_id: str,
+    ) -> None:
+        self.personal_messages.append((user_id, message))
+
+    async def broadcast(
+        self,
+        message: dict[str, Any],
+        game_id: int,
+        exclude_user_id: str | None = None,
+    ) -> None:
+        self.broadcast_messages.append(message)
+
+
+def create_round_manager() -> RoundManager:
+    """Round manager of a new game, with the first round dealt."""
+    game_manager = GameManager(game_id=1, network_service=RecordingNetworkService())
+    game_manager.init_game(
+        [
+            PlayerData(uid=f"user{index}", nickname=f"user{index}")
+            for index in range(GameManager.MAX_PLAYERS)
+        ],
+    )
+    round_manager: RoundManager = game_manager.round_manager
+    round_manager.init_round_data()
+    return round_manager
+
+
 SEQUENCE_SIZE: Final[int] = 3
 
+CALL_BLOCK_TYPES: Final[dict[tuple[BlockType, bool], CallBlockType]] = {
+    (BlockType.SEQUENCE, True): CallBlockType.CHII,
+    (BlockType.TRIPLET, True): CallBlockType.PUNG,
+    (BlockType.QUAD, True): CallBlockType.DAIMIN_KONG,
+    (BlockType.QUAD, False): CallBlockType.AN_KONG,
+}
+
+# hands of every shape right before drawing the tile, with the drawn tile
+TENPAI_ASSIST_HANDS: Final[tuple[tuple[str, GameTile], ...]] = (
+    ("123m456p789s23s11z", GameTile.S1),
+    ("1112345678999m", GameTile.M5),
+    ("1133m2255p4477s1z", GameTile.Z1),
+    ("147m258p369s1234z", GameTile.Z5),
+    ("19m19p19s1234567z", GameTile.Z1),
+    ("123m78s99s[456p][777s]", GameTile.S6),
+    ("234m55p66s{1111z}[999s]", GameTile.P5),
+    ("1357m2468p13579s", GameTile.Z1),
+)
+
 
 def print_blocks(blocks: list[Block]):
     for block in blocks:
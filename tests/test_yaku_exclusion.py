@@ -0,0 +1,60 @@
+from collections import Counter
+from itertools import product
+
+import pytest
+
+from app.services.score_calculator.enums.enums import Yaku
+from app.services.score_calculator.utility.utility import EXCLUDED_YAKUS, YAKU_POINT
+from app.services.score_calculator.utility.yaku_exclusion import (
+    EXCLUSION_MASKS,
+    YAKU_BITS,
+    get_excluded_mask,
+    get_yakus_mask,
+    process_yaku_exclusions,
+)
+
+SCORED_YAKUS: list[Yaku] = [yaku for yaku in Yaku if yaku in YAKU_POINT]
+
+
+def legacy_process_yaku_exclusions(yaku_list: list[Yaku]) -> Counter[Yaku]:
+    yaku_counter = Counter(yaku_list)
+    sorted_yaku = sorted(yaku_counter, key=lambda y: -YAKU_POINT[y])
+    for yaku in sorted_yaku:
+        for excluded in EXCLUDED_YAKUS.get(yaku, []):
+            yaku_counter.pop(excluded, None)
+    return yaku_counter
+
+
+def assert_same_exclusions(yaku_list: list[Yaku]) -> None:
+    result = process_yaku_exclusions(yaku_list)
+    expected = legacy_process_yaku_exclusions(yaku_list)
+    assert list(result.items()) == list(expected.items())
+
+
+@pytest.mark.parametrize("yaku", SCORED_YAKUS)
+def test_single_yaku_exclusions(yaku):
+    assert_same_exclusions([yaku])
+    assert_same_exclusions([yaku, yaku])
+
+
+def test_pairwise_yaku_exclusions():
+    for first, second in product(SCORED_YAKUS, repeat=2):
+        assert_same_exclusions([first, second])
+        assert_same_exclusions([first, second, first])
+
+
+def test_yaku_masks():
+    assert len(set(YAKU_BITS.values())) == len(Yaku)
+    assert get_yakus_mask([]) == 0
+    assert get_yakus_mask([Yaku.AllPungs, Yaku.AllPungs]) == YAKU_BITS[Yaku.AllPungs]
+    assert get_excluded_mask([Yaku.ChickenHand]) == EXCLUSION_MASKS[Yaku.ChickenHand]
+    assert get_excluded_mask([Yaku.BigFourWinds]) & YAKU_BITS[Yaku.BigThreeWinds]
+
+
+def test_excluded_yaku_still_excludes():
+    # nine gates excludes full flush, which still excludes one voided suit
+    yaku_list = [Yaku.OneVoidedSuit, Yaku.FullFlush, Yaku.NineGates, Yaku.SelfDrawn]
+    assert_same_exclusions(yaku_list)
+    assert process_yaku_exclusions(yaku_list) == Counter(
+        {Yaku.NineGates: 1, Yaku.SelfDrawn: 1},
+    )